@@ -195,7 +195,7 @@ def check_pixels(data, mask, debugging=False, **kwargs):
     if mask.ndim == 3:  # 3D array
         logger.info("Mask is a 3D array, summing it along axis 0")
         mask = mask.sum(axis=0)
-        mask[np.nonzero(mask)] = 1
+        np.putmask(mask, mask != 0, 1)
     valid.valid_ndarray(arrays=mask, shape=(nby, nbx))
 
     logger.info(
@@ -490,7 +490,8 @@ def select_frames(data, frames_pattern=None):
      frames_pattern is 0 at index, the frame at data[index] will be skipped,
      if 1 the frame will added to the stack.
     :return:
-     - the updated 3D data, eventually cropped along the first axis
+     - the updated 3D data, eventually cropped along the first axis. It is the input
+       array itself (not a copy) if no frame is skipped.
      - a 1D array of length the original number of 2D frames, 0 if a frame was
        removed, 1 if it wasn't. It can be used later to crop goniometer motor values
        accordingly.
@@ -506,6 +507,9 @@ def select_frames(data, frames_pattern=None):
         allowed_values=(0, 1),
         name="frames_pattern",
     )
+    if np.all(frames_pattern != 0):
+        # no frame skipped, avoid copying the whole dataset
+        return data, frames_pattern
     return data[frames_pattern != 0], frames_pattern
 
 
@@ -797,7 +801,7 @@ class Loader(ABC):
                     (setup.detector.binning[1], setup.detector.binning[2]),
                     debugging=debugging,
                 )
-            mask2d[np.nonzero(mask2d)] = 1
+            np.putmask(mask2d, mask2d != 0, 1)
 
             #################
             # select frames #
@@ -820,8 +824,9 @@ class Loader(ABC):
                 data=data, mask=mask2d, debugging=debugging, logger=self.logger
             )
             mask3d = np.repeat(mask2d[np.newaxis, :, :], data.shape[0], axis=0)
-            mask3d[np.isnan(data)] = 1
-            data[np.isnan(data)] = 0
+            nan_voxels = np.isnan(data)
+            mask3d[nan_voxels] = 1
+            data[nan_voxels] = 0
 
             ####################################
             # check for empty frames (no beam) #
@@ -18,6 +18,7 @@ import logging
 import multiprocessing as mp
 import time
 from collections.abc import Sequence
+from functools import lru_cache
 from numbers import Integral, Real
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -2000,31 +2001,6 @@ class Setup:
         # find the shape of the output array that fits #
         # the extent of the data after transformation  #
         ################################################
-
-        # calculate the voxel coordinates of the data points in the laboratory frame
-        myz, myy, myx = np.meshgrid(
-            np.arange(-input_shape[0] // 2, input_shape[0] // 2, 1),
-            np.arange(-input_shape[1] // 2, input_shape[1] // 2, 1),
-            np.arange(-input_shape[2] // 2, input_shape[2] // 2, 1),
-            indexing="ij",
-        )
-
-        pos_along_x = (
-            transfer_matrix[0, 0] * myx
-            + transfer_matrix[0, 1] * myy
-            + transfer_matrix[0, 2] * myz
-        )
-        pos_along_y = (
-            transfer_matrix[1, 0] * myx
-            + transfer_matrix[1, 1] * myy
-            + transfer_matrix[1, 2] * myz
-        )
-        pos_along_z = (
-            transfer_matrix[2, 0] * myx
-            + transfer_matrix[2, 1] * myy
-            + transfer_matrix[2, 2] * myz
-        )
-
         if verbose:
             self.logger.info(
                 "Calculating the shape of the output array "
@@ -2034,16 +2010,10 @@ class Setup:
                 f" {d_along_y:.2f} nm,"
                 f" {d_along_x:.2f} nm)"
             )
-        # these positions are not equally spaced,
-        # we just extract the data extent from them
-        nx_output = int(np.rint((pos_along_x.max() - pos_along_x.min()) / d_along_x))
-        ny_output = int(np.rint((pos_along_y.max() - pos_along_y.min()) / d_along_y))
-        nz_output = int(np.rint((pos_along_z.max() - pos_along_z.min()) / d_along_z))
-
-        # add some margin to the output shape for easier visualization
-        nx_output += 10
-        ny_output += 10
-        nz_output += 10
+        nz_output, ny_output, nx_output = _calc_output_shape(
+            input_shape=tuple(input_shape),
+            transfer_matrix=tuple(map(tuple, transfer_matrix)),
+        )
 
         #########################################
         # calculate the interpolation positions #
@@ -2974,3 +2944,38 @@ class Setup:
                 f"({voxel_z:.2f}, {voxel_y:.2f}, {voxel_x:.2f}) (1/nm)"
             )
         return voxel_z, voxel_y, voxel_x
+
+
+@lru_cache(maxsize=16)
+def _calc_output_shape(
+    input_shape: Tuple[int, int, int],
+    transfer_matrix: Tuple[Tuple[float, float, float], ...],
+    margin: int = 10,
+) -> Tuple[int, int, int]:
+    """
+    Calculate the shape of the array fitting the data extent after transformation.
+
+    The transformation being linear, the extent of the transformed grid is reached at
+    the corners of the input grid, there is no need to transform all voxels. The result
+    is cached, it is identical for all scans sharing the same geometry.
+
+    :param input_shape: shape of the array in the detector frame
+    :param transfer_matrix: nested tuples representing the (3, 3) transformation
+     matrix from the detector frame to the crystal frame, acting on (x, y, z) vectors
+    :param margin: number of voxels to add to each dimension, for easier visualization
+    :return: the output shape (nz, ny, nx)
+    """
+    matrix = np.asarray(transfer_matrix)
+    # voxel coordinates of the data points, in the order (x, y, z)
+    grid_span = np.array(
+        [val // 2 - 1 - (-val // 2) for val in reversed(input_shape)], dtype=float
+    )
+    # extent of the positions along (x, y, z) in the crystal frame
+    extent = abs(matrix) @ grid_span
+    # the transformed positions are not equally spaced, normalize the extent by the
+    # sampling in the crystal frame, given by the rows of the matrix
+    nx_output, ny_output, nz_output = (
+        int(np.rint(val / np.linalg.norm(row))) + margin
+        for val, row in zip(extent, matrix)
+    )
+    return nz_output, ny_output, nx_output
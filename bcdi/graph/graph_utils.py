@@ -1414,6 +1414,8 @@ def multislices_plot(
     reciprocal_space=False,
     ipynb_layout=False,
     save_as: Optional[str] = None,
+    mask: Optional[np.ndarray] = None,
+    figure: Optional[mpl.figure.Figure] = None,
     **kwargs,
 ):
     """
@@ -1446,6 +1448,11 @@ def multislices_plot(
     :param vmax: higher boundary for the colorbar. Float or tuple of 3 floats
     :param ipynb_layout: toggle for 3 plots in a row, cleaner in an Jupyter Notebook
     :param save_as: if string, saves figure at this path
+    :param mask: optional 3D array of the same shape as array. If provided, the plots
+     show array * mask. When not summing frames, the mask is applied only on the
+     plotted slices.
+    :param figure: optional figure created with pyplot. If provided, it is cleared and
+     reused for the plots instead of creating a new figure.
     :param kwargs:
      - 'invert_y': boolean, True to invert the vertical axis of the plot.
        Will overwrite the default behavior.
@@ -1469,6 +1476,11 @@ def multislices_plot(
     if scale not in {"linear", "log"}:
         raise ValueError('scale should be either "linear" or "log"')
     valid.valid_ndarray(array, ndim=3)
+    if mask is not None:
+        valid.valid_ndarray((array, mask), ndim=3)
+        if sum_frames:
+            array = array * mask
+            mask = None
     nb_dim = array.ndim
 
     nbz, nby, nbx = array.shape
@@ -1544,7 +1556,16 @@ def multislices_plot(
     )
 
     plt.ion()
-    if ipynb_layout:
+    if figure is not None:
+        fig = plt.figure(figure.number)  # make it the current figure
+        fig.clear()
+        fig.set_size_inches((15, 4.5) if ipynb_layout else (12, 9))
+        if ipynb_layout:
+            ax0, ax1, ax2 = fig.subplots(nrows=1, ncols=3)
+            ax3 = None
+        else:
+            (ax0, ax1), (ax2, ax3) = fig.subplots(nrows=2, ncols=2)
+    elif ipynb_layout:
         fig, (ax0, ax1, ax2) = plt.subplots(nrows=1, ncols=3, figsize=(15, 4.5))
         ax3 = None
     else:
@@ -1553,11 +1574,12 @@ def multislices_plot(
     ##########
     # axis 0 #
     ##########
-    temp_array = np.copy(array)
     if not sum_frames:
-        temp_array = temp_array[slice_position[0], :, :]
+        temp_array = array[slice_position[0], :, :]
+        if mask is not None:
+            temp_array = temp_array * mask[slice_position[0], :, :]
     else:
-        temp_array = temp_array.sum(axis=0)
+        temp_array = array.sum(axis=0)
     # now array is 2D
     temp_array = temp_array[
         int(np.rint(nby // 2 - min(width_y, nby) // 2)) : int(
@@ -1569,6 +1591,8 @@ def multislices_plot(
         )
         + min(width_x, nbx),
     ]
+    if temp_array.dtype == np.float64:
+        temp_array = temp_array.astype(np.float32)
     if scale == "linear":
         if np.isnan(min_value[0]):
             try:
@@ -1616,11 +1640,12 @@ def multislices_plot(
     ##########
     # axis 1 #
     ##########
-    temp_array = np.copy(array)
     if not sum_frames:
-        temp_array = temp_array[:, slice_position[1], :]
+        temp_array = array[:, slice_position[1], :]
+        if mask is not None:
+            temp_array = temp_array * mask[:, slice_position[1], :]
     else:
-        temp_array = temp_array.sum(axis=1)
+        temp_array = array.sum(axis=1)
     # now array is 2D
     temp_array = temp_array[
         int(np.rint(nbz // 2 - min(width_z, nbz) // 2)) : int(
@@ -1632,6 +1657,8 @@ def multislices_plot(
         )
         + min(width_x, nbx),
     ]
+    if temp_array.dtype == np.float64:
+        temp_array = temp_array.astype(np.float32)
     if scale == "linear":
         if np.isnan(min_value[1]):
             try:
@@ -1677,11 +1704,12 @@ def multislices_plot(
     ##########
     # axis 2 #
     ##########
-    temp_array = np.copy(array)
     if not sum_frames:
-        temp_array = temp_array[:, :, slice_position[2]]
+        temp_array = array[:, :, slice_position[2]]
+        if mask is not None:
+            temp_array = temp_array * mask[:, :, slice_position[2]]
     else:
-        temp_array = temp_array.sum(axis=2)
+        temp_array = array.sum(axis=2)
     # now array is 2D
     temp_array = temp_array[
         int(np.rint(nbz // 2 - min(width_z, nbz) // 2)) : int(
@@ -1693,6 +1721,8 @@ def multislices_plot(
         )
         + min(width_y, nby),
     ]
+    if temp_array.dtype == np.float64:
+        temp_array = temp_array.astype(np.float32)
     if scale == "linear":
         if np.isnan(min_value[2]):
             try:
@@ -1749,7 +1779,7 @@ def multislices_plot(
 
     if isinstance(save_as, str):
         pathlib.Path(save_as).parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_as)
+        save_figure(fig, save_as)
 
     if ipynb_layout:
         return fig, (ax0, ax1, ax2), (plt0, plt1, plt2)
@@ -1787,6 +1817,25 @@ def plot_3dmesh(
     return fig, ax0
 
 
+def save_figure(figure: mpl.figure.Figure, filename: str) -> None:
+    """
+    Save a figure, using fast encoding settings for PNG and JPEG files.
+
+    The default compression level of the PNG writer takes most of the saving time for
+    the large figures of the analysis, for a negligible gain in file size.
+
+    :param figure: a matplotlib figure instance
+    :param filename: path of the file where to save the figure
+    """
+    extension = pathlib.Path(filename).suffix.lower()
+    if extension == ".png":
+        figure.savefig(filename, pil_kwargs={"compress_level": 3, "optimize": False})
+    elif extension in {".jpg", ".jpeg"}:
+        figure.savefig(filename, pil_kwargs={"quality": 85})
+    else:
+        figure.savefig(filename)
+
+
 def savefig(
     savedir,
     figure,
@@ -2174,7 +2223,11 @@ def save_to_vti(
         first_array = tuple_array[0]
         is_amp = False
 
-    first_arr = np.transpose(np.flip(first_array, 2)).reshape(first_array.size)
+    # flatten() returns a copy in the VTK order, input arrays are not modified
+    first_arr = np.transpose(np.flip(first_array, 2)).flatten()
+    # use the thresholded amplitude as a support in order to save disk space
+    support = first_arr == 0 if is_amp else None
+    del first_array
     first_arr = numpy_support.numpy_to_vtk(first_arr)
     pd = image_data.GetPointData()
     pd.SetScalars(first_arr)
@@ -2183,13 +2236,9 @@ def save_to_vti(
     for idx in range(nb_arrays):
         if idx == index_first:
             continue
-        temp_array = tuple_array[idx]
-        if is_amp:
-            temp_array[
-                first_array == 0
-            ] = 0  # use the thresholded amplitude as a support
-            # in order to save disk space
-        temp_array = np.transpose(np.flip(temp_array, 2)).reshape(temp_array.size)
+        temp_array = np.transpose(np.flip(tuple_array[idx], 2)).flatten()
+        if support is not None:
+            temp_array[support] = 0
         temp_array = numpy_support.numpy_to_vtk(temp_array)
         pd.AddArray(temp_array)
         pd.GetArray(counter).SetName(tuple_fieldnames[idx])
@@ -8,10 +8,10 @@
 """Implementation of postprocessing analysis classes."""
 
 import logging
+import math
 import os
 import tkinter as tk
 from abc import ABC, abstractmethod
-from functools import reduce
 from tkinter import filedialog
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -80,15 +80,15 @@ class Analysis(ABC):
     @property
     def get_interplanar_distance(self) -> float:
         """Calculate the interplanar distance in nm."""
-        return float(2 * np.pi / (10 * np.linalg.norm(self.setup.q_laboratory)))
+        return 2 * math.pi / (10 * self.get_norm_q_bragg)
 
     @property
     def get_normalized_q_bragg_laboratory_frame(self) -> np.ndarray:
-        return self.setup.q_laboratory / float(np.linalg.norm(self.setup.q_laboratory))
+        return self.setup.q_laboratory / self.get_norm_q_bragg
 
     @property
     def get_norm_q_bragg(self) -> float:
-        return float(np.linalg.norm(self.setup.q_laboratory))
+        return math.hypot(*self.setup.q_laboratory)
 
     @property
     def get_q_bragg_laboratory_frame(self) -> np.ndarray:
@@ -118,7 +118,10 @@ class Analysis(ABC):
 
             if self.parameters["flip_reconstruction"]:
                 obj = pu.flip_reconstruction(
-                    obj, debugging=True, cmap=self.parameters["colormap"].cmap
+                    obj,
+                    debugging=True,
+                    cmap=self.parameters["colormap"].cmap,
+                    workers=self.parameters.get("fft_workers", -1),
                 )
 
             if extension == ".h5":  # data is already cropped by PyNX
@@ -447,19 +450,13 @@ class OrthogonalFrame(Analysis):
 
     def calculate_voxel_sizes(self) -> List[float]:
         """Calculate the direct space voxel sizes based on loaded q values."""
-        file = self.load_q_values()
-        qx = file["qx"]
-        qy = file["qy"]
-        qz = file["qz"]
-        dy_real = (
-            2 * np.pi / abs(qz.max() - qz.min()) / 10
-        )  # in nm qz=y in nexus convention
-        dx_real = (
-            2 * np.pi / abs(qy.max() - qy.min()) / 10
-        )  # in nm qy=x in nexus convention
-        dz_real = (
-            2 * np.pi / abs(qx.max() - qx.min()) / 10
-        )  # in nm qx=z in nexus convention
+        with self.load_q_values() as file:
+            qx = file["qx"]
+            qy = file["qy"]
+            qz = file["qz"]
+        # qx=z, qz=y and qy=x in nexus convention
+        q_ranges = np.array([np.ptp(qx), np.ptp(qz), np.ptp(qy)], dtype=float)
+        dz_real, dy_real, dx_real = (2 * np.pi / q_ranges / 10).tolist()  # in nm
         self.logger.info(
             f"direct space voxel size from q values: ({dz_real:.2f} nm,"
             f" {dy_real:.2f} nm, {dx_real:.2f} nm)"
@@ -470,27 +467,38 @@ class OrthogonalFrame(Analysis):
         """Regrid and rotate the data if necessary."""
         self.update_parameters({"is_orthogonal": True})
         self.voxel_sizes = self.calculate_voxel_sizes()
-        if self.user_defined_voxel_size:
-            self.regrid(self.user_defined_voxel_size)
         if self.is_data_in_laboratory_frame:
-            self.rotate_into_crystal_frame()
+            # the regridding is done during the rotation, in a single interpolation
+            self.rotate_into_crystal_frame(new_voxelsizes=self.user_defined_voxel_size)
+        elif self.user_defined_voxel_size:
+            self.regrid(self.user_defined_voxel_size)
+
+    def rotate_into_crystal_frame(
+        self, new_voxelsizes: Optional[List[float]] = None
+    ) -> None:
+        """
+        Rotate the data in the crystal frame.
 
-    def rotate_into_crystal_frame(self) -> None:
+        :param new_voxelsizes: optional voxel sizes of the rotated data, in z, y, x
+         (CXI convention). If None, the voxel sizes are not modified.
+        """
         self.logger.info(
             "Rotating the object in the crystal frame " "for the strain calculation"
         )
-        amp, phase = util.rotate_crystal(
-            arrays=(abs(self.data), np.angle(self.data)),
+        self.data = util.rotate_crystal(
+            arrays=self.data,
             is_orthogonal=True,
             reciprocal_space=False,
             voxel_size=self.voxel_sizes,
-            debugging=(True, False),
+            new_voxel_size=new_voxelsizes,
+            debugging=True,
             axis_to_align=self.get_normalized_q_bragg_laboratory_frame[::-1],
             reference_axis=AXIS_TO_ARRAY[self.parameters["ref_axis_q"]],
-            title=("amp", "phase"),
+            title=("amp",),
             cmap=self.parameters["colormap"].cmap,
         )
-        self.data = amp * np.exp(1j * phase)
+        if new_voxelsizes:
+            self.voxel_sizes = new_voxelsizes
 
     def load_q_values(self) -> Any:
         try:
@@ -550,7 +558,7 @@ class InterpolatedCrystal:
         self.logger = kwargs.get("logger", module_logger)
 
         self.q_bragg_in_saving_frame: Optional[np.ndarray] = None
-        self.estimated_crystal_volume: Optional[int] = None
+        self.estimated_crystal_volume: Optional[float] = None
 
     @property
     def norm_of_q(self) -> float:
@@ -567,23 +575,19 @@ class InterpolatedCrystal:
             ]
 
     def estimate_crystal_volume(self) -> None:
-        support = np.copy(self.modulus / self.modulus.max())
-        support[support < self.parameters["isosurface_strain"]] = 0
-        support[np.nonzero(support)] = 1
-        self.estimated_crystal_volume = support.sum() * reduce(
-            lambda x, y: x * y, self.voxel_sizes
-        )  # in nm3
+        threshold = self.parameters["isosurface_strain"] * self.modulus.max()
+        nb_voxels = np.count_nonzero((self.modulus >= threshold) & (self.modulus != 0))
+        self.estimated_crystal_volume = nb_voxels * math.prod(self.voxel_sizes)  # nm3
 
     def find_phase_extent_within_crystal(self) -> float:
-        support = self.get_bulk()
-        return float(
-            self.phase[np.nonzero(support)].max()
-            - self.phase[np.nonzero(support)].min()
-        )
+        phase_in_bulk = self.phase[self.get_bulk() != 0]
+        return float(phase_in_bulk.max() - phase_in_bulk.min())
 
     def find_max_phase(self, filename: str) -> None:
-        piz, piy, pix = np.unravel_index(self.phase.argmax(), self.phase.shape)
-        max_phase = self.phase[np.nonzero(self.get_bulk())].max()
+        phase_in_bulk = np.where(self.get_bulk() != 0, self.phase, -np.inf)
+        piz, piy, pix = np.unravel_index(phase_in_bulk.argmax(), self.phase.shape)
+        max_phase = self.phase[piz, piy, pix]
+        del phase_in_bulk
         self.logger.info(
             f"phase.max() = {max_phase:.2f} " f"at voxel ({piz}, {piy}, {pix})"
         )
@@ -609,7 +613,7 @@ class InterpolatedCrystal:
         )
         plt.pause(0.1)
         if self.parameters["save"]:
-            fig.savefig(filename)
+            gu.save_figure(fig, filename)
         plt.close(fig)
 
     def fit_linecuts_through_crystal_edges(self, filename: str) -> None:
@@ -637,7 +641,7 @@ class InterpolatedCrystal:
         ), self.q_bragg_in_saving_frame = setup.beamline.flatten_sample(
             arrays=(self.modulus, self.phase, self.strain),
             voxel_size=self.voxel_sizes,
-            q_bragg=setup.q_laboratory / float(np.linalg.norm(setup.q_laboratory)),
+            q_bragg=setup.q_laboratory / math.hypot(*setup.q_laboratory),
             is_orthogonal=self.parameters["is_orthogonal"],
             reciprocal_space=False,
             rocking_angle=setup.rocking_angle,
@@ -693,8 +697,28 @@ class InterpolatedCrystal:
             reference_axis=reference_axis,
         )
 
+    def save_results(self, filename: str, setup: "Setup") -> None:
+        """
+        Save the results in the file formats defined by the parameter 'output_format'.
+
+        :param filename: name of the file without extension
+        :param setup: the experimental setup
+        """
+        output_format = self.parameters.get("output_format", ("h5",))
+        if isinstance(output_format, str):  # e.g. not validated by valid_param
+            output_format = (output_format,)
+        if len(output_format) > 1:
+            self.logger.warning(
+                f"Saving the results in several formats {output_format}, "
+                "this duplicates the full-size arrays on disk"
+            )
+        if "npz" in output_format:
+            self.save_results_as_npz(filename=filename, setup=setup)
+        if "h5" in output_format:
+            self.save_results_as_h5(filename=filename + ".h5", setup=setup)
+
     def save_results_as_npz(self, filename: str, setup: "Setup") -> None:
-        np.savez_compressed(
+        np.savez(
             filename,
             amp=self.modulus,
             phase=self.phase,
@@ -710,16 +734,22 @@ class InterpolatedCrystal:
         )
 
     def save_results_as_h5(self, filename: str, setup: "Setup") -> None:
-        with h5py.File(
-            filename,
-            "w",
-        ) as hf:
+        with h5py.File(filename, "w", libver="latest") as hf:
             out = hf.create_group("output")
             par = hf.create_group("params")
-            out.create_dataset("amp", data=self.modulus)
-            out.create_dataset("bulk", data=self.get_bulk())
-            out.create_dataset("phase", data=self.phase)
-            out.create_dataset("strain", data=self.strain)
+            for name, array in (
+                ("amp", self.modulus),
+                ("bulk", self.get_bulk()),
+                ("phase", self.phase),
+                ("strain", self.strain),
+            ):
+                out.create_dataset(
+                    name,
+                    data=array,
+                    chunks=get_chunk_shape(array.shape),
+                    shuffle=True,
+                    compression="lzf",
+                )
             out.create_dataset("q_bragg", data=self.q_bragg_in_saving_frame)
             out.create_dataset("voxel_sizes", data=self.voxel_sizes)
             par.create_dataset("detector", data=str(setup.detector.params))
@@ -730,7 +760,12 @@ class InterpolatedCrystal:
         gu.save_to_vti(
             filename=filename,
             voxel_size=self.voxel_sizes,
-            tuple_array=(self.modulus, self.get_bulk(), self.phase, self.strain),
+            tuple_array=(
+                self.modulus,
+                self.get_bulk().astype(np.uint8),
+                self.phase,
+                self.strain,
+            ),
             tuple_fieldnames=(
                 "amp",
                 "bulk",
@@ -741,9 +776,9 @@ class InterpolatedCrystal:
         )
 
     def threshold_phase_strain(self):
-        support = self.get_bulk()
-        self.strain[support == 0] = np.nan
-        self.phase[support == 0] = np.nan
+        outside_bulk = self.get_bulk() == 0
+        self.strain[outside_bulk] = np.nan
+        self.phase[outside_bulk] = np.nan
 
 
 class PhaseManipulator:
@@ -801,21 +836,7 @@ class PhaseManipulator:
 
     def add_ramp(self, sign: int = +1) -> None:
         """Add a linear ramp to the phase."""
-        if self.phase_ramp is None:
-            raise ValueError("'phase_ramp' is None, can't add the phase ramp")
-        gridz, gridy, gridx = np.meshgrid(
-            np.arange(0, self.data.shape[0], 1),
-            np.arange(0, self.data.shape[1], 1),
-            np.arange(0, self.data.shape[2], 1),
-            indexing="ij",
-        )
-
-        self._phase = (
-            self.phase
-            + gridz * sign * self.phase_ramp[0]
-            + gridy * sign * self.phase_ramp[1]
-            + gridx * sign * self.phase_ramp[2]
-        )
+        self._phase = self.phase + sign * self.get_ramp()
 
     def apodize(self) -> None:
         """Apply a filtering window to the phase."""
@@ -830,6 +851,7 @@ class PhaseManipulator:
             is_orthogonal=self.parameters["is_orthogonal"],
             debugging=True,
             cmap=self.parameters["colormap"].cmap,
+            workers=self.parameters.get("fft_workers", -1),
         )
 
     def average_phase(self) -> None:
@@ -864,10 +886,11 @@ class PhaseManipulator:
             debugging=self.parameters["debug"],
             cmap=self.parameters["colormap"].cmap,
         )
+        # single precision is enough for the visualization and saving of the results
         return InterpolatedCrystal(
-            modulus=self.modulus,
-            phase=self.phase,
-            strain=strain,
+            modulus=self.modulus.astype(np.float32, copy=False),
+            phase=self.phase.astype(np.float32, copy=False),
+            strain=strain.astype(np.float32, copy=False),
             planar_distance=planar_distance,
             parameters=self.parameters,
             voxel_sizes=voxel_sizes,
@@ -896,7 +919,8 @@ class PhaseManipulator:
         self._phase = self.phase + phase_correction
 
         gu.multislices_plot(
-            np.multiply(phase_correction, self.modulus),
+            phase_correction,
+            mask=self.modulus,
             sum_frames=False,
             plot_colorbar=True,
             vmin=0,
@@ -911,6 +935,19 @@ class PhaseManipulator:
         """Get the phase and the modulus out of the data."""
         return np.angle(self.data), abs(self.data)
 
+    def get_ramp(self) -> np.ndarray:
+        """Calculate the linear phase ramp on the grid of the data."""
+        if self.phase_ramp is None:
+            raise ValueError("'phase_ramp' is None, can't add the phase ramp")
+        gridz, gridy, gridx = np.ogrid[
+            0 : self.data.shape[0], 0 : self.data.shape[1], 0 : self.data.shape[2]
+        ]
+        return (
+            gridz * self.phase_ramp[0]
+            + gridy * self.phase_ramp[1]
+            + gridx * self.phase_ramp[2]
+        )
+
     def get_extent_phase(self) -> float:
         _, extent_phase = pu.unwrap(
             self.data,
@@ -935,14 +972,14 @@ class PhaseManipulator:
             cmap=self.parameters["colormap"].cmap,
         )
         if save_plot and self.save_directory is not None:
-            fig.savefig(self.save_directory + plot_title + ".png")
+            plot_format = self.parameters.get("plot_format", "png")
+            gu.save_figure(fig, self.save_directory + plot_title + f".{plot_format}")
 
     def remove_offset(self) -> None:
         """Remove a phase offset to the phase."""
-        support = np.zeros(self.data.shape)
-        support[
+        support = (
             self.modulus > self.parameters["isosurface_strain"] * self.modulus.max()
-        ] = 1
+        ).astype(np.uint8)
         self._phase = pu.remove_offset(
             array=self.phase,
             support=support,
@@ -967,8 +1004,29 @@ class PhaseManipulator:
             threshold_gradient=self.parameters["threshold_gradient"],
             cmap=self.parameters["colormap"].cmap,
             logger=self.logger,
+            workers=self.parameters.get("fft_workers", -1),
         )
 
+    def save_object_with_ramp(self, filename: str) -> None:
+        """
+        Save the complex object including the phase ramp, e.g. for the PRTF.
+
+        The phase ramp is added to a temporary array, the phase itself is not modified.
+        The file is saved uncompressed, zlib compression of the full 3D complex object
+        is single-threaded and dominates the saving time. The object is assembled in
+        place from its real and imaginary parts, in single precision.
+
+        :param filename: name of the npz file
+        """
+        phase = self.phase + self.get_ramp()
+        obj = np.empty(phase.shape, dtype=np.complex64)
+        np.cos(phase, out=obj.real)
+        obj.real *= self.modulus
+        np.sin(phase, out=obj.imag)
+        obj.imag *= self.modulus
+        del phase
+        np.savez(filename, obj=obj)
+
     def unwrap_phase(self) -> None:
         self._phase, self._extent_phase = pu.unwrap(
             self.data,
@@ -985,6 +1043,17 @@ class PhaseManipulator:
         )
 
 
+def get_chunk_shape(shape: Tuple[int, ...], max_size: int = 64) -> Tuple[int, ...]:
+    """
+    Define the chunk shape of a HDF5 dataset.
+
+    :param shape: shape of the array to be saved
+    :param max_size: maximum size of the chunk along each axis
+    :return: the chunk shape, a tuple of positive integers
+    """
+    return tuple(max(1, min(max_size, val)) for val in shape)
+
+
 def define_analysis_type(data_frame: str) -> str:
     """Define the correct analysis type depending on the parameters."""
     if data_frame == "detector":
@@ -15,6 +15,7 @@ import logging
 import multiprocessing as mp
 from typing import Any, Dict
 
+import matplotlib
 import numpy as np
 
 import bcdi.utils.utilities as util
@@ -75,11 +76,13 @@ def initialize_parameters(parameters: Dict[str, Any]) -> Dict[str, Any]:
             "optical_path_method": "threshold",
             "original_size": None,
             "outofplane_angle": None,
+            "output_format": ("h5",),
             "phase_offset": 0,
             "phase_offset_origin": None,
             "phase_ramp_removal": "gradient",
             "phase_range": np.pi / 2,
             "phasing_binning": [1, 1, 1],
+            "plot_format": "jpg",
             "plot_margin": 10,
             "preprocessing_binning": [1, 1, 1],
             "ref_axis_q": "y",
@@ -128,6 +131,11 @@ def initialize_parameters(parameters: Dict[str, Any]) -> Dict[str, Any]:
     ).check_config()
 
 
+def _worker_init(backend: str) -> None:
+    """Set up a process before it starts processing scans."""
+    matplotlib.use(backend)
+
+
 def run(prm: Dict[str, Any]) -> None:
     """
     Run the postprocessing defined by the configuration parameters.
@@ -146,7 +154,9 @@ def run(prm: Dict[str, Any]) -> None:
     if prm["multiprocessing"]:
         mp.freeze_support()
         pool = mp.Pool(
-            processes=min(mp.cpu_count(), nb_scans)
+            processes=min(mp.cpu_count(), nb_scans),
+            initializer=_worker_init,
+            initargs=(prm["backend"],),
         )  # use this number of processes
 
         for scan_idx, scan_nb in enumerate(prm["scans"]):
@@ -167,6 +177,7 @@ def run(prm: Dict[str, Any]) -> None:
         pool.join()  # postpones the execution of next line of code
         # until all processes in the queue are done.
     else:
+        _worker_init(prm["backend"])
         for scan_idx in range(nb_scans):
             result = process_scan(scan_idx=scan_idx, prm=prm)
             util.move_log(result)
@@ -17,7 +17,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 import numpy.ma as ma
 import scipy
-from numpy.fft import fftn, fftshift, ifftn, ifftshift
+from scipy.fft import fftn, fftshift, ifftn, ifftshift
 from scipy.interpolate import RegularGridInterpolator
 from scipy.ndimage import center_of_mass
 from scipy.signal import convolve
@@ -54,6 +54,7 @@ def apodize(amp, phase, initial_shape, window_type, debugging=False, **kwargs):
        tuple of 3 floats
      - 'is_orthogonal': True if the data is in an orthonormal frame. Used for defining
        default plot labels.
+     - 'workers': int, number of workers used for the FFTs, -1 to use all CPUs
 
     :return: filtered amplitude, phase of the same shape as myamp
     """
@@ -61,7 +62,7 @@ def apodize(amp, phase, initial_shape, window_type, debugging=False, **kwargs):
     # check and load kwargs
     valid.valid_kwargs(
         kwargs=kwargs,
-        allowed_kwargs={"cmap", "sigma", "mu", "alpha", "is_orthogonal"},
+        allowed_kwargs={"cmap", "sigma", "mu", "alpha", "is_orthogonal", "workers"},
         name="postprocessing_utils.apodize",
     )
     sigma = kwargs.get("sigma")
@@ -69,6 +70,7 @@ def apodize(amp, phase, initial_shape, window_type, debugging=False, **kwargs):
     alpha = kwargs.get("alpha")
     is_orthogonal = kwargs.get("is_orthogonal", False)
     cmap = kwargs.get("cmap", "turbo")
+    workers = kwargs.get("workers", -1)
     # calculate the diffraction pattern of the reconstructed object
     nb_z, nb_y, nb_x = amp.shape
     nbz, nby, nbx = initial_shape
@@ -87,7 +89,7 @@ def apodize(amp, phase, initial_shape, window_type, debugging=False, **kwargs):
             cmap=cmap,
         )
 
-    my_fft = fftshift(fftn(myobj))
+    my_fft = fftshift(fftn(myobj, workers=workers))
     del myobj
     gc.collect()
     fftmax = abs(my_fft).max()
@@ -154,7 +156,7 @@ def apodize(amp, phase, initial_shape, window_type, debugging=False, **kwargs):
             cmap=cmap,
         )
 
-    myobj = ifftn(ifftshift(my_fft))
+    myobj = ifftn(ifftshift(my_fft), workers=workers)
     del my_fft
     gc.collect()
     if debugging:
@@ -484,7 +486,7 @@ def center_max(array: np.ndarray, debugging: bool = False, **kwargs) -> np.ndarr
     # find the offset of the max relative to the center of the array #
     ##################################################################
     nbz, nby, nbx = array.shape
-    piz, piy, pix = np.unravel_index(abs(array).argmax(), array.shape)
+    piz, piy, pix = np.unravel_index(util.argmax_modulus(array), array.shape)
     offset_z = int(np.rint(nbz / 2.0 - piz))
     offset_y = int(np.rint(nby / 2.0 - piy))
     offset_x = int(np.rint(nbx / 2.0 - pix))
@@ -785,12 +787,16 @@ def flip_reconstruction(obj, debugging=False, **kwargs):
     :param kwargs:
 
      - 'cmap': str, name of the colormap
+     - 'workers': int, number of workers used for the FFTs, -1 to use all CPUs
 
     :return: the flipped complex object
     """
     valid.valid_ndarray(arrays=obj, ndim=3)
     cmap = kwargs.get("cmap", "turbo")
-    flipped_obj = ifftn(ifftshift(np.conj(fftshift(fftn(obj)))))
+    workers = kwargs.get("workers", -1)
+    flipped_obj = ifftn(
+        ifftshift(np.conj(fftshift(fftn(obj, workers=workers)))), workers=workers
+    )
     if debugging:
         gu.multislices_plot(
             abs(obj),
@@ -1625,6 +1631,7 @@ def remove_ramp(
 
      - 'cmap': str, name of the colormap
      - 'logger': an optional logger
+     - 'workers': int, number of workers used for the FFTs, -1 to use all CPUs
 
     :return: normalized amplitude, detrended phase, ramp along z, ramp along y,
      ramp along x
@@ -1632,6 +1639,7 @@ def remove_ramp(
     logger = kwargs.get("logger", module_logger)
     valid.valid_ndarray(arrays=(amp, phase), ndim=3)
     cmap = kwargs.get("cmap", "turbo")
+    workers = kwargs.get("workers", -1)
     if method == "upsampling":
         nbz, nby, nbx = [mysize * ups_factor for mysize in initial_shape]
         nb_z, nb_y, nb_x = amp.shape
@@ -1641,7 +1649,7 @@ def remove_ramp(
             plt.imshow(np.log10(abs(myobj).sum(axis=0)))
             plt.title("np.log10(abs(myobj).sum(axis=0))")
             plt.pause(0.1)
-        my_fft = fftshift(fftn(ifftshift(myobj)))
+        my_fft = fftshift(fftn(ifftshift(myobj), workers=workers))
         del myobj, amp, phase
         gc.collect()
         if debugging:
@@ -1658,7 +1666,7 @@ def remove_ramp(
         shiftx = xcom - (nbx / 2)
 
         # phase shift in real space
-        buf2ft = fftn(my_fft)  # in real space
+        buf2ft = fftn(my_fft, workers=workers)  # in real space
         del my_fft
         gc.collect()
         if debugging:
@@ -1685,7 +1693,7 @@ def remove_ramp(
             plt.title("abs(greg).sum(axis=0)")
             plt.pause(0.1)
 
-        my_fft = ifftn(greg)
+        my_fft = ifftn(greg, workers=workers)
         del greg
         gc.collect()
         # end of phase shift in real space
@@ -1697,7 +1705,7 @@ def remove_ramp(
             plt.pause(0.1)
 
         logger.info(f"COM after subpixel shift: {center_of_mass(abs(my_fft) ** 4)}")
-        myobj = fftshift(ifftn(ifftshift(my_fft)))
+        myobj = fftshift(ifftn(ifftshift(my_fft), workers=workers))
         del my_fft
         gc.collect()
         if debugging:
@@ -1853,6 +1861,7 @@ def remove_ramp_2d(
     method="gradient",
     ups_factor=2,
     debugging=False,
+    workers=-1,
 ):
     """
     Remove the linear trend in the ramp using its gradient and a threshold.
@@ -1875,6 +1884,7 @@ def remove_ramp_2d(
      by this value)
     :param debugging: set to True to see plots
     :type debugging: bool
+    :param workers: number of workers used for the FFTs, -1 to use all CPUs
     :return: normalized amplitude, detrended phase, ramp along y, ramp along x
     """
     valid.valid_ndarray(arrays=(amp, phase), ndim=2)
@@ -1888,7 +1898,7 @@ def remove_ramp_2d(
             plt.imshow(np.log10(abs(myobj)))
             plt.title("np.log10(abs(myobj))")
             plt.pause(0.1)
-        my_fft = fftshift(fftn(ifftshift(myobj)))
+        my_fft = fftshift(fftn(ifftshift(myobj), workers=workers))
         del myobj, amp, phase
         gc.collect()
         if debugging:
@@ -1904,7 +1914,7 @@ def remove_ramp_2d(
         shiftx = xcom - (nbx / 2)
 
         # phase shift in real space
-        buf2ft = fftn(my_fft)  # in real space
+        buf2ft = fftn(my_fft, workers=workers)  # in real space
         del my_fft
         gc.collect()
         if debugging:
@@ -1927,7 +1937,7 @@ def remove_ramp_2d(
             plt.title("abs(greg)")
             plt.pause(0.1)
 
-        my_fft = ifftn(greg)
+        my_fft = ifftn(greg, workers=workers)
         del greg
         gc.collect()
         # end of phase shift in real space
@@ -1939,7 +1949,7 @@ def remove_ramp_2d(
             plt.pause(0.1)
 
         print("COM after subpixel shift", center_of_mass(abs(my_fft) ** 4))
-        myobj = fftshift(ifftn(ifftshift(my_fft)))
+        myobj = fftshift(ifftn(ifftshift(my_fft), workers=workers))
         del my_fft
         gc.collect()
         if debugging:
@@ -2181,9 +2191,10 @@ def unwrap(
     is_orthogonal = kwargs.get("is_orthogonal", False)
 
     ndim = obj.ndim
-    unwrap_support = np.ones(obj.shape, dtype=int)
-    unwrap_support[abs(obj) > support_threshold * abs(obj).max()] = 0
-    # 0 is a valid entry for ma.masked_array
+    modulus = abs(obj)
+    # True for masked voxels (outside of the support)
+    unwrap_support = modulus <= support_threshold * modulus.max()
+    del modulus
     phase_wrapped: np.ndarray = ma.masked_array(np.angle(obj), mask=unwrap_support)
 
     if debugging and ndim == 3:
@@ -2197,7 +2208,7 @@ def unwrap(
         )
 
     phase_unwrapped = unwrap_phase(phase_wrapped, wrap_around=False, seed=seed).data
-    phase_unwrapped[np.nonzero(unwrap_support)] = 0
+    phase_unwrapped[unwrap_support] = 0
     if debugging and ndim == 3:
         gu.multislices_plot(
             phase_unwrapped,
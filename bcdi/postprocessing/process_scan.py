@@ -13,13 +13,14 @@ except ModuleNotFoundError:
     pass
 import logging
 import os
+from datetime import datetime
 from logging import Logger
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-import matplotlib
 import numpy as np
 from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
 
 import bcdi.graph.graph_utils as gu
 import bcdi.postprocessing.postprocessing_utils as pu
@@ -30,6 +31,23 @@ from bcdi.utils.snippets_logging import FILE_FORMATTER
 
 logger = logging.getLogger(__name__)
 
+# figures of the results, reused for all scans processed by the same process
+_FIGURES: Dict[str, Figure] = {}
+
+
+def _get_figure(name: str) -> Figure:
+    """Get the figure used for the plot 'name', create it if needed."""
+    fig = _FIGURES.get(name)
+    if fig is None or not plt.fignum_exists(fig.number):
+        fig = plt.figure()
+        _FIGURES[name] = fig
+    return fig
+
+
+def _annotate(fig: Figure, lines: List[str], top: float) -> None:
+    """Write the annotation lines in a single text artist, 5% of the height apart."""
+    fig.text(0.60, top, "\n".join(lines), size=20, va="top", linespacing=1.62)
+
 
 def process_scan(
     scan_idx: int, prm: Dict[str, Any]
@@ -39,13 +57,13 @@ def process_scan(
 
     This function is meant to be run as a process in multiprocessing, although it can
     also be used as a normal function for a single scan. It assumes that the dictionary
-    of parameters was validated via a ConfigChecker instance.
+    of parameters was validated via a ConfigChecker instance. The matplotlib backend
+    is expected to be already set by the caller, once per process.
 
     :param scan_idx: index of the scan to be processed in prm["scans"]
     :param prm: the parsed parameters
     """
     scan_nb = prm["scans"][scan_idx]
-    matplotlib.use(prm["backend"])
 
     tmpfile = (
         Path(
@@ -61,11 +79,11 @@ def process_scan(
     logger.addHandler(filehandler)
     if not prm["multiprocessing"] or len(prm["scans"]) == 1:
         logger.propagate = True
+    else:  # other scans are processed in parallel, do not oversubscribe the CPUs
+        prm["fft_workers"] = 1
 
     prm["sample"] = f"{prm['sample_name']}+{scan_nb}"
     tmp_str = f"Scan {scan_idx + 1}/{len(prm['scans'])}: S{scan_nb}"
-    from datetime import datetime
-
     logger.info(f"Start {process_scan.__name__} at {datetime.now()}")
     logger.info(f'\n{"#" * len(tmp_str)}\n' + tmp_str + "\n" + f'{"#" * len(tmp_str)}')
 
@@ -93,6 +111,7 @@ def process_scan(
         scan_index=scan_idx, parameters=prm, setup=setup, logger=logger
     )
     comment = analysis.comment
+    cmap = prm["colormap"].cmap
 
     analysis.find_data_range(amplitude_threshold=0.05, plot_margin=prm["plot_margin"])
 
@@ -126,26 +145,23 @@ def process_scan(
         phase_manipulator.average_phase()
         comment.concatenate("avg" + str(2 * prm["half_width_avg_phase"] + 1))
 
-    #############################################################
-    # put back the phase ramp otherwise the diffraction pattern #
-    # will be shifted and the prtf messed up                    #
-    #############################################################
-    phase_manipulator.add_ramp()
-
     if prm["apodize"]:
+        # the apodization window is applied in reciprocal space, the phase ramp needs
+        # to be put back otherwise the diffraction pattern will be shifted
+        phase_manipulator.add_ramp()
         phase_manipulator.apodize()
         comment.concatenate("apodize_" + prm["apodization_window"])
+        phase_manipulator.add_ramp(sign=-1)
 
-    np.savez_compressed(
-        setup.detector.savedir + "S" + str(scan_nb) + "_avg_obj_prtf" + comment.text,
-        obj=phase_manipulator.modulus * np.exp(1j * phase_manipulator.phase),
+    #############################################################
+    # put back the phase ramp otherwise the diffraction pattern #
+    # will be shifted and the prtf messed up                    #
+    #############################################################
+    # the phase without ramp is kept for the orthogonalization
+    phase_manipulator.save_object_with_ramp(
+        setup.detector.savedir + "S" + str(scan_nb) + "_avg_obj_prtf" + comment.text
     )
 
-    ####################################################
-    # remove again phase ramp before orthogonalization #
-    ####################################################
-    phase_manipulator.add_ramp(sign=-1)
-
     analysis.update_data(
         modulus=phase_manipulator.modulus, phase=phase_manipulator.phase
     )
@@ -328,18 +344,12 @@ def process_scan(
     logger.info(voxel_sizes_text)
 
     if prm["save"]:
-        interpolated_crystal.save_results_as_npz(
+        interpolated_crystal.save_results(
             filename=f"{setup.detector.savedir}S{scan_nb}_"
             f"amp{prm['phase_fieldname']}strain{comment.text}",
             setup=setup,
         )
 
-        interpolated_crystal.save_results_as_h5(
-            filename=f"{setup.detector.savedir}S{scan_nb}_"
-            f"amp{prm['phase_fieldname']}strain{comment.text}.h5",
-            setup=setup,
-        )
-
         # save amp & phase to VTK
         # in VTK, x is downstream, y vertical, z inboard,
         # thus need to flip the last axis
@@ -373,7 +383,7 @@ def process_scan(
 
     interpolated_crystal.find_max_phase(
         filename=f"{setup.detector.savedir}S{scan_nb}"
-        f"_phase_at_max{comment.text}.png"
+        f"_phase_at_max{comment.text}.{prm['plot_format']}"
     )
     interpolated_crystal.threshold_phase_strain()
 
@@ -387,6 +397,7 @@ def process_scan(
     # amplitude
     fig, _, _ = gu.multislices_plot(
         modulus,
+        figure=_get_figure("amp"),
         sum_frames=False,
         title="Normalized orthogonal amp",
         vmin=0,
@@ -398,18 +409,18 @@ def process_scan(
         plot_colorbar=True,
         is_orthogonal=True,
         reciprocal_space=False,
-        cmap=prm["colormap"].cmap,
-    )
-    fig.text(0.60, 0.45, f"Scan {scan_nb}", size=20)
-    fig.text(0.60, 0.40, voxel_sizes_text, size=20)
-    fig.text(0.60, 0.35, f"Ticks spacing={prm['tick_spacing']} nm", size=20)
-    fig.text(0.60, 0.30, f"Volume={int(volume)} nm3", size=20)
-    fig.text(0.60, 0.25, "Sorted by " + prm["sort_method"], size=20)
-    fig.text(
-        0.60, 0.20, f"correlation threshold={prm['correlation_threshold']}", size=20
+        cmap=cmap,
     )
-    fig.text(0.60, 0.15, f"average over {nb_phasing} reconstruction(s)", size=20)
-    fig.text(0.60, 0.10, f"Planar distance={planar_dist:.5f} nm", size=20)
+    annotations = [
+        f"Scan {scan_nb}",
+        voxel_sizes_text,
+        f"Ticks spacing={prm['tick_spacing']} nm",
+        f"Volume={int(volume)} nm3",
+        "Sorted by " + prm["sort_method"],
+        f"correlation threshold={prm['correlation_threshold']}",
+        f"average over {nb_phasing} reconstruction(s)",
+        f"Planar distance={planar_dist:.5f} nm",
+    ]
     if prm["get_temperature"]:
         temperature = pu.bragg_temperature(
             spacing=planar_dist * 10,
@@ -419,13 +430,24 @@ def process_scan(
             use_q=False,
             material="Pt",
         )
-        fig.text(0.60, 0.05, f"Estimated T={temperature} C", size=20)
+        annotations.append(f"Estimated T={temperature} C")
+    _annotate(fig, annotations, top=0.48)
     if prm["save"]:
-        fig.savefig(setup.detector.savedir + f"S{scan_nb}_amp" + comment.text + ".png")
+        gu.save_figure(
+            fig,
+            f"{setup.detector.savedir}S{scan_nb}_amp{comment.text}"
+            f".{prm['plot_format']}",
+        )
 
     # amplitude histogram
-    fig, ax = plt.subplots(1, 1)
-    ax.hist(modulus[modulus > 0.05 * modulus.max()].flatten(), bins=250)
+    fig = _get_figure("histo_amp")
+    fig.clear()
+    ax = fig.subplots(1, 1)
+    max_modulus = modulus.max()
+    counts, bin_edges = np.histogram(
+        modulus, bins=250, range=(0.05 * max_modulus, max_modulus)
+    )
+    ax.stairs(counts, bin_edges, fill=True)
     ax.set_ylim(bottom=1)
     ax.tick_params(
         labelbottom=True,
@@ -438,19 +460,22 @@ def process_scan(
     ax.spines["left"].set_linewidth(1.5)
     ax.spines["top"].set_linewidth(1.5)
     ax.spines["bottom"].set_linewidth(1.5)
-    fig.savefig(
-        setup.detector.savedir + f"S{scan_nb}_histo_amp" + comment.text + ".png"
+    gu.save_figure(
+        fig,
+        f"{setup.detector.savedir}S{scan_nb}_histo_amp{comment.text}"
+        f".{prm['plot_format']}",
     )
 
     # phase
     fig, _, _ = gu.multislices_plot(
         interpolated_crystal.phase,
+        figure=_get_figure("displacement"),
         sum_frames=False,
         title="Orthogonal displacement",
         vmin=-prm["phase_range"],
         vmax=prm["phase_range"],
         tick_direction=prm["tick_direction"],
-        cmap=prm["colormap"].cmap,
+        cmap=cmap,
         tick_width=prm["tick_width"],
         tick_length=prm["tick_length"],
         pixel_spacing=pixel_spacing,
@@ -458,33 +483,31 @@ def process_scan(
         is_orthogonal=True,
         reciprocal_space=False,
     )
-    fig.text(0.60, 0.30, f"Scan {scan_nb}", size=20)
-    fig.text(
-        0.60,
-        0.25,
+    annotations = [
+        f"Scan {scan_nb}",
         f"Voxel size=({voxel_sizes[0]:.1f}, {voxel_sizes[1]:.1f}, "
         f"{voxel_sizes[2]:.1f}) (nm)",
-        size=20,
-    )
-    fig.text(0.60, 0.20, f"Ticks spacing={prm['tick_spacing']} nm", size=20)
-    fig.text(0.60, 0.15, f"average over {nb_phasing} reconstruction(s)", size=20)
+        f"Ticks spacing={prm['tick_spacing']} nm",
+        f"average over {nb_phasing} reconstruction(s)",
+    ]
     if prm["half_width_avg_phase"] > 0:
-        fig.text(
-            0.60,
-            0.10,
-            f"Averaging over {2 * prm['half_width_avg_phase'] + 1} pixels",
-            size=20,
+        annotations.append(
+            f"Averaging over {2 * prm['half_width_avg_phase'] + 1} pixels"
         )
     else:
-        fig.text(0.60, 0.10, "No phase averaging", size=20)
+        annotations.append("No phase averaging")
+    _annotate(fig, annotations, top=0.33)
     if prm["save"]:
-        fig.savefig(
-            setup.detector.savedir + f"S{scan_nb}_displacement" + comment.text + ".png"
+        gu.save_figure(
+            fig,
+            f"{setup.detector.savedir}S{scan_nb}_displacement{comment.text}"
+            f".{prm['plot_format']}",
         )
 
     # strain
     fig, _, _ = gu.multislices_plot(
         interpolated_crystal.strain,
+        figure=_get_figure("strain"),
         sum_frames=False,
         title="Orthogonal strain",
         vmin=-prm["strain_range"],
@@ -493,37 +516,38 @@ def process_scan(
         tick_width=prm["tick_width"],
         tick_length=prm["tick_length"],
         plot_colorbar=True,
-        cmap=prm["colormap"].cmap,
+        cmap=cmap,
         pixel_spacing=pixel_spacing,
         is_orthogonal=True,
         reciprocal_space=False,
     )
-    fig.text(0.60, 0.30, f"Scan {scan_nb}", size=20)
-    fig.text(
-        0.60,
-        0.25,
-        f"Voxel size=({voxel_sizes[0]:.1f}, "
-        f"{voxel_sizes[1]:.1f}, {voxel_sizes[2]:.1f}) (nm)",
-        size=20,
-    )
-    fig.text(0.60, 0.20, f"Ticks spacing={prm['tick_spacing']} nm", size=20)
-    fig.text(0.60, 0.15, f"average over {nb_phasing} reconstruction(s)", size=20)
+    annotations = [
+        f"Scan {scan_nb}",
+        f"Voxel size=({voxel_sizes[0]:.1f}, {voxel_sizes[1]:.1f}, "
+        f"{voxel_sizes[2]:.1f}) (nm)",
+        f"Ticks spacing={prm['tick_spacing']} nm",
+        f"average over {nb_phasing} reconstruction(s)",
+    ]
     if prm["half_width_avg_phase"] > 0:
-        fig.text(
-            0.60,
-            0.10,
-            f"Averaging over {2 * prm['half_width_avg_phase'] + 1} pixels",
-            size=20,
+        annotations.append(
+            f"Averaging over {2 * prm['half_width_avg_phase'] + 1} pixels"
         )
     else:
-        fig.text(0.60, 0.10, "No phase averaging", size=20)
+        annotations.append("No phase averaging")
+    _annotate(fig, annotations, top=0.33)
     if prm["save"]:
-        fig.savefig(
-            setup.detector.savedir + f"S{scan_nb}_strain" + comment.text + ".png"
+        gu.save_figure(
+            fig,
+            f"{setup.detector.savedir}S{scan_nb}_strain{comment.text}"
+            f".{prm['plot_format']}",
         )
 
     if len(prm["scans"]) > 1:
-        plt.close("all")
+        # close the other figures, the figures of the results are reused
+        reused_figures = {fig.number for fig in _FIGURES.values()}
+        for number in plt.get_fignums():
+            if number not in reused_figures:
+                plt.close(number)
 
     logger.removeHandler(filehandler)
     filehandler.close()
@@ -17,7 +17,6 @@ from __future__ import absolute_import, division, print_function
 import inspect
 import os
 import pickle
-import time
 from typing import Optional
 
 import numpy as np
@@ -52,6 +51,11 @@ class DataSet:
     The object will also contains some basic methods for data reuction such as ROI
     extraction, attenuation correction and plotting. Meant to be used on the data
     produced after the 11/03/2019 data of the upgrade of the datarecorder.
+
+    The recorded scanned data is loaded from the file only when the corresponding
+    attribute is accessed for the first time. The file is reopened at each of these
+    accesses, it must therefore stay readable at the same path after the
+    initialization of the object.
     """
 
     allowed_alias_dict = [
@@ -70,6 +74,7 @@ class DataSet:
         self.file: Optional[tables.File] = None
         self.start_time = 1
         self.attlist = []
+        self._leaves = {}  # attribute name: (path of the node, shape of the node)
         self._list2d = []
         self._SpecNaNs = (
             nxs2spec  # Remove the NaNs if the spec file need to be generated
@@ -107,8 +112,8 @@ class DataSet:
             return True
 
         # Load the file
-        fullpath = os.path.join(self.directory, self.filename)
-        self.file = tables.open_file(fullpath, "r")
+        self._fullpath = os.path.join(self.directory, self.filename)
+        self.file = self._open_file()
         f = self.file.list_nodes("/")[0]
 
         # check if any scanned data a are present
@@ -129,11 +134,11 @@ class DataSet:
         ###############
         if self.scantype == "FLY":
             # generating the attributes with the recorded scanned data
-            for leaf in f.scan_data:
-                list.append(attlist, leaf.name)
-                self.__dict__[leaf.name] = leaf[:]
-                time.sleep(0.1)
-            self.attlist = attlist
+            leaves = list(f.scan_data)
+            self._leaves.update(
+                {leaf.name: (leaf._v_pathname, leaf.shape) for leaf in leaves}
+            )
+            self.attlist = [leaf.name for leaf in leaves]
 
         ###############
         # Reading SBS #
@@ -141,34 +146,35 @@ class DataSet:
         if self.scantype == "SBS":
             if self._alias_dict:  # Reading with dictionary
                 for leaf in f.scan_data:
+                    long_name = leaf.attrs.long_name.decode("UTF-8")
                     try:
-                        alias = self._alias_dict[leaf.attrs.long_name.decode("UTF-8")]
+                        alias = self._alias_dict[long_name]
                         if alias not in aliases:
                             aliases.append(alias)
-                            self.__dict__[alias] = leaf[:]
+                            self._add_leaf(alias, leaf)
                     except KeyError:
-                        self.__dict__[leaf.attrs.long_name.decode("UTF-8")] = leaf[:]
-                        aliases.append(leaf.attrs.long_name.decode("UTF-8"))
+                        self._add_leaf(long_name, leaf)
+                        aliases.append(long_name)
                 self.attlist = aliases
 
             else:
                 for leaf in f.scan_data:  # Reading with dictionary
                     # generating the attributes with the recorded scanned data
-                    attr = leaf.attrs.long_name.decode("UTF-8")
-                    attrshort = leaf.attrs.long_name.decode("UTF-8").split("/")[-1]
-                    attrlong = leaf.attrs.long_name.decode("UTF-8").split("/")[-2:]
+                    attr = leaf.attrs.long_name.decode("UTF-8").split("/")
+                    attrshort = attr[-1]
                     if attrshort not in attlist:
                         if (
-                            attr.split("/")[-1] == "sensorsTimestamps"
+                            attrshort == "sensorsTimestamps"
                         ):  # rename the sensortimestamps as epoch
-                            list.append(attlist, "epoch")
-                            self.__dict__["epoch"] = leaf[:]
+                            attlist.append("epoch")
+                            self._add_leaf("epoch", leaf)
                         else:
-                            list.append(attlist, attr.split("/")[-1])
-                            self.__dict__[attr.split("/")[-1]] = leaf[:]
+                            attlist.append(attrshort)
+                            self._add_leaf(attrshort, leaf)
                     else:  # Dealing with for double naming
-                        list.append(attlist, "_".join(attrlong))
-                        self.__dict__["_".join(attrlong)] = leaf[:]
+                        attrlong = "_".join(attr[-2:])
+                        attlist.append(attrlong)
+                        self._add_leaf(attrlong, leaf)
                 self.attlist = attlist
 
         ##########################
@@ -186,13 +192,16 @@ class DataSet:
 
         self.det2d()  # generating the list self._list2d
         for el in self._list2d:
-            detarray = self.get_stack(el)
-            detsize = detarray.shape[1]  # the key for the dictionary
+            detsize = self._get_shape(el)[1]  # the key for the dictionary
 
             if detsize in bl2d:
                 detname = bl2d[detsize]  # the detector name from the size
-                if not hasattr(self, detname):
-                    self.__setattr__(detname, detarray)  # adding the new attrinute name
+                if detname not in self._leaves and not hasattr(self, detname):
+                    # adding the new attribute name
+                    if el in self._leaves:
+                        self._leaves[detname] = self._leaves[el]
+                    else:
+                        self.__setattr__(detname, self.get_stack(el))
                     self.attlist.append(detname)
             else:
                 print("Detected a not standard detector: check ReadNxs3")
@@ -617,6 +626,36 @@ class DataSet:
         print("### End of ReadNxs3 ###\n")
         self.file.close()
 
+    def __getattr__(self, name):
+        """Load the recorded scanned data when it is accessed for the first time."""
+        leaves = self.__dict__.get("_leaves", {})
+        if name not in leaves:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        with self._open_file() as file:
+            value = file.get_node(leaves[name][0])[:]
+        # the same node can be shared by several attributes (e.g. detector aliases)
+        for key in [key for key, val in leaves.items() if val == leaves[name]]:
+            self.__dict__[key] = value
+            del leaves[key]
+        return value
+
+    def _add_leaf(self, name, leaf):
+        """Register a node of the file, which will be loaded on first access."""
+        self.__dict__.pop(name, None)
+        self._leaves[name] = (leaf._v_pathname, leaf.shape)
+
+    def _open_file(self):
+        """Open the data file in read mode."""
+        return tables.open_file(self._fullpath, "r")
+
+    def _get_shape(self, name):
+        """Get the shape of an attribute without loading the data."""
+        if name in self._leaves:
+            return self._leaves[name][1]
+        return np.shape(getattr(self, name))
+
     ############################################
     # down here useful function in the NxsRead #
     ############################################
@@ -632,7 +671,7 @@ class DataSet:
         :return: the stack of images
         """
         try:
-            stack = self.__getattribute__(det2d_name)
+            stack = getattr(self, det2d_name)
             return stack
         except AttributeError:
             print("There is no such attribute")
@@ -708,7 +747,7 @@ class DataSet:
         scans the ROI is expected as eg: [257, 126,  40,  40]
         """
         if hasattr(self, maskname):
-            mask = self.__getattribute__(maskname)
+            mask = getattr(self, maskname)
             integrals = self.roi_sum_mask(stack, roiextent, mask)
         if not hasattr(self, maskname):
             integrals = self.roi_sum(stack, roiextent)
@@ -830,23 +869,23 @@ class DataSet:
                 if not hasattr(
                     self, "_npts"
                 ):  # check if the process was alredy runned once on this object
-                    self._npts = len(self.__getattribute__(list2d[0]))
+                    self._npts = len(getattr(self, list2d[0]))
                     for el in list2d:
-                        if self.__getattribute__("_ifmask_" + el):
+                        if getattr(self, "_ifmask_" + el):
                             maskname = "_mask_" + el
-                        if not self.__getattribute__("_ifmask_" + el):
+                        if not getattr(self, "_ifmask_" + el):
                             maskname = "NO_mask_"  # not existent attribute filtered
                             # away from the roi_sum function
                         for pos, roi in enumerate(
-                            self.__getattribute__("_roi_limits_" + el), start=0
+                            getattr(self, "_roi_limits_" + el), start=0
                         ):
                             roi_name = (
-                                self.__getattribute__("_roi_names_" + el)[pos]
+                                getattr(self, "_roi_names_" + el)[pos]
                                 + "_"
                                 + el
                                 + "c_new"
                             )
-                            stack = self.__getattribute__(el)
+                            stack = getattr(self, el)
                             attenuators = self.att_sbs_xpad[:]
                             self.calc_roi(
                                 stack,
@@ -872,23 +911,23 @@ class DataSet:
                 if not hasattr(
                     self, "_npts"
                 ):  # check if the process was alredy runned once on this object
-                    self._npts = len(self.__getattribute__(self._list2d[0]))
+                    self._npts = len(getattr(self, self._list2d[0]))
                     for el in self._list2d:
-                        if self.__getattribute__("_ifmask_" + el):
+                        if getattr(self, "_ifmask_" + el):
                             maskname = "_mask_" + el
-                        if not self.__getattribute__("_ifmask_" + el):
+                        if not getattr(self, "_ifmask_" + el):
                             maskname = "NO_mask_"  # not existent attribute filtered
                             # away from the roi_sum function
                         for pos, roi in enumerate(
-                            self.__getattribute__("_roi_limits_" + el), start=0
+                            getattr(self, "_roi_limits_" + el), start=0
                         ):
                             roi_name = (
-                                self.__getattribute__("_roi_names_" + el)[pos]
+                                getattr(self, "_roi_names_" + el)[pos]
                                 + "_"
                                 + el
                                 + "c_new"
                             )
-                            stack = self.__getattribute__(el)
+                            stack = getattr(self, el)
                             attenuators = self.attenuation[
                                 :
                             ]  # filters and motors are shifted of one points
@@ -915,7 +954,7 @@ class DataSet:
         :return: a matrix of size: 'side detector pixels' x 'number of images'
         """
         if hasattr(self, "mask"):
-            mask = self.__getattribute__("mask")
+            mask = getattr(self, "mask")
         else:
             mask = 1
         if np.shape(mask_extra):
@@ -923,7 +962,7 @@ class DataSet:
             if np.shape(mask) == (240, 560):
                 self.make_mask_frame_xpad()
         for el in self.attlist:
-            bla = self.__getattribute__(el)
+            bla = getattr(self, el)
             # get the attributes from list one by one
             if len(bla.shape) == 3:  # check for image stacks
                 # Does Not work if you have more than one 2D detectors
@@ -947,11 +986,15 @@ class DataSet:
         """Return the name of the 2D detector."""
         list2d = []
         for el in self.attlist:
-            bla = self.__getattribute__(el)
             # get the attributes from list one by one
-            if (
-                isinstance(bla, (np.ndarray, np.generic)) and len(bla.shape) == 3
-            ):  # check for image stacks
+            if el in self._leaves:  # not loaded yet, use the shape of the node
+                is_stack = len(self._leaves[el][1]) == 3
+            else:
+                bla = getattr(self, el)
+                is_stack = (
+                    isinstance(bla, (np.ndarray, np.generic)) and len(bla.shape) == 3
+                )
+            if is_stack:  # check for image stacks
                 list2d.append(el)
         if len(list2d) > 0:
             self._list2d = list2d
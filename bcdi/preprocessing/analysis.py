@@ -259,7 +259,7 @@ class InteractiveMasker:
         self.fig_mask.set_facecolor(self.parameters["background_plot"])
         plt.show()
 
-        self._mask[np.nonzero(self._mask)] = 1
+        np.putmask(self._mask, self._mask != 0, 1)
 
     def refine_mask(self) -> None:
         if self._mask is None:
@@ -434,8 +434,9 @@ class Analysis(ABC):
     def apply_photon_threshold(self) -> None:
         threshold = self.parameters["photon_threshold"]
         if threshold != 0:
-            self.mask[self.data < threshold] = 1
-            self.data[self.data < threshold] = 0
+            below_threshold = self.data < threshold
+            np.copyto(self.mask, 1, where=below_threshold)
+            np.copyto(self.data, 0, where=below_threshold)
             self.logger.info(f"Applying photon threshold < {threshold}")
 
     def bin_rocking_axis(self) -> None:
@@ -446,14 +447,7 @@ class Analysis(ABC):
             cmap=self.parameters["colormap"].cmap,
             logger=self.logger,
         )
-        self.mask = util.bin_data(
-            self.mask,
-            (self.setup.detector.binning[0], 1, 1),
-            debugging=False,
-            cmap=self.parameters["colormap"].cmap,
-            logger=self.logger,
-        )
-        self.mask[np.nonzero(self.mask)] = 1
+        self.mask = util.bin_mask(self.mask, (self.setup.detector.binning[0], 1, 1))
         self.setup.detector.current_binning = list(
             map(
                 mul,
@@ -813,7 +807,7 @@ class Analysis(ABC):
         )
 
     def set_binary_mask(self):
-        self.mask[np.nonzero(self.mask)] = 1
+        np.putmask(self.mask, self.mask != 0, 1)
         self.mask = self.mask.astype(int)
 
     def show_array(self, array: np.ndarray, title: str, **kwargs) -> Any:
@@ -875,7 +869,7 @@ class Analysis(ABC):
     def update_mask(self, mask_file: str) -> None:
         config_mask, _ = util.load_file(mask_file)
         valid.valid_ndarray(config_mask, shape=self.data.shape)
-        config_mask[np.nonzero(config_mask)] = 1
+        np.putmask(config_mask, config_mask != 0, 1)
         self.mask = np.multiply(self.mask, config_mask.astype(self.mask.dtype))
 
     def update_parameters(self, dictionary: Dict[str, Any]) -> None:
@@ -1238,13 +1232,7 @@ class ReloadingOrthogonalFrame(PreprocessingLoader):
                 cmap=self.parameters["colormap"].cmap,
                 logger=self.logger,
             )
-            mask = util.bin_data(
-                mask,
-                binning=self.setup.detector.binning,
-                debugging=False,
-                cmap=self.parameters["colormap"].cmap,
-                logger=self.logger,
-            )
+            mask = util.bin_mask(mask, binning=self.setup.detector.binning)
             self.setup.detector.current_binning = list(
                 map(
                     mul,
@@ -1252,7 +1240,6 @@ class ReloadingOrthogonalFrame(PreprocessingLoader):
                     self.setup.detector.binning,
                 )
             )
-            mask[np.nonzero(mask)] = 1
 
             if q_values is not None:
                 qx = q_values[0]
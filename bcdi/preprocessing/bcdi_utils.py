@@ -14,15 +14,16 @@ except ModuleNotFoundError:
 
 import logging
 import pathlib
+from functools import cached_property
 from numbers import Real
 from operator import mul
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
 import xrayutilities as xu
-from scipy.interpolate import interp1d
-from scipy.ndimage import center_of_mass
+from matplotlib.lines import Line2D
+from scipy.interpolate import CubicSpline
 
 from bcdi.experiment import loader
 from bcdi.graph import graph_utils as gu
@@ -30,6 +31,7 @@ from bcdi.utils import utilities as util
 from bcdi.utils import validation as valid
 
 if TYPE_CHECKING:
+    from bcdi.experiment.detector import Detector
     from bcdi.experiment.setup import Setup
 
 module_logger = logging.getLogger(__name__)
@@ -87,7 +89,7 @@ class PeakFinder:
         self._tilt_value_at_peak: Optional[float] = None
 
     @property
-    def binning(self) -> List[int]:
+    def binning(self) -> Tuple[int, ...]:
         """Binning factor of the array pixels, one number per array axis."""
         return self._binning
 
@@ -101,7 +103,8 @@ class PeakFinder:
             allow_none=False,
             name="binning",
         )
-        self._binning = value
+        self._binning = tuple(value)
+        self._clear_roi_center()
 
     @property
     def bragg_peak(self) -> Tuple[int, int, int]:
@@ -133,6 +136,7 @@ class PeakFinder:
         if value not in self.PEAK_METHODS:
             raise ValueError(f"allowed peak methods {self.PEAK_METHODS}, got {value}")
         self._peak_method = value
+        self._clear_roi_center()
 
     @property
     def peaks(self) -> Dict[str, Tuple[int, int, int]]:
@@ -140,7 +144,7 @@ class PeakFinder:
         return self._peaks
 
     @property
-    def region_of_interest(self) -> List[int]:
+    def region_of_interest(self) -> Optional[Tuple[int, int, int, int]]:
         """
         Region of interest used when loading the detector images.
 
@@ -158,7 +162,8 @@ class PeakFinder:
             allow_none=True,
             name="region_of_interest",
         )
-        self._region_of_interest = value
+        self._region_of_interest = tuple(value) if value is not None else None
+        self._clear_roi_center()
 
     def find_peak(self) -> Dict[str, Tuple[int, int, int]]:
         """
@@ -169,41 +174,50 @@ class PeakFinder:
          - "com": center of mass of the modulus
          - "max_com": "max" along the first axis, "com" along the other axes
         """
-        index_max = np.unravel_index(abs(self.array).argmax(), self.array.shape)
+        # the maximum is searched only once, it is the same for "max" and "max_com"
+        index_max = np.unravel_index(util.argmax_modulus(self.array), self.array.shape)
         position_max = [int(val) for val in index_max]
         self.logger.info(
             f"Max at: {position_max}, value = {int(self.array[index_max])}"
         )
 
-        position_com = center_of_mass(self.array)
-        position_com = tuple(map(lambda x: int(np.rint(x)), position_com))
+        # the projection onto the first axis is also the rocking curve
+        projections = util.axis_projections(self.array)
+        self._integrated_frames = projections[0]
+        position_com = util.center_of_mass(projections=projections)
+        position_com = tuple(int(val) for val in np.rint(position_com))
         self.logger.info(
             f"Center of mass at: {position_com}, "
             f"value = {int(self.array[position_com])}"
         )
 
-        index_max_com = list(
-            np.unravel_index(abs(self.array).argmax(), self.array.shape)
-        )
-        index_max_com[1:] = center_of_mass(self.array[index_max_com[0], :, :])
-        position_max_com = tuple(map(lambda x: int(np.rint(x)), index_max_com))
+        # reuse the position of the max along the first axis
+        index_max_com = [
+            position_max[0],
+            *util.center_of_mass(self.array[position_max[0], :, :]),
+        ]
+        position_max_com = tuple(int(val) for val in np.rint(index_max_com))
         self.logger.info(
             f"MaxCom at (z, y, x): {position_max_com}, "
             f"value = {int(self.array[position_max_com])}"
         )
 
         return {
-            "max": self.get_indices_full_detector(list(position_max)),
-            "com": self.get_indices_full_detector(list(position_com)),
-            "max_com": self.get_indices_full_detector(list(position_max_com)),
+            "max": self.get_indices_full_detector(position_max),
+            "com": self.get_indices_full_detector(position_com),
+            "max_com": self.get_indices_full_detector(position_max_com),
         }
 
-    def get_indices_cropped_binned_detector(self, position: List[int]) -> List[int]:
+    def get_indices_cropped_binned_detector(
+        self, position: Sequence[int]
+    ) -> Tuple[int, int, int]:
         """Calculate the position in the cropped, binned detector frame."""
         cropped_position = self._offset(position, frame="region_of_interest")
-        return self._bin(list(cropped_position))
+        return self._bin(cropped_position)
 
-    def get_indices_full_detector(self, position: List[int]) -> Tuple[int, int, int]:
+    def get_indices_full_detector(
+        self, position: Sequence[int]
+    ) -> Tuple[int, int, int]:
         """Calculate the position in the unbinned, full detector frame."""
         unbinned_position = self._unbin(position)
         return self._offset(unbinned_position, frame="full_detector")
@@ -234,15 +248,15 @@ class PeakFinder:
 
         methods = {
             "max": (
-                self.get_indices_cropped_binned_detector(list(self.peaks["max"])),
+                self.get_indices_cropped_binned_detector(self.peaks["max"]),
                 "k",
             ),
             "com": (
-                self.get_indices_cropped_binned_detector(list(self.peaks["com"])),
+                self.get_indices_cropped_binned_detector(self.peaks["com"]),
                 "g",
             ),
             "max_com": (
-                self.get_indices_cropped_binned_detector(list(self.peaks["max_com"])),
+                self.get_indices_cropped_binned_detector(self.peaks["max_com"]),
                 "b",
             ),
         }
@@ -256,18 +270,22 @@ class PeakFinder:
             vmax=6,
             title="data",
         )
+        # one collection per axis for the three peaks, the legend uses proxy artists
+        colors = [color for _, color in methods.values()]
+        handles = [
+            Line2D([], [], color=color, marker="1", linestyle="None", label=method)
+            for method, (_, color) in methods.items()
+        ]
         for ax, ind in indices.items():
-            for method, values in methods.items():
-                axes[ax].scatter(
-                    values[0][ind[0]],
-                    values[0][ind[1]],
-                    color=values[1],
-                    marker="1",
-                    alpha=0.7,
-                    linewidth=2,
-                    label=method,
-                )
-            axes[ax].legend()
+            axes[ax].scatter(
+                [position[ind[0]] for position, _ in methods.values()],
+                [position[ind[1]] for position, _ in methods.values()],
+                color=colors,
+                marker="1",
+                alpha=0.7,
+                linewidth=2,
+            )
+            axes[ax].legend(handles=handles)
         plt.pause(0.1)
         if savedir is not None:
             path = pathlib.Path(savedir) / "centering_method.png"
@@ -308,12 +326,13 @@ class PeakFinder:
         ax0.set_ylabel("Integrated intensity")
         ax0.legend(legend)
         ax0.set_title("Rocking curve")
-        ax1.plot(tilt_values, np.log10(rocking_curve), ".")
+        ax1.plot(tilt_values, rocking_curve, ".")
         if interp_tilt is not None and interp_curve is not None:
-            ax1.plot(interp_tilt, np.log10(interp_curve))
+            ax1.plot(interp_tilt, interp_curve)
+        ax1.set_yscale("log")
         ax1.axvline(tilt_values[self._roi_center[0]], color="r", alpha=0.7, linewidth=1)
         ax1.set_xlabel(x_label)
-        ax1.set_ylabel("Log(integrated intensity)")
+        ax1.set_ylabel("Integrated intensity")
         ax1.legend(legend)
         plt.pause(0.1)
         if savedir is not None:
@@ -321,7 +340,7 @@ class PeakFinder:
             fig.savefig(path)
         plt.close(fig)
 
-    @property
+    @cached_property
     def _roi_center(self) -> Tuple[int, int, int]:
         """Position of the Bragg peak in the cropped and binned detector frame."""
         bragg_peak = self.bragg_peak
@@ -331,6 +350,10 @@ class PeakFinder:
             (bragg_peak[2] - self.region_of_interest[2]) // self.binning[2],
         )
 
+    def _clear_roi_center(self) -> None:
+        """Invalidate the cached '_roi_center', after a change of its dependencies."""
+        self.__dict__.pop("_roi_center", None)
+
     def _fit_rocking_curve(self, tilt_values) -> None:
         """Fit the rocking curve and optionally tilt values by cubic interpolation."""
         self._tilt_values = tilt_values
@@ -352,15 +375,15 @@ class PeakFinder:
                 "you reload cropped data?)"
             )
             return
-        interpolation = interp1d(x_axis, rocking_curve, kind="cubic")
+        # CubicSpline expects increasing values, the tilt angle may be decreasing
+        order = np.argsort(x_axis)
+        interpolation = CubicSpline(x_axis[order], rocking_curve[order])
         interp_points = 5 * self.array.shape[0]
-        interp_tilt = np.linspace(x_axis.min(), x_axis.max(), interp_points)
+        x_min, x_max = x_axis[order[0]], x_axis[order[-1]]
+        interp_tilt = np.linspace(x_min, x_max, interp_points)
         interp_curve = interpolation(interp_tilt)
-        interp_fwhm = (
-            len(np.argwhere(interp_curve >= interp_curve.max() / 2))
-            * (x_axis.max() - x_axis.min())
-            / (interp_points - 1)
-        )
+        step = (x_max - x_min) / (interp_points - 1)
+        interp_fwhm = np.count_nonzero(interp_curve >= interp_curve.max() / 2) * step
         self.logger.info(f"FWHM by interpolation: {interp_fwhm:.3f} deg")
         self._interp_tilt_values = interp_tilt
         self._interp_rocking_curve = interp_curve
@@ -374,9 +397,9 @@ class PeakFinder:
         if bragg_peak is None:
             raise ValueError(f"Bragg peak not detected with method {self.peak_method}")
 
-        self._rocking_curve = self.array.sum(axis=(1, 2))
+        self._rocking_curve = self._integrated_frames
 
-    def _offset(self, peak: List[int], frame: str) -> Tuple[int, int, int]:
+    def _offset(self, peak: Sequence[int], frame: str) -> Tuple[int, int, int]:
         """
         Calculate the peak position with an offset.
 
@@ -392,20 +415,22 @@ class PeakFinder:
                 "allowed values 'full_detector' and 'region_of_interest'"
                 f"got '{frame}'"
             )
-        sign = {"full_detector": 1, "region_of_interest": -1}
+        sign = 1 if frame == "full_detector" else -1
         return (
             peak[0],
-            peak[1] + sign[frame] * self.region_of_interest[0],
-            peak[2] + sign[frame] * self.region_of_interest[2],
+            peak[1] + sign * self.region_of_interest[0],
+            peak[2] + sign * self.region_of_interest[2],
         )
 
-    def _bin(self, peak: List[int]) -> List[int]:
+    def _bin(self, peak: Sequence[int]) -> Tuple[int, int, int]:
         """Calculate the peak position in the binned detector frame."""
-        return [a // b for a, b in zip(peak, self.binning)]
+        binning = self.binning
+        return peak[0] // binning[0], peak[1] // binning[1], peak[2] // binning[2]
 
-    def _unbin(self, peak: List[int]) -> List[int]:
+    def _unbin(self, peak: Sequence[int]) -> Tuple[int, int, int]:
         """Calculate the peak position in the unbinned detector frame."""
-        return [a * b for a, b in zip(peak, self.binning)]
+        binning = self.binning
+        return peak[0] * binning[0], peak[1] * binning[1], peak[2] * binning[2]
 
 
 def center_fft(
@@ -421,7 +446,8 @@ def center_fft(
     Center and crop/pad the dataset depending on user parameters.
 
     :param data: the 3D data array
-    :param mask: the 3D mask array
+    :param mask: the 3D mask array. Its data type is kept when padding, a compact type
+     (e.g. bool or uint8) reduces the memory traffic.
     :param detector: an instance of the class Detector
     :param frames_logical: array of initial length the number of measured frames.
      In case of padding the length changes. A frame whose index is set to 1 means
@@ -477,6 +503,10 @@ def center_fft(
     pad_size = kwargs.get("pad_size", [])
     q_values = kwargs.get("q_values", [])
 
+    if fft_option == "skip":
+        # keep the full dataset, there is no need to locate the Bragg peak
+        return data, mask, np.zeros(6, dtype=int), q_values, frames_logical
+
     if q_values is not None:
         qx = q_values[0]  # axis=0, z downstream, qx in reciprocal space
         qz = q_values[1]  # axis=1, y vertical, qz in reciprocal space
@@ -487,7 +517,7 @@ def center_fft(
         qz = []
 
     if centering == "max":
-        z0, y0, x0 = np.unravel_index(abs(data).argmax(), data.shape)
+        z0, y0, x0 = np.unravel_index(util.argmax_modulus(data), data.shape)
         if q_values:
             logger.info(
                 f"Max at (qx, qz, qy): {qx[z0]:.5f}, {qz[y0]:.5f}, {qy[x0]:.5f}"
@@ -495,7 +525,7 @@ def center_fft(
         else:
             logger.info(f"Max at pixel (Z, Y, X): ({z0, y0, x0})")
     elif centering == "com":
-        z0, y0, x0 = center_of_mass(data)
+        z0, y0, x0 = util.center_of_mass(data)
         if q_values:
             logger.info(
                 "Center of mass at (qx, qz, qy): "
@@ -504,9 +534,9 @@ def center_fft(
         else:
             logger.info(f"Center of mass at pixel (Z, Y, X): ({z0, y0, x0})")
     else:  # 'max_com'
-        position = list(np.unravel_index(abs(data).argmax(), data.shape))
-        position[1:] = center_of_mass(data[position[0], :, :])
-        z0, y0, x0 = tuple(map(lambda x: int(np.rint(x)), position))
+        position = list(np.unravel_index(util.argmax_modulus(data), data.shape))
+        position[1:] = util.center_of_mass(data[position[0], :, :])
+        z0, y0, x0 = tuple(int(val) for val in np.rint(position))
 
     if fix_bragg:
         if len(fix_bragg) != 3:
@@ -529,13 +559,15 @@ def center_fft(
     iz0, iy0, ix0 = int(round(z0)), int(round(y0)), int(round(x0))
     logger.info(f"Data peak value = {data[iz0, iy0, ix0]:.1f}")
 
+    # float32 data is padded without conversion, other types are padded as float
+    data_dtype = np.float32 if data.dtype == np.float32 else float
+
     # Max symmetrical box around center of mass
-    nbz, nby, nbx = np.shape(data)
+    nbz, nby, nbx = data.shape
     max_nz = abs(2 * min(iz0, nbz - iz0))
     max_ny = 2 * min(iy0, nby - iy0)
     max_nx = abs(2 * min(ix0, nbx - ix0))
-    if fft_option != "skip":
-        logger.info(f"Max symmetrical box (qx, qz, qy): ({max_nz, max_ny, max_nx})")
+    logger.info(f"Max symmetrical box (qx, qz, qy): ({max_nz, max_ny, max_nx})")
     if any(val == 0 for val in (max_nz, max_ny, max_nx)):
         logger.info(
             "Empty images or presence of hotpixel at the border,"
@@ -550,28 +582,23 @@ def center_fft(
             (max_nz, max_ny, max_nx), maxprime=7, required_dividers=(2,)
         )
         pad_width = np.zeros(6, dtype=int)
+        crop_z = slice(iz0 - nz1 // 2, iz0 + nz1 // 2)
+        crop_y = slice(iy0 - ny1 // 2, iy0 + ny1 // 2)
+        crop_x = slice(ix0 - nx1 // 2, ix0 + nx1 // 2)
 
-        data = data[
-            iz0 - nz1 // 2 : iz0 + nz1 // 2,
-            iy0 - ny1 // 2 : iy0 + ny1 // 2,
-            ix0 - nx1 // 2 : ix0 + nx1 // 2,
-        ]
-        mask = mask[
-            iz0 - nz1 // 2 : iz0 + nz1 // 2,
-            iy0 - ny1 // 2 : iy0 + ny1 // 2,
-            ix0 - nx1 // 2 : ix0 + nx1 // 2,
-        ]
+        data = data[crop_z, crop_y, crop_x]
+        mask = mask[crop_z, crop_y, crop_x]
         logger.info(f"FFT box (qx, qz, qy): {data.shape}")
 
-        if (iz0 - nz1 // 2) > 0:  # if 0, the first frame is used
-            frames_logical[0 : iz0 - nz1 // 2] = 0
-        if (iz0 + nz1 // 2) < nbz:  # if nbz, the last frame is used
-            frames_logical[iz0 + nz1 // 2 :] = 0
+        if crop_z.start > 0:  # if 0, the first frame is used
+            frames_logical[0 : crop_z.start] = 0
+        if crop_z.stop < nbz:  # if nbz, the last frame is used
+            frames_logical[crop_z.stop :] = 0
 
         if q_values is not None:
-            qx = qx[iz0 - nz1 // 2 : iz0 + nz1 // 2]
-            qy = qy[ix0 - nx1 // 2 : ix0 + nx1 // 2]
-            qz = qz[iy0 - ny1 // 2 : iy0 + ny1 // 2]
+            qx = qx[crop_z]
+            qy = qy[crop_x]
+            qz = qz[crop_y]
 
     elif fft_option == "crop_asym_ZYX":
         # crop rocking angle and detector without centering the Bragg peak
@@ -579,28 +606,23 @@ def center_fft(
             (nbz, nby, nbx), maxprime=7, required_dividers=(2,)
         )
         pad_width = np.zeros(6, dtype=int)
+        crop_z = slice(nbz // 2 - nz1 // 2, nbz // 2 + nz1 // 2)
+        crop_y = slice(nby // 2 - ny1 // 2, nby // 2 + ny1 // 2)
+        crop_x = slice(nbx // 2 - nx1 // 2, nbx // 2 + nx1 // 2)
 
-        data = data[
-            nbz // 2 - nz1 // 2 : nbz // 2 + nz1 // 2,
-            nby // 2 - ny1 // 2 : nby // 2 + ny1 // 2,
-            nbx // 2 - nx1 // 2 : nbx // 2 + nx1 // 2,
-        ]
-        mask = mask[
-            nbz // 2 - nz1 // 2 : nbz // 2 + nz1 // 2,
-            nby // 2 - ny1 // 2 : nby // 2 + ny1 // 2,
-            nbx // 2 - nx1 // 2 : nbx // 2 + nx1 // 2,
-        ]
+        data = data[crop_z, crop_y, crop_x]
+        mask = mask[crop_z, crop_y, crop_x]
         logger.info(f"FFT box (qx, qz, qy): {data.shape}")
 
-        if (nbz // 2 - nz1 // 2) > 0:  # if 0, the first frame is used
-            frames_logical[0 : nbz // 2 - nz1 // 2] = 0
-        if (nbz // 2 + nz1 // 2) < nbz:  # if nbz, the last frame is used
-            frames_logical[nbz // 2 + nz1 // 2 :] = 0
+        if crop_z.start > 0:  # if 0, the first frame is used
+            frames_logical[0 : crop_z.start] = 0
+        if crop_z.stop < nbz:  # if nbz, the last frame is used
+            frames_logical[crop_z.stop :] = 0
 
         if len(q_values) != 0:
-            qx = qx[nbz // 2 - nz1 // 2 : nbz // 2 + nz1 // 2]
-            qy = qy[nbx // 2 - nx1 // 2 : nbx // 2 + nx1 // 2]
-            qz = qz[nby // 2 - ny1 // 2 : nby // 2 + ny1 // 2]
+            qx = qx[crop_z]
+            qy = qy[crop_x]
+            qz = qz[crop_y]
 
     elif fft_option == "pad_sym_Z_crop_sym_YX":
         # pad rocking angle based on 'pad_size' (Bragg peak centered)
@@ -615,35 +637,24 @@ def center_fft(
             (max_ny, max_nx), maxprime=7, required_dividers=(2,)
         )
 
-        data = data[:, iy0 - ny1 // 2 : iy0 + ny1 // 2, ix0 - nx1 // 2 : ix0 + nx1 // 2]
-        mask = mask[:, iy0 - ny1 // 2 : iy0 + ny1 // 2, ix0 - nx1 // 2 : ix0 + nx1 // 2]
-        pad_width = np.array(
-            [
-                int(min(pad_size[0] / 2 - iz0, pad_size[0] - nbz)),
-                int(min(pad_size[0] / 2 - nbz + iz0, pad_size[0] - nbz)),
-                0,
-                0,
-                0,
-                0,
-            ],
-            dtype=int,
+        crop_y = slice(iy0 - ny1 // 2, iy0 + ny1 // 2)
+        crop_x = slice(ix0 - nx1 // 2, ix0 + nx1 // 2)
+
+        data = data[:, crop_y, crop_x]
+        mask = mask[:, crop_y, crop_x]
+        pad_width = np.zeros(6, dtype=int)
+        pad_width[:2] = np.minimum(
+            (pad_size[0] / 2 - iz0, pad_size[0] / 2 - nbz + iz0), pad_size[0] - nbz
+        )
+        data, mask, frames_logical = _pad_dataset(
+            data, mask, frames_logical, pad_width=pad_width, dtype=data_dtype
         )
-        data = zero_pad(data, padding_width=pad_width, mask_flag=False)
-        mask = zero_pad(
-            mask, padding_width=pad_width, mask_flag=True
-        )  # mask padded pixels
         logger.info(f"FFT box (qx, qz, qy): {data.shape}")
 
-        temp_frames = -1 * np.ones(data.shape[0])
-        temp_frames[pad_width[0] : pad_width[0] + nbz] = frames_logical
-        frames_logical = temp_frames
-
         if q_values is not None:
-            dqx = qx[1] - qx[0]
-            qx0 = qx[0] - pad_width[0] * dqx
-            qx = qx0 + np.arange(pad_size[0]) * dqx
-            qy = qy[ix0 - nx1 // 2 : ix0 + nx1 // 2]
-            qz = qz[iy0 - ny1 // 2 : iy0 + ny1 // 2]
+            qx = _pad_q_values(qx, pad_start=pad_width[0], size=pad_size[0])
+            qy = qy[crop_x]
+            qz = qz[crop_y]
 
     elif fft_option == "pad_sym_Z_crop_asym_YX":
         # pad rocking angle based on 'pad_size' (Bragg peak centered)
@@ -659,43 +670,24 @@ def center_fft(
             (max_ny, max_nx), maxprime=7, required_dividers=(2,)
         )
 
-        data = data[
-            :,
-            nby // 2 - ny1 // 2 : nby // 2 + ny1 // 2,
-            nbx // 2 - nx1 // 2 : nbx // 2 + nx1 // 2,
-        ]
-        mask = mask[
-            :,
-            nby // 2 - ny1 // 2 : nby // 2 + ny1 // 2,
-            nbx // 2 - nx1 // 2 : nbx // 2 + nx1 // 2,
-        ]
-        pad_width = np.array(
-            [
-                int(min(pad_size[0] / 2 - iz0, pad_size[0] - nbz)),
-                int(min(pad_size[0] / 2 - nbz + iz0, pad_size[0] - nbz)),
-                0,
-                0,
-                0,
-                0,
-            ],
-            dtype=int,
+        crop_y = slice(nby // 2 - ny1 // 2, nby // 2 + ny1 // 2)
+        crop_x = slice(nbx // 2 - nx1 // 2, nbx // 2 + nx1 // 2)
+
+        data = data[:, crop_y, crop_x]
+        mask = mask[:, crop_y, crop_x]
+        pad_width = np.zeros(6, dtype=int)
+        pad_width[:2] = np.minimum(
+            (pad_size[0] / 2 - iz0, pad_size[0] / 2 - nbz + iz0), pad_size[0] - nbz
+        )
+        data, mask, frames_logical = _pad_dataset(
+            data, mask, frames_logical, pad_width=pad_width, dtype=data_dtype
         )
-        data = zero_pad(data, padding_width=pad_width, mask_flag=False)
-        mask = zero_pad(
-            mask, padding_width=pad_width, mask_flag=True
-        )  # mask padded pixels
         logger.info(f"FFT box (qx, qz, qy): {data.shape}")
 
-        temp_frames = -1 * np.ones(data.shape[0])
-        temp_frames[pad_width[0] : pad_width[0] + nbz] = frames_logical
-        frames_logical = temp_frames
-
         if q_values is not None:
-            dqx = qx[1] - qx[0]
-            qx0 = qx[0] - pad_width[0] * dqx
-            qx = qx0 + np.arange(pad_size[0]) * dqx
-            qy = qy[nbx // 2 - nx1 // 2 : nbx // 2 + nx1 // 2]
-            qz = qz[nby // 2 - ny1 // 2 : nby // 2 + ny1 // 2]
+            qx = _pad_q_values(qx, pad_start=pad_width[0], size=pad_size[0])
+            qy = qy[crop_x]
+            qz = qz[crop_y]
 
     elif fft_option == "pad_asym_Z_crop_sym_YX":
         # pad rocking angle without centering the Bragg peak
@@ -705,78 +697,46 @@ def center_fft(
         )
         nz1 = util.higher_primes(nbz, maxprime=7, required_dividers=(2,))
 
-        data = data[:, iy0 - ny1 // 2 : iy0 + ny1 // 2, ix0 - nx1 // 2 : ix0 + nx1 // 2]
-        mask = mask[:, iy0 - ny1 // 2 : iy0 + ny1 // 2, ix0 - nx1 // 2 : ix0 + nx1 // 2]
-        pad_width = np.array(
-            [
-                int((nz1 - nbz + ((nz1 - nbz) % 2)) / 2),
-                int((nz1 - nbz + 1) / 2 - ((nz1 - nbz) % 2)),
-                0,
-                0,
-                0,
-                0,
-            ],
-            dtype=int,
+        crop_y = slice(iy0 - ny1 // 2, iy0 + ny1 // 2)
+        crop_x = slice(ix0 - nx1 // 2, ix0 + nx1 // 2)
+
+        data = data[:, crop_y, crop_x]
+        mask = mask[:, crop_y, crop_x]
+        pad_width = np.zeros(6, dtype=int)
+        # the extra pixel for odd padding goes at the beginning of the axis
+        pad_width[:2] = (nz1 - nbz + 1) // 2, (nz1 - nbz) // 2
+        data, mask, frames_logical = _pad_dataset(
+            data, mask, frames_logical, pad_width=pad_width, dtype=data_dtype
         )
-        data = zero_pad(data, padding_width=pad_width, mask_flag=False)
-        mask = zero_pad(
-            mask, padding_width=pad_width, mask_flag=True
-        )  # mask padded pixels
         logger.info(f"FFT box (qx, qz, qy): {data.shape}")
 
-        temp_frames = -1 * np.ones(data.shape[0])
-        temp_frames[pad_width[0] : pad_width[0] + nbz] = frames_logical
-        frames_logical = temp_frames
-
         if q_values is not None:
-            dqx = qx[1] - qx[0]
-            qx0 = qx[0] - pad_width[0] * dqx
-            qx = qx0 + np.arange(nz1) * dqx
-            qy = qy[ix0 - nx1 // 2 : ix0 + nx1 // 2]
-            qz = qz[iy0 - ny1 // 2 : iy0 + ny1 // 2]
+            qx = _pad_q_values(qx, pad_start=pad_width[0], size=nz1)
+            qy = qy[crop_x]
+            qz = qz[crop_y]
 
     elif fft_option == "pad_asym_Z_crop_asym_YX":
         # pad rocking angle and crop detector without centering the Bragg peak
         ny1, nx1 = util.smaller_primes((nby, nbx), maxprime=7, required_dividers=(2,))
         nz1 = util.higher_primes(nbz, maxprime=7, required_dividers=(2,))
 
-        data = data[
-            :,
-            nby // 2 - ny1 // 2 : nby // 2 + ny1 // 2,
-            nbx // 2 - nx1 // 2 : nbx // 2 + nx1 // 2,
-        ]
-        mask = mask[
-            :,
-            nby // 2 - ny1 // 2 : nby // 2 + ny1 // 2,
-            nbx // 2 - nx1 // 2 : nbx // 2 + nx1 // 2,
-        ]
-        pad_width = np.array(
-            [
-                int((nz1 - nbz + ((nz1 - nbz) % 2)) / 2),
-                int((nz1 - nbz + 1) / 2 - ((nz1 - nbz) % 2)),
-                0,
-                0,
-                0,
-                0,
-            ],
-            dtype=int,
+        crop_y = slice(nby // 2 - ny1 // 2, nby // 2 + ny1 // 2)
+        crop_x = slice(nbx // 2 - nx1 // 2, nbx // 2 + nx1 // 2)
+
+        data = data[:, crop_y, crop_x]
+        mask = mask[:, crop_y, crop_x]
+        pad_width = np.zeros(6, dtype=int)
+        # the extra pixel for odd padding goes at the beginning of the axis
+        pad_width[:2] = (nz1 - nbz + 1) // 2, (nz1 - nbz) // 2
+        data, mask, frames_logical = _pad_dataset(
+            data, mask, frames_logical, pad_width=pad_width, dtype=data_dtype
         )
-        data = zero_pad(data, padding_width=pad_width, mask_flag=False)
-        mask = zero_pad(
-            mask, padding_width=pad_width, mask_flag=True
-        )  # mask padded pixels
         logger.info(f"FFT box (qx, qz, qy): {data.shape}")
 
-        temp_frames = -1 * np.ones(data.shape[0])
-        temp_frames[pad_width[0] : pad_width[0] + nbz] = frames_logical
-        frames_logical = temp_frames
-
         if q_values is not None:
-            dqx = qx[1] - qx[0]
-            qx0 = qx[0] - pad_width[0] * dqx
-            qx = qx0 + np.arange(nz1) * dqx
-            qy = qy[nbx // 2 - nx1 // 2 : nbx // 2 + nx1 // 2]
-            qz = qz[nby // 2 - ny1 // 2 : nby // 2 + ny1 // 2]
+            qx = _pad_q_values(qx, pad_start=pad_width[0], size=nz1)
+            qy = qy[crop_x]
+            qz = qz[crop_y]
 
     elif fft_option == "pad_sym_Z":
         # pad rocking angle based on 'pad_size'(Bragg peak centered)
@@ -789,61 +749,32 @@ def center_fft(
         ):
             raise ValueError(pad_size[0], "does not meet FFT requirements")
 
-        pad_width = np.array(
-            [
-                int(min(pad_size[0] / 2 - iz0, pad_size[0] - nbz)),
-                int(min(pad_size[0] / 2 - nbz + iz0, pad_size[0] - nbz)),
-                0,
-                0,
-                0,
-                0,
-            ],
-            dtype=int,
+        pad_width = np.zeros(6, dtype=int)
+        pad_width[:2] = np.minimum(
+            (pad_size[0] / 2 - iz0, pad_size[0] / 2 - nbz + iz0), pad_size[0] - nbz
+        )
+        data, mask, frames_logical = _pad_dataset(
+            data, mask, frames_logical, pad_width=pad_width, dtype=data_dtype
         )
-        data = zero_pad(data, padding_width=pad_width, mask_flag=False)
-        mask = zero_pad(
-            mask, padding_width=pad_width, mask_flag=True
-        )  # mask padded pixels
         logger.info(f"FFT box (qx, qz, qy): {data.shape}")
 
-        temp_frames = -1 * np.ones(data.shape[0])
-        temp_frames[pad_width[0] : pad_width[0] + nbz] = frames_logical
-        frames_logical = temp_frames
-
         if q_values is not None:
-            dqx = qx[1] - qx[0]
-            qx0 = qx[0] - pad_width[0] * dqx
-            qx = qx0 + np.arange(pad_size[0]) * dqx
+            qx = _pad_q_values(qx, pad_start=pad_width[0], size=pad_size[0])
 
     elif fft_option == "pad_asym_Z":
         # pad rocking angle without centering the Bragg peak, keep detector size
         nz1 = util.higher_primes(nbz, maxprime=7, required_dividers=(2,))
 
-        pad_width = np.array(
-            [
-                int((nz1 - nbz + ((nz1 - nbz) % 2)) / 2),
-                int((nz1 - nbz + 1) / 2 - ((nz1 - nbz) % 2)),
-                0,
-                0,
-                0,
-                0,
-            ],
-            dtype=int,
+        pad_width = np.zeros(6, dtype=int)
+        # the extra pixel for odd padding goes at the beginning of the axis
+        pad_width[:2] = (nz1 - nbz + 1) // 2, (nz1 - nbz) // 2
+        data, mask, frames_logical = _pad_dataset(
+            data, mask, frames_logical, pad_width=pad_width, dtype=data_dtype
         )
-        data = zero_pad(data, padding_width=pad_width, mask_flag=False)
-        mask = zero_pad(
-            mask, padding_width=pad_width, mask_flag=True
-        )  # mask padded pixels
         logger.info(f"FFT box (qx, qz, qy): {data.shape}")
 
-        temp_frames = -1 * np.ones(data.shape[0])
-        temp_frames[pad_width[0] : pad_width[0] + nbz] = frames_logical
-        frames_logical = temp_frames
-
         if q_values is not None:
-            dqx = qx[1] - qx[0]
-            qx0 = qx[0] - pad_width[0] * dqx
-            qx = qx0 + np.arange(nz1) * dqx
+            qx = _pad_q_values(qx, pad_start=pad_width[0], size=nz1)
 
     elif fft_option == "pad_sym_ZYX":
         # pad both dimensions based on 'pad_size' (Bragg peak centered)
@@ -854,50 +785,32 @@ def center_fft(
             "The 1st axis (stacking dimension) is padded before binning,"
             " detector plane after binning."
         )
-        if pad_size[0] != util.higher_primes(
-            pad_size[0], maxprime=7, required_dividers=(2,)
-        ):
-            raise ValueError(pad_size[0], "does not meet FFT requirements")
-        if pad_size[1] != util.higher_primes(
-            pad_size[1], maxprime=7, required_dividers=(2,)
-        ):
-            raise ValueError(pad_size[1], "does not meet FFT requirements")
-        if pad_size[2] != util.higher_primes(
-            pad_size[2], maxprime=7, required_dividers=(2,)
-        ):
-            raise ValueError(pad_size[2], "does not meet FFT requirements")
-
-        pad_width = [
-            int(min(pad_size[0] / 2 - iz0, pad_size[0] - nbz)),
-            int(min(pad_size[0] / 2 - nbz + iz0, pad_size[0] - nbz)),
-            int(min(pad_size[1] / 2 - iy0, pad_size[1] - nby)),
-            int(min(pad_size[1] / 2 - nby + iy0, pad_size[1] - nby)),
-            int(min(pad_size[2] / 2 - ix0, pad_size[2] - nbx)),
-            int(min(pad_size[2] / 2 - nbx + ix0, pad_size[2] - nbx)),
-        ]
-        pad_width = np.array(
-            list((map(lambda value: max(value, 0), pad_width))), dtype=int
-        )  # remove negative numbers
-        data = zero_pad(data, padding_width=pad_width, mask_flag=False)
-        mask = zero_pad(
-            mask, padding_width=pad_width, mask_flag=True
-        )  # mask padded pixels
-        logger.info(f"FFT box (qx, qz, qy): {data.shape}")
+        for size in pad_size:
+            if size != util.higher_primes(size, maxprime=7, required_dividers=(2,)):
+                raise ValueError(size, "does not meet FFT requirements")
 
-        temp_frames = -1 * np.ones(data.shape[0])
-        temp_frames[pad_width[0] : pad_width[0] + nbz] = frames_logical
-        frames_logical = temp_frames
+        centered = np.array(
+            [
+                pad_size[0] / 2 - iz0,
+                pad_size[0] / 2 - nbz + iz0,
+                pad_size[1] / 2 - iy0,
+                pad_size[1] / 2 - nby + iy0,
+                pad_size[2] / 2 - ix0,
+                pad_size[2] / 2 - nbx + ix0,
+            ]
+        )
+        max_width = np.repeat(np.subtract(pad_size, (nbz, nby, nbx)), 2)
+        # remove negative numbers
+        pad_width = np.maximum(np.minimum(centered, max_width), 0).astype(int)
+        data, mask, frames_logical = _pad_dataset(
+            data, mask, frames_logical, pad_width=pad_width, dtype=data_dtype
+        )
+        logger.info(f"FFT box (qx, qz, qy): {data.shape}")
 
         if q_values is not None:
-            dqx = qx[1] - qx[0]
-            dqy = qy[1] - qy[0]
-            dqz = qz[1] - qz[0]
-            qx0 = qx[0] - pad_width[0] * dqx
-            qy0 = qy[0] - pad_width[2] * dqy
-            qz0 = qz[0] - pad_width[1] * dqz
-            qx = qx0 + np.arange(pad_size[0]) * dqx
-            qy = qy0 + np.arange(pad_size[2]) * dqy
-            qz = qz0 + np.arange(pad_size[1]) * dqz
+            qx = _pad_q_values(qx, pad_start=pad_width[0], size=pad_size[0])
+            qy = _pad_q_values(qy, pad_start=pad_width[4], size=pad_size[2])
+            qz = _pad_q_values(qz, pad_start=pad_width[2], size=pad_size[1])
 
     elif fft_option == "pad_asym_ZYX":
         # pad both dimensions without centering the Bragg peak
@@ -907,38 +820,22 @@ def center_fft(
             util.higher_primes(nbx, maxprime=7, required_dividers=(2,)),
         ]
 
-        pad_width = np.array(
-            [
-                int((nz1 - nbz + ((nz1 - nbz) % 2)) / 2),
-                int((nz1 - nbz + 1) / 2 - ((nz1 - nbz) % 2)),
-                int((ny1 - nby + ((pad_size[1] - nby) % 2)) / 2),
-                int((ny1 - nby + 1) / 2 - ((ny1 - nby) % 2)),
-                int((nx1 - nbx + ((nx1 - nbx) % 2)) / 2),
-                int((nx1 - nbx + 1) / 2 - ((nx1 - nbx) % 2)),
-            ]
+        extra = np.array([nz1 - nbz, ny1 - nby, nx1 - nbx])
+        pad_width = np.empty(6, dtype=int)
+        # the extra pixel for odd padding goes at the beginning of each axis
+        pad_width[0::2] = (extra + 1) // 2
+        pad_width[1::2] = extra // 2
+        data, mask, frames_logical = _pad_dataset(
+            data, mask, frames_logical, pad_width=pad_width, dtype=data_dtype
         )
-        data = zero_pad(data, padding_width=pad_width, mask_flag=False)
-        mask = zero_pad(
-            mask, padding_width=pad_width, mask_flag=True
-        )  # mask padded pixels
-
-        temp_frames = -1 * np.ones(data.shape[0])
-        temp_frames[pad_width[0] : pad_width[0] + nbz] = frames_logical
-        frames_logical = temp_frames
 
         if q_values is not None:
-            dqx = qx[1] - qx[0]
-            dqy = qy[1] - qy[0]
-            dqz = qz[1] - qz[0]
-            qx0 = qx[0] - pad_width[0] * dqx
-            qy0 = qy[0] - pad_width[2] * dqy
-            qz0 = qz[0] - pad_width[1] * dqz
-            qx = qx0 + np.arange(nz1) * dqx
-            qy = qy0 + np.arange(nx1) * dqy
-            qz = qz0 + np.arange(ny1) * dqz
+            qx = _pad_q_values(qx, pad_start=pad_width[0], size=nz1)
+            qy = _pad_q_values(qy, pad_start=pad_width[4], size=nx1)
+            qz = _pad_q_values(qz, pad_start=pad_width[2], size=ny1)
 
     elif fft_option == "skip":
-        # keep the full dataset
+        # keep the full dataset, when defaulting to "skip" after the peak search
         pad_width = np.zeros(6, dtype=int)
     else:
         raise ValueError("Incorrect value for 'fft_option'")
@@ -951,6 +848,46 @@ def center_fft(
     return data, mask, pad_width, q_values, frames_logical
 
 
+def _pad_dataset(
+    data: np.ndarray,
+    mask: np.ndarray,
+    frames_logical: np.ndarray,
+    pad_width: np.ndarray,
+    dtype: Any = float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pad the data with zeros and the mask with ones for center_fft.
+
+    :param data: the 3D data array
+    :param mask: the 3D mask array, its data type is kept
+    :param frames_logical: array of length data.shape[0], 1 for a used frame, 0 for
+     an unused frame
+    :param pad_width: [z0, z1, y0, y1, x0, x1] number of pixels to add at each end
+    :param dtype: data type of the padded data
+    :return: the padded data and mask, and frames_logical where padded frames are -1
+    """
+    nbz = data.shape[0]
+    data = zero_pad(data, padding_width=pad_width, mask_flag=False, dtype=dtype)
+    mask = zero_pad(mask, padding_width=pad_width, mask_flag=True, dtype=mask.dtype)
+    padded_frames = np.full(data.shape[0], -1, dtype=frames_logical.dtype)
+    padded_frames[pad_width[0] : pad_width[0] + nbz] = frames_logical
+    return data, mask, padded_frames
+
+
+def _pad_q_values(q_values: np.ndarray, pad_start: int, size: int) -> np.ndarray:
+    """
+    Extend a regularly spaced 1D vector of q values for center_fft.
+
+    :param q_values: the 1D vector of q values before padding
+    :param pad_start: number of points added before the first q value
+    :param size: number of points after padding
+    :return: the padded vector of q values, with the same spacing
+    """
+    step = q_values[1] - q_values[0]
+    start = q_values[0] - pad_start * step
+    return np.linspace(start, start + (size - 1) * step, size)
+
+
 def find_bragg(
     array: np.ndarray,
     binning: Optional[List[int]] = None,
@@ -1041,7 +978,7 @@ def grid_bcdi_labframe(
     :return:
 
      - the data interpolated in the laboratory frame
-     - the mask interpolated in the laboratory frame
+     - the mask interpolated in the laboratory frame, as an int8 array of 0 and 1
      - a tuple of three 1D vectors of q values (qx, qz, qy)
      - a numpy array of shape (3, 3): transformation matrix from the detector
        frame to the laboratory/crystal frame
@@ -1085,7 +1022,6 @@ def grid_bcdi_labframe(
         "Gridding the data using the linearized matrix, "
         "the result will be in the laboratory frame"
     )
-    string = "linmat_reciprocal_space_"
     (interp_data, interp_mask), q_values, transfer_matrix = setup.ortho_reciprocal(
         arrays=(data, mask),
         verbose=True,
@@ -1098,100 +1034,23 @@ def grid_bcdi_labframe(
     )
     qx, qz, qy = q_values
 
-    # check for Nan
-    interp_mask[np.isnan(interp_data)] = 1
-    interp_data[np.isnan(interp_data)] = 0
-    interp_mask[np.isnan(interp_mask)] = 1
-    # set the mask as an array of integers, 0 or 1
-    interp_mask[np.nonzero(interp_mask)] = 1
-    interp_mask = interp_mask.astype(int)
-
-    # apply the mask to the data
-    interp_data[np.nonzero(interp_mask)] = 0
-
-    # save plots of the gridded data
-    final_binning = (
-        detector.preprocessing_binning[0] * detector.binning[0],
-        detector.preprocessing_binning[1] * detector.binning[1],
-        detector.preprocessing_binning[2] * detector.binning[2],
-    )
-
-    numz, numy, numx = interp_data.shape
-    plot_comment = (
-        f"_{numz}_{numy}_{numx}_"
-        f"{final_binning[0]}_{final_binning[1]}_{final_binning[2]}.png"
-    )
-
-    max_z = interp_data.sum(axis=0).max()
-    fig, _, _ = gu.contour_slices(
-        interp_data,
-        (qx, qz, qy),
-        sum_frames=True,
-        title="Regridded data",
-        levels=np.linspace(0, np.ceil(np.log10(max_z)), 150, endpoint=True),
-        plot_colorbar=True,
-        scale="log",
-        is_orthogonal=True,
-        reciprocal_space=True,
-        cmap=cmap,
-    )
-    fig.savefig(detector.savedir + string + "sum" + plot_comment)
-    plt.close(fig)
-
-    fig, _, _ = gu.contour_slices(
-        interp_data,
-        (qx, qz, qy),
-        sum_frames=False,
-        title="Regridded data",
-        levels=np.linspace(0, np.ceil(np.log10(interp_data.max())), 150, endpoint=True),
-        plot_colorbar=True,
-        scale="log",
-        is_orthogonal=True,
-        reciprocal_space=True,
-        cmap=cmap,
-    )
-    fig.savefig(detector.savedir + string + "central" + plot_comment)
-    plt.close(fig)
+    # check for Nan, NaN values of the mask are also non-zero
+    masked = np.isnan(interp_data) | (interp_mask != 0)
 
-    fig, _, _ = gu.multislices_plot(
-        interp_data,
-        sum_frames=True,
-        scale="log",
-        plot_colorbar=True,
-        vmin=0,
-        title="Regridded data",
-        is_orthogonal=True,
-        reciprocal_space=True,
-        cmap=cmap,
-    )
-    fig.savefig(detector.savedir + string + "sum_pix" + plot_comment)
-    plt.close(fig)
+    # apply the mask to the data, this also removes NaN values of the data
+    np.copyto(interp_data, 0, where=masked)
+    # set the mask as an array of integers, 0 or 1
+    interp_mask = masked.astype(np.int8)
 
-    fig, _, _ = gu.multislices_plot(
+    _plot_gridded_data(
         interp_data,
-        sum_frames=False,
-        scale="log",
-        plot_colorbar=True,
-        vmin=0,
-        title="Regridded data",
-        is_orthogonal=True,
-        reciprocal_space=True,
+        interp_mask,
+        q_values=(qx, qz, qy),
+        detector=detector,
+        prefix="linmat_reciprocal_space_",
         cmap=cmap,
+        debugging=debugging,
     )
-    fig.savefig(detector.savedir + string + "central_pix" + plot_comment)
-    plt.close(fig)
-    if debugging:
-        gu.multislices_plot(
-            interp_mask,
-            sum_frames=False,
-            scale="linear",
-            plot_colorbar=True,
-            vmin=0,
-            title="Regridded mask",
-            is_orthogonal=True,
-            reciprocal_space=True,
-            cmap=cmap,
-        )
 
     return interp_data, interp_mask, q_values, transfer_matrix
 
@@ -1219,8 +1078,9 @@ def grid_bcdi_xrayutil(
      - 'cmap': str, name of the colormap
      - 'logger': an optional logger
 
-    :return: the data and mask interpolated in the crystal frame, q values
-     (downstream, vertical up, outboard). q values are in inverse angstroms.
+    :return: the data and mask interpolated in the crystal frame (the mask is an int8
+     array of 0 and 1), q values (downstream, vertical up, outboard). q values are in
+     inverse angstroms.
     """
     logger = kwargs.get("logger", module_logger)
     valid.valid_ndarray(arrays=(data, mask), ndim=3)
@@ -1230,7 +1090,6 @@ def grid_bcdi_xrayutil(
         "Gridding the data using xrayutilities package, "
         "the result will be in the crystal frame"
     )
-    string = "xrutil_reciprocal_space_"
     if setup.filtered_data:
         logger.info(
             "Trying to orthogonalize a filtered data, "
@@ -1246,7 +1105,11 @@ def grid_bcdi_xrayutil(
 
     maxbins: List[int] = []
     for dim in (qx, qy, qz):
-        maxstep = max((abs(np.diff(dim, axis=j)).max() for j in range(3)))
+        maxstep = 0.0
+        for axis in range(3):
+            steps = np.diff(dim, axis=axis)
+            # take the absolute value in place, no other temporary array is needed
+            maxstep = max(maxstep, np.abs(steps, out=steps).max())
         maxbins.append(int(abs(dim.max() - dim.min()) / maxstep))
     logger.info(f"Maximum number of bins based on the sampling in q: {maxbins}")
     maxbins = util.smaller_primes(maxbins, maxprime=7, required_dividers=(2,))
@@ -1280,85 +1143,89 @@ def grid_bcdi_xrayutil(
     # q values are 1D arrays
 
     # check for Nan
-    interp_mask[np.isnan(interp_data)] = 1
-    interp_data[np.isnan(interp_data)] = 0
-    interp_mask[np.isnan(interp_mask)] = 1
-    interp_mask = interp_mask.astype(int)
-
-    # apply the mask to the data
-    interp_data[np.nonzero(interp_mask)] = 0
-
-    # plot the gridded data
-    final_binning = (
-        setup.detector.preprocessing_binning[0] * setup.detector.binning[0],
-        setup.detector.preprocessing_binning[1] * setup.detector.binning[1],
-        setup.detector.preprocessing_binning[2] * setup.detector.binning[2],
-    )
+    interp_mask[np.isnan(interp_data) | np.isnan(interp_mask)] = 1
+    interp_mask = interp_mask.astype(np.int8)
 
-    numz, numy, numx = interp_data.shape
-    plot_comment = (
-        f"_{numz}_{numy}_{numx}"
-        f"_{final_binning[0]}_{final_binning[1]}_{final_binning[2]}.png"
-    )
+    # apply the mask to the data, this also removes NaN values of the data
+    np.copyto(interp_data, 0, where=interp_mask != 0)
 
-    max_z = interp_data.sum(axis=0).max()
-    fig, _, _ = gu.contour_slices(
+    _plot_gridded_data(
         interp_data,
-        (qx, qz, qy),
-        sum_frames=True,
-        title="Regridded data",
-        levels=np.linspace(0, np.ceil(np.log10(max_z)), 150, endpoint=True),
-        plot_colorbar=True,
-        scale="log",
-        is_orthogonal=True,
-        reciprocal_space=True,
+        interp_mask,
+        q_values=(qx, qz, qy),
+        detector=setup.detector,
+        prefix="xrutil_reciprocal_space_",
         cmap=cmap,
+        debugging=debugging,
     )
-    fig.savefig(setup.detector.savedir + string + "sum" + plot_comment)
-    plt.close(fig)
 
-    fig, _, _ = gu.contour_slices(
-        interp_data,
-        (qx, qz, qy),
-        sum_frames=False,
-        title="Regridded data",
-        levels=np.linspace(0, np.ceil(np.log10(interp_data.max())), 150, endpoint=True),
-        plot_colorbar=True,
-        scale="log",
-        is_orthogonal=True,
-        reciprocal_space=True,
-        cmap=cmap,
-    )
-    fig.savefig(setup.detector.savedir + string + "central" + plot_comment)
-    plt.close(fig)
+    return interp_data, interp_mask, (qx, qz, qy), frames_logical
 
-    fig, _, _ = gu.multislices_plot(
-        interp_data,
-        sum_frames=True,
-        scale="log",
-        plot_colorbar=True,
-        vmin=0,
-        title="Regridded data",
-        is_orthogonal=True,
-        reciprocal_space=True,
-        cmap=cmap,
-    )
-    fig.savefig(setup.detector.savedir + string + "sum_pix" + plot_comment)
-    plt.close(fig)
 
-    fig, _, _ = gu.multislices_plot(
-        interp_data,
-        sum_frames=False,
-        scale="log",
-        plot_colorbar=True,
-        vmin=0,
-        title="Regridded data",
-        is_orthogonal=True,
-        reciprocal_space=True,
-        cmap=cmap,
+def _plot_gridded_data(
+    interp_data: np.ndarray,
+    interp_mask: np.ndarray,
+    q_values: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    detector: "Detector",
+    prefix: str,
+    cmap: str,
+    debugging: bool = False,
+) -> None:
+    """
+    Save the plots of the data gridded by grid_bcdi_labframe or grid_bcdi_xrayutil.
+
+    :param interp_data: the gridded 3D data
+    :param interp_mask: the gridded 3D mask
+    :param q_values: a tuple of three 1D vectors of q values (qx, qz, qy)
+    :param detector: an instance of the class Detector
+    :param prefix: prefix of the filenames of the saved figures
+    :param cmap: name of the colormap
+    :param debugging: set to True to see the gridded mask
+    """
+    final_binning = tuple(map(mul, detector.preprocessing_binning, detector.binning))
+    numz, numy, numx = interp_data.shape
+    plot_comment = (
+        f"_{numz}_{numy}_{numx}_"
+        f"{final_binning[0]}_{final_binning[1]}_{final_binning[2]}.png"
     )
-    fig.savefig(setup.detector.savedir + string + "central_pix" + plot_comment)
-    plt.close(fig)
+    # the reductions defining the contour levels are computed only once
+    max_sum = interp_data.sum(axis=0).max()
+    max_value = interp_data.max()
+
+    for sum_frames, max_level, name in (
+        (True, max_sum, "sum"),
+        (False, max_value, "central"),
+    ):
+        fig, _, _ = gu.contour_slices(
+            interp_data,
+            q_values,
+            sum_frames=sum_frames,
+            title="Regridded data",
+            levels=np.linspace(0, np.ceil(np.log10(max_level)), 150, endpoint=True),
+            plot_colorbar=True,
+            scale="log",
+            is_orthogonal=True,
+            reciprocal_space=True,
+            cmap=cmap,
+        )
+        fig.savefig(detector.savedir + prefix + name + plot_comment)
+        plt.close(fig)
+
+    for sum_frames, name in ((True, "sum_pix"), (False, "central_pix")):
+        fig, _, _ = gu.multislices_plot(
+            interp_data,
+            sum_frames=sum_frames,
+            scale="log",
+            plot_colorbar=True,
+            vmin=0,
+            title="Regridded data",
+            is_orthogonal=True,
+            reciprocal_space=True,
+            cmap=cmap,
+        )
+        fig.savefig(detector.savedir + prefix + name + plot_comment)
+        plt.close(fig)
+
     if debugging:
         gu.multislices_plot(
             interp_mask,
@@ -1372,8 +1239,6 @@ def grid_bcdi_xrayutil(
             cmap=cmap,
         )
 
-    return interp_data, interp_mask, (qx, qz, qy), frames_logical
-
 
 def load_bcdi_data(
     scan_number: int,
@@ -1408,7 +1273,8 @@ def load_bcdi_data(
      - 'logger': an optional logger
 
     :return:
-     - the 3D data and mask arrays
+     - the 3D data and mask arrays. The data is converted to float32 if it was
+       float64, the mask is an int8 array of 0 and 1
      - frames_logical: array of initial length the number of measured frames.
        In case of padding the length changes. A frame whose index is set to 1 means
        that it is used, 0 means not used, -1 means padded (added) frame.
@@ -1446,45 +1312,37 @@ def load_bcdi_data(
         normalize=normalize,
         debugging=debugging,
     )
+    # float32 is enough for detector intensities and halves the memory traffic
+    if rawdata.dtype == np.float64:
+        rawdata = rawdata.astype(np.float32)
+    # binarize the mask, a compact type reduces the memory traffic
+    rawmask = (rawmask != 0).astype(np.int8)
 
     #####################################################
     # apply an optional photon threshold before binning #
     #####################################################
     if photon_threshold != 0:
-        rawmask[rawdata < photon_threshold] = 1
-        rawdata[rawdata < photon_threshold] = 0
+        below_threshold = rawdata < photon_threshold
+        np.copyto(rawmask, 1, where=below_threshold)
+        np.copyto(rawdata, 0, where=below_threshold)
         logger.info(f"Applying photon threshold before binning: < {photon_threshold}")
 
     ####################################################################################
     # bin data and mask in the detector plane if not already done during loading       #
     # binning in the stacking dimension is done at the very end of the data processing #
     ####################################################################################
-    if not bin_during_loading and (
-        (setup.detector.binning[1] != 1) or (setup.detector.binning[2] != 1)
-    ):
+    binning = (1, setup.detector.binning[1], setup.detector.binning[2])
+    if not bin_during_loading and (binning[1] != 1 or binning[2] != 1):
         logger.info(
-            f"Binning the data: detector vertical axis by {setup.detector.binning[1]}, "
-            f"detector horizontal axis by {setup.detector.binning[2]}"
-        )
-        rawdata = util.bin_data(
-            rawdata,
-            (1, setup.detector.binning[1], setup.detector.binning[2]),
-            debugging=False,
-        )
-        rawmask = util.bin_data(
-            rawmask,
-            (1, setup.detector.binning[1], setup.detector.binning[2]),
-            debugging=False,
+            f"Binning the data: detector vertical axis by {binning[1]}, "
+            f"detector horizontal axis by {binning[2]}"
         )
-        rawmask[np.nonzero(rawmask)] = 1
+        rawdata = util.bin_data(rawdata, binning, debugging=False)
+        rawmask = util.bin_mask(rawmask, binning)
 
     # update the current binning factor
     setup.detector.current_binning = list(
-        map(
-            mul,
-            setup.detector.current_binning,
-            (1, setup.detector.binning[1], setup.detector.binning[2]),
-        )
+        map(mul, setup.detector.current_binning, binning)
     )
     ################################################
     # pad the data to the shape defined by the ROI #
@@ -1492,7 +1350,7 @@ def load_bcdi_data(
     rawdata, rawmask = util.pad_from_roi(
         arrays=(rawdata, rawmask),
         roi=setup.detector.roi,
-        binning=setup.detector.binning[1:],
+        binning=binning[1:],
         pad_value=(0, 1),
     )
 
@@ -1526,7 +1384,8 @@ def reload_bcdi_data(
      - 'logger': an optional logger
 
     :return:
-     - the updated 3D data and mask arrays
+     - the updated 3D data and mask arrays. The data is converted to float32 if it
+       was float64, the mask is an int8 array of 0 and 1
      - the monitor values used for the intensity normalization
 
     """
@@ -1547,15 +1406,21 @@ def reload_bcdi_data(
         name="photon_threshold",
     )
 
-    nbz, nby, nbx = data.shape
+    # float32 is enough for detector intensities and halves the memory traffic
+    if data.dtype == np.float64:
+        data = data.astype(np.float32)
+    # the mask contains only 0 and 1, a compact type reduces the memory traffic
+    mask = (mask != 0).astype(np.int8)
+    nbz = data.shape[0]
     frames_logical = (
         frames_pattern if frames_pattern is not None else np.ones(nbz, dtype=int)
     )
 
-    logger.info(f"{(data < 0).sum()} negative data points masked")
+    negative = data < 0
+    logger.info(f"{np.count_nonzero(negative)} negative data points masked")
     # can happen when subtracting a background
-    mask[data < 0] = 1
-    data[data < 0] = 0
+    np.copyto(mask, 1, where=negative)
+    np.copyto(data, 0, where=negative)
 
     # normalize by the incident X-ray beam intensity
     if normalize == "skip":
@@ -1577,82 +1442,61 @@ def reload_bcdi_data(
             logger=logger,
         )
 
-    # pad the data to the shape defined by the ROI
-    if (
-        setup.detector.roi[1] - setup.detector.roi[0] > nby
-        or setup.detector.roi[3] - setup.detector.roi[2] > nbx
-    ):
-        start = (np.nan, min(0, setup.detector.roi[0]), min(0, setup.detector.roi[2]))
-        logger.info("Padding the data to the shape defined by the ROI")
-        data = util.crop_pad(
-            array=data,
-            pad_start=start,
-            output_shape=(
-                data.shape[0],
-                setup.detector.roi[1] - setup.detector.roi[0],
-                setup.detector.roi[3] - setup.detector.roi[2],
-            ),
-        )
-        mask = util.crop_pad(
-            array=mask,
-            pad_value=1,
-            pad_start=start,
-            output_shape=(
-                mask.shape[0],
-                setup.detector.roi[1] - setup.detector.roi[0],
-                setup.detector.roi[3] - setup.detector.roi[2],
-            ),
-        )
+    # pad the data to the shape defined by the ROI, the data is not binned yet
+    data, mask = util.pad_from_roi(
+        arrays=(data, mask),
+        roi=setup.detector.roi,
+        binning=(1, 1),
+        pad_value=(0, 1),
+        logger=logger,
+    )
 
     # apply optional photon threshold before binning
     if photon_threshold != 0:
-        mask[data < photon_threshold] = 1
-        data[data < photon_threshold] = 0
+        below_threshold = data < photon_threshold
+        np.copyto(mask, 1, where=below_threshold)
+        np.copyto(data, 0, where=below_threshold)
         logger.info(f"Applying photon threshold before binning: < {photon_threshold}")
 
     # bin data and mask in the detector plane if needed
     # binning in the stacking dimension is done at the very end of the data processing
-    if (setup.detector.binning[1] != 1) or (setup.detector.binning[2] != 1):
+    binning = (1, setup.detector.binning[1], setup.detector.binning[2])
+    if binning[1] != 1 or binning[2] != 1:
         logger.info(
-            "Binning the data: setup.detector vertical axis by "
-            f"{setup.detector.binning[1]}, setup.detector horizontal axis by "
-            f"{setup.detector.binning[2]}"
+            f"Binning the data: setup.detector vertical axis by {binning[1]}, "
+            f"setup.detector horizontal axis by {binning[2]}"
         )
-        data = util.bin_data(
-            data,
-            (1, setup.detector.binning[1], setup.detector.binning[2]),
-            debugging=debugging,
-        )
-        mask = util.bin_data(
-            mask,
-            (1, setup.detector.binning[1], setup.detector.binning[2]),
-            debugging=debugging,
-        )
-        mask[np.nonzero(mask)] = 1
+        data = util.bin_data(data, binning, debugging=debugging)
+        mask = util.bin_mask(mask, binning)
         setup.detector.current_binning = list(
-            map(
-                mul,
-                setup.detector.current_binning,
-                (1, setup.detector.binning[1], setup.detector.binning[2]),
-            )
+            map(mul, setup.detector.current_binning, binning)
         )
 
     return data, mask, frames_logical, monitor
 
 
-def zero_pad(array, padding_width=np.zeros(6), mask_flag=False, debugging=False):
+def zero_pad(array, padding_width=None, mask_flag=False, debugging=False, dtype=float):
     """
     Pad obj with zeros.
 
     :param array: 3D array to be padded
-    :param padding_width: number of zero pixels to padd on each side
+    :param padding_width: number of zero pixels to padd on each side, sequence of
+     six integers (start, stop) for each axis. None means no padding.
     :param mask_flag: set to True to pad with 1, False to pad with 0
     :type mask_flag: bool
     :param debugging: set to True to see plots
     :type debugging: bool
-    :return: obj padded with zeros
+    :param dtype: data type of the padded array
+    :return: obj padded with zeros. If there is nothing to pad and the array has
+     already the requested data type, it is returned without copy.
     """
     valid.valid_ndarray(arrays=array, ndim=3)
+    if padding_width is None:
+        padding_width = np.zeros(6, dtype=np.intp)
+    else:
+        padding_width = np.asarray(padding_width, dtype=np.intp)
+    if not np.any(padding_width) and array.dtype == dtype:
+        return array
     nbz, nby, nbx = array.shape
 
     if debugging:
@@ -1665,28 +1509,25 @@ def zero_pad(array, padding_width=np.zeros(6), mask_flag=False, debugging=False)
             title="Array before padding",
         )
 
-    if mask_flag:
-        newobj = np.ones(
-            (
-                nbz + padding_width[0] + padding_width[1],
-                nby + padding_width[2] + padding_width[3],
-                nbx + padding_width[4] + padding_width[5],
-            )
-        )
-    else:
-        newobj = np.zeros(
-            (
-                nbz + padding_width[0] + padding_width[1],
-                nby + padding_width[2] + padding_width[3],
-                nbx + padding_width[4] + padding_width[5],
-            )
-        )
-
-    newobj[
-        padding_width[0] : padding_width[0] + nbz,
-        padding_width[2] : padding_width[2] + nby,
-        padding_width[4] : padding_width[4] + nbx,
-    ] = array
+    shape = (
+        nbz + padding_width[0] + padding_width[1],
+        nby + padding_width[2] + padding_width[3],
+        nbx + padding_width[4] + padding_width[5],
+    )
+    z_range = slice(padding_width[0], padding_width[0] + nbz)
+    y_range = slice(padding_width[2], padding_width[2] + nby)
+    x_range = slice(padding_width[4], padding_width[4] + nbx)
+
+    # the array is written only once, the fill value only in the borders
+    newobj = np.empty(shape, dtype=dtype)
+    newobj[z_range, y_range, x_range] = array
+    fill_value = 1 if mask_flag else 0
+    newobj[: z_range.start] = fill_value
+    newobj[z_range.stop :] = fill_value
+    newobj[z_range, : y_range.start] = fill_value
+    newobj[z_range, y_range.stop :] = fill_value
+    newobj[z_range, y_range, : x_range.start] = fill_value
+    newobj[z_range, y_range, x_range.stop :] = fill_value
 
     if debugging:
         gu.multislices_plot(
@@ -480,7 +480,7 @@ def grid_cdi(
     interp_data[np.isnan(interp_data)] = 0
     interp_mask[np.isnan(interp_mask)] = 1
     # set the mask as an array of integers, 0 or 1
-    interp_mask[np.nonzero(interp_mask)] = 1
+    np.putmask(interp_mask, interp_mask != 0, 1)
     interp_mask = interp_mask.astype(int)
 
     # apply the mask to the data
@@ -702,12 +702,9 @@ def load_cdi_data(
             (1, setup.detector.binning[1], setup.detector.binning[2]),
             debugging=False,
         )
-        rawmask = util.bin_data(
-            rawmask,
-            (1, setup.detector.binning[1], setup.detector.binning[2]),
-            debugging=False,
+        rawmask = util.bin_mask(
+            rawmask, (1, setup.detector.binning[1], setup.detector.binning[2])
         )
-        rawmask[np.nonzero(rawmask)] = 1
 
     ################################################
     # pad the data to the shape defined by the ROI #
@@ -852,11 +849,8 @@ def reload_cdi_data(
             (1, setup.detector.binning[1], setup.detector.binning[2]),
             debugging=debugging,
         )
-        mask = util.bin_data(
-            mask,
-            (1, setup.detector.binning[1], setup.detector.binning[2]),
-            debugging=debugging,
+        mask = util.bin_mask(
+            mask, (1, setup.detector.binning[1], setup.detector.binning[2])
         )
-        mask[np.nonzero(mask)] = 1
 
     return data, mask, frames_logical, monitor
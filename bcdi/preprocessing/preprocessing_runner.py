@@ -23,83 +23,153 @@ from bcdi.utils.parameters import CDIPreprocessingChecker, PreprocessingChecker
 
 logger = logging.getLogger(__name__)
 
+# default values and constraints of the parameters, built once at import. The
+# default values are shared between calls and should not be modified in place.
+BCDI_DEFAULT_VALUES = {
+    "actuators": None,
+    "align_q": True,
+    "backend": "Qt5Agg",
+    "background_file": None,
+    "background_plot": 0.5,
+    "beam_direction": [1, 0, 0],
+    "bin_during_loading": False,
+    "bragg_peak": None,
+    "center_fft": "skip",
+    "centering_method": "max_com",
+    "colormap": "turbo",
+    "comment": "",
+    "custom_monitor": None,
+    "custom_motors": None,
+    "custom_images": None,
+    "custom_scan": False,
+    "data_dir": None,
+    "debug": False,
+    "detector_distance": None,
+    "direct_beam": None,
+    "dirbeam_detector_angles": None,
+    "energy": None,
+    "fill_value_mask": 0,
+    "flag_interact": True,
+    "flatfield_file": None,
+    "frames_pattern": None,
+    "hotpixels_file": None,
+    "inplane_angle": None,
+    "interpolation_method": "linearization",
+    "is_series": False,
+    "linearity_func": None,
+    "mask_zero_event": False,
+    "median_filter": "skip",
+    "median_filter_order": 7,
+    "multiprocessing": True,
+    "normalize_flux": False,
+    "offset_inplane": 0,
+    "outofplane_angle": None,
+    "pad_size": None,
+    "photon_filter": "loading",
+    "photon_threshold": 0,
+    "preprocessing_binning": [1, 1, 1],
+    "ref_axis_q": "y",
+    "reload_orthogonal": False,
+    "reload_previous": False,
+    "sample_inplane": [1, 0, 0],
+    "sample_offsets": None,
+    "sample_outofplane": [0, 0, 1],
+    "save_as_int": False,
+    "save_rawdata": False,
+    "save_to_mat": False,
+    "save_to_npz": True,
+    "save_to_vti": False,
+}
+BCDI_MATCH_LENGTH_PARAMS = (
+    "data_dir",
+    "sample_name",
+    "save_dir",
+    "specfile_name",
+    "template_imagefile",
+)
+BCDI_REQUIRED_PARAMS = (
+    "beamline",
+    "detector",
+    "phasing_binning",
+    "rocking_angle",
+    "root_folder",
+    "sample_name",
+    "scans",
+    "use_rawdata",
+)
+
+CDI_DEFAULT_VALUES = {
+    "actuators": None,
+    "backend": "Qt5Agg",
+    "background_file": None,
+    "background_plot": 0.5,
+    "beam_direction": [1, 0, 0],
+    "bin_during_loading": False,
+    "centering_method": "max_com",
+    "colormap": "turbo",
+    "correct_curvature": True,
+    "comment": "",
+    "custom_monitor": None,
+    "custom_motors": None,
+    "custom_images": None,
+    "custom_scan": False,
+    "data_dir": None,
+    "debug": False,
+    "detector_distance": None,
+    "energy": None,
+    "fill_value_mask": 0,
+    "fit_datarange": False,
+    "flag_interact": True,
+    "flatfield_file": None,
+    "frames_pattern": None,
+    "hotpixels_file": None,
+    "is_series": False,
+    "linearity_func": None,
+    "mask_beamstop": False,
+    "mask_zero_event": False,
+    "median_filter": "skip",
+    "median_filter_order": 7,
+    "multiprocessing": True,
+    "normalize_flux": False,
+    "photon_filter": "loading",
+    "photon_threshold": 0,
+    "preprocessing_binning": [1, 1, 1],
+    "reload_orthogonal": False,
+    "reload_previous": False,
+    "sample_offsets": None,
+    "save_as_int": False,
+    "save_rawdata": False,
+    "save_to_mat": False,
+    "save_to_npz": True,
+    "save_to_vti": False,
+}
+CDI_MATCH_LENGTH_PARAMS = (
+    "data_dir",
+    "sample_name",
+    "save_dir",
+    "specfile_name",
+    "template_imagefile",
+)
+CDI_REQUIRED_PARAMS = (
+    "beamline",
+    "detector",
+    "dirbeam_detector_position",
+    "direct_beam",
+    "phasing_binning",
+    "root_folder",
+    "sample_name",
+    "scans",
+    "use_rawdata",
+)
+
 
 def initialize_parameters_bcdi(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """Configure and validate the existing dictionary of parameters for BCDI."""
     return PreprocessingChecker(
         initial_params=parameters,
-        default_values={
-            "actuators": None,
-            "align_q": True,
-            "backend": "Qt5Agg",
-            "background_file": None,
-            "background_plot": 0.5,
-            "beam_direction": [1, 0, 0],
-            "bin_during_loading": False,
-            "bragg_peak": None,
-            "center_fft": "skip",
-            "centering_method": "max_com",
-            "colormap": "turbo",
-            "comment": "",
-            "custom_monitor": None,
-            "custom_motors": None,
-            "custom_images": None,
-            "custom_scan": False,
-            "data_dir": None,
-            "debug": False,
-            "detector_distance": None,
-            "direct_beam": None,
-            "dirbeam_detector_angles": None,
-            "energy": None,
-            "fill_value_mask": 0,
-            "flag_interact": True,
-            "flatfield_file": None,
-            "frames_pattern": None,
-            "hotpixels_file": None,
-            "inplane_angle": None,
-            "interpolation_method": "linearization",
-            "is_series": False,
-            "linearity_func": None,
-            "mask_zero_event": False,
-            "median_filter": "skip",
-            "median_filter_order": 7,
-            "multiprocessing": True,
-            "normalize_flux": False,
-            "offset_inplane": 0,
-            "outofplane_angle": None,
-            "pad_size": None,
-            "photon_filter": "loading",
-            "photon_threshold": 0,
-            "preprocessing_binning": [1, 1, 1],
-            "ref_axis_q": "y",
-            "reload_orthogonal": False,
-            "reload_previous": False,
-            "sample_inplane": [1, 0, 0],
-            "sample_offsets": None,
-            "sample_outofplane": [0, 0, 1],
-            "save_as_int": False,
-            "save_rawdata": False,
-            "save_to_mat": False,
-            "save_to_npz": True,
-            "save_to_vti": False,
-        },
-        match_length_params=(
-            "data_dir",
-            "sample_name",
-            "save_dir",
-            "specfile_name",
-            "template_imagefile",
-        ),
-        required_params=(
-            "beamline",
-            "detector",
-            "phasing_binning",
-            "rocking_angle",
-            "root_folder",
-            "sample_name",
-            "scans",
-            "use_rawdata",
-        ),
+        default_values=BCDI_DEFAULT_VALUES,
+        match_length_params=BCDI_MATCH_LENGTH_PARAMS,
+        required_params=BCDI_REQUIRED_PARAMS,
     ).check_config()
 
 
@@ -107,69 +177,9 @@ def initialize_parameters_cdi(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """Configure and validate the existing dictionary of parameters for CDI."""
     return CDIPreprocessingChecker(
         initial_params=parameters,
-        default_values={
-            "actuators": None,
-            "backend": "Qt5Agg",
-            "background_file": None,
-            "background_plot": 0.5,
-            "beam_direction": [1, 0, 0],
-            "bin_during_loading": False,
-            "centering_method": "max_com",
-            "colormap": "turbo",
-            "correct_curvature": True,
-            "comment": "",
-            "custom_monitor": None,
-            "custom_motors": None,
-            "custom_images": None,
-            "custom_scan": False,
-            "data_dir": None,
-            "debug": False,
-            "detector_distance": None,
-            "energy": None,
-            "fill_value_mask": 0,
-            "fit_datarange": False,
-            "flag_interact": True,
-            "flatfield_file": None,
-            "frames_pattern": None,
-            "hotpixels_file": None,
-            "is_series": False,
-            "linearity_func": None,
-            "mask_beamstop": False,
-            "mask_zero_event": False,
-            "median_filter": "skip",
-            "median_filter_order": 7,
-            "multiprocessing": True,
-            "normalize_flux": False,
-            "photon_filter": "loading",
-            "photon_threshold": 0,
-            "preprocessing_binning": [1, 1, 1],
-            "reload_orthogonal": False,
-            "reload_previous": False,
-            "sample_offsets": None,
-            "save_as_int": False,
-            "save_rawdata": False,
-            "save_to_mat": False,
-            "save_to_npz": True,
-            "save_to_vti": False,
-        },
-        match_length_params=(
-            "data_dir",
-            "sample_name",
-            "save_dir",
-            "specfile_name",
-            "template_imagefile",
-        ),
-        required_params=(
-            "beamline",
-            "detector",
-            "dirbeam_detector_position",
-            "direct_beam",
-            "phasing_binning",
-            "root_folder",
-            "sample_name",
-            "scans",
-            "use_rawdata",
-        ),
+        default_values=CDI_DEFAULT_VALUES,
+        match_length_params=CDI_MATCH_LENGTH_PARAMS,
+        required_params=CDI_REQUIRED_PARAMS,
     ).check_config()
 
 
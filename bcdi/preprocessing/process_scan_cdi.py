@@ -319,10 +319,7 @@ def process_scan_cdi(
                 data = util.bin_data(
                     data, binning=setup.detector.binning, debugging=False
                 )
-                mask = util.bin_data(
-                    mask, binning=setup.detector.binning, debugging=False
-                )
-                mask[np.nonzero(mask)] = 1
+                mask = util.bin_mask(mask, binning=setup.detector.binning)
                 if len(prm["q_values"]) == 3:
                     qx, qz, qy = prm["q_values"]  # downstream, vertical up, outboard
                     numz, numy, numx = len(qx), len(qz), len(qy)
@@ -731,7 +728,7 @@ def process_scan_cdi(
         del fig_mask, original_data, original_mask
         gc.collect()
 
-        mask[np.nonzero(mask)] = 1
+        np.putmask(mask, mask != 0, 1)
 
         fig, _, _ = gu.multislices_plot(
             data,
@@ -830,7 +827,7 @@ def process_scan_cdi(
         del fig_mask, flag_pause, flag_mask, original_data, updated_mask
         gc.collect()
 
-    mask[np.nonzero(mask)] = 1
+    np.putmask(mask, mask != 0, 1)
     data[mask == 1] = 0
 
     ###############################################
@@ -980,8 +977,7 @@ def process_scan_cdi(
     if setup.detector.binning[0] != 1 and not prm["reload_orthogonal"]:
         # for data to be gridded, binning[0] is set to 1
         data = util.bin_data(data, (setup.detector.binning[0], 1, 1), debugging=False)
-        mask = util.bin_data(mask, (setup.detector.binning[0], 1, 1), debugging=False)
-        mask[np.nonzero(mask)] = 1
+        mask = util.bin_mask(mask, (setup.detector.binning[0], 1, 1))
 
     nz, ny, nx = data.shape
     logger.info(f"Data size after binning the stacking dimension: {data.shape}")
@@ -994,7 +990,7 @@ def process_scan_cdi(
     if prm["save_as_int"]:
         data = data.astype(int)
     logger.info(f"Data type before saving: {data.dtype}")
-    mask[np.nonzero(mask)] = 1
+    np.putmask(mask, mask != 0, 1)
     mask = mask.astype(int)
     logger.info(f"Mask type before saving: {mask.dtype}")
     if not prm["use_rawdata"] and len(prm["q_values"]) != 0:
@@ -54,6 +54,7 @@ class ContextFile:
         self.longname = longname
         self.shortname = shortname
         self.directory = directory
+        self._depth = 0  # number of nested "with" blocks using the opened file
 
     @property
     def directory(self):
@@ -136,27 +137,53 @@ class ContextFile:
         """
         Enter the context manager.
 
-        This method returns a handle to the opened file.
+        This method returns a handle to the opened file. The context manager is
+        reentrant: the file is opened only by the outermost "with" block, nested
+        blocks reuse the same handle.
         """
+        if self._depth == 0:
+            self.file = self._open()
+        self._depth += 1
+        return self.file
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Exit the context manager.
+
+        The file is closed when exiting the outermost "with" block. The open_func
+        needs to implement a method 'close'.
+        """
+        self._depth -= 1
+        if self._depth > 0:
+            return False
+        try:
+            self.file.close()
+        except AttributeError:
+            raise NotImplementedError(
+                "couldn't close the file, 'close' is not implemented"
+            )
+        self.file = None
+        return False
+
+    def _open(self):
+        """Open the file with the opening callable and return the handle."""
         if (
             self.open_func.__module__ == "silx.io.specfile"
             and self.open_func.__name__ == "SpecFile"
         ):
-            self.file = self.open_func(self.filename)
+            return self.open_func(self.filename)
         elif self.open_func.__module__ == "io" and self.open_func.__name__ == "open":
-            self.file = self.open_func(
-                self.filename, mode=self.mode, encoding=self.encoding
-            )
+            return self.open_func(self.filename, mode=self.mode, encoding=self.encoding)
         elif (
             self.open_func.__module__ == "h5py._hl.files"
             and self.open_func.__name__ == "File"
         ):
-            self.file = self.open_func(self.filename, mode=self.mode)
+            return self.open_func(self.filename, mode=self.mode)
         elif (
             "nxsReady" in self.open_func.__module__
             and self.open_func.__name__ == "DataSet"
         ):
-            self.file = self.open_func(
+            return self.open_func(
                 longname=self.longname,
                 shortname=self.shortname,
                 alias_dict=self.filename,
@@ -166,28 +193,13 @@ class ContextFile:
             "ReadNxs3" in self.open_func.__module__
             and self.open_func.__name__ == "DataSet"
         ):
-            self.file = self.open_func(
+            return self.open_func(
                 directory=self.directory,
                 filename=self.shortname,
                 alias_dict=self.filename,
             )
         else:
             raise NotImplementedError(f"open function {self.open_func} not supported")
-        return self.file
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """
-        Exit the context manager.
-
-        The open_func needs to implement a method 'close'.
-        """
-        try:
-            self.file.close()
-        except AttributeError:
-            raise NotImplementedError(
-                "couldn't close the file, 'close' is not implemented"
-            )
-        return False
 
     def __repr__(self):
         """Representation string of the ContextFile instance."""
@@ -794,6 +794,20 @@ def valid_param(key: str, value: Any) -> Tuple[Any, bool]:
         )
     elif key == "outofplane_angle":
         valid.valid_item(value, allowed_types=Real, allow_none=True, name=key)
+    elif key == "output_format":
+        allowed = {"h5", "npz"}
+        if isinstance(value, str):
+            value = (value,)
+        valid.valid_container(
+            value,
+            container_types=(tuple, list),
+            item_types=str,
+            min_length=1,
+            name=key,
+        )
+        if any(val not in allowed for val in value):
+            raise ParameterError(key, value, allowed)
+        value = tuple(value)
     elif key == "output_size":
         valid.valid_container(
             value,
@@ -838,6 +852,10 @@ def valid_param(key: str, value: Any) -> Tuple[Any, bool]:
             raise ParameterError(key, value, allowed)
     elif key == "photon_threshold":
         valid.valid_item(value, allowed_types=Real, min_included=0, name=key)
+    elif key == "plot_format":
+        allowed = {"jpg", "png"}
+        if value not in allowed:
+            raise ParameterError(key, value, allowed)
     elif key == "plot_margin":
         valid.valid_item(value, allowed_types=int, min_included=0, name=key)
     elif key == "preprocessing_binning":
@@ -14,7 +14,7 @@ import logging
 import os
 import shutil
 from collections import OrderedDict
-from functools import reduce
+from functools import lru_cache, reduce
 from inspect import signature
 from logging import Logger
 from numbers import Integral, Real
@@ -99,6 +99,54 @@ def apply_logical_array(
     return tuple(output)
 
 
+def argmax_modulus(array: np.ndarray) -> int:
+    """
+    Find the flat index of the maximum of the modulus of an array.
+
+    It is equivalent to abs(array).argmax(), but for real arrays the position is
+    deduced from the maximum and the minimum of the array, without building abs(array).
+
+    :param array: the N-dimensional array
+    :return: the index of the maximum of the modulus in the flattened array
+    """
+    array = np.asarray(array)
+    if np.iscomplexobj(array):
+        return int(abs(array).argmax())
+    if array.dtype.kind in "bu":  # no negative values
+        return int(array.argmax())
+    index_max = int(array.argmax())
+    index_min = int(array.argmin())
+    value_max = abs(array.flat[index_max])
+    value_min = abs(array.flat[index_min])
+    if value_min > value_max or (value_min == value_max and index_min < index_max):
+        return index_min
+    return index_max
+
+
+def axis_projections(array: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Calculate the projections of an array onto each of its axes.
+
+    The projection onto an axis is the sum of the array over all other axes. Integer
+    data (e.g. detector counts) is accumulated exactly in int64. Only two passes are
+    made over the full array: the projections onto the first axes are deduced from
+    the sum over the last axis.
+
+    :param array: the N-dimensional array
+    :return: a tuple of 1D arrays, one per axis of array
+    """
+    array = np.asarray(array)
+    # unsigned sums default to uint64, promoted to float64 with int64 operands
+    accumulator = np.int64 if array.dtype.kind in "biu" else None
+    if array.ndim <= 1:
+        return (array.sum(axis=(), dtype=accumulator),)
+    last_projection = array.sum(axis=tuple(range(array.ndim - 1)), dtype=accumulator)
+    return (
+        *axis_projections(array.sum(axis=-1, dtype=accumulator)),
+        last_projection,
+    )
+
+
 def bin_data(array, binning, debugging=False, **kwargs):
     """
     Rebin a 1D, 2D or 3D array.
@@ -134,29 +182,17 @@ def bin_data(array, binning, debugging=False, **kwargs):
     if ndim == 1:
         nx = len(array)
         array = array[: nx - (nx % binning[0])]
-        sh = nx // binning[0], binning[0]
-        newarray = array.reshape(sh).sum(axis=1)
     elif ndim == 2:
         ny, nx = array.shape
         array = array[: ny - (ny % binning[0]), : nx - (nx % binning[1])]
-        sh = ny // binning[0], binning[0], nx // binning[1], binning[1]
-        newarray = array.reshape(sh).sum(axis=(1, 3))
     elif ndim == 3:
         nz, ny, nx = array.shape
         array = array[
             : nz - (nz % binning[0]), : ny - (ny % binning[1]), : nx - (nx % binning[2])
         ]
-        sh = (
-            nz // binning[0],
-            binning[0],
-            ny // binning[1],
-            binning[1],
-            nx // binning[2],
-            binning[2],
-        )
-        newarray = array.reshape(sh).sum(axis=(1, 3, 5))
     else:
         raise ValueError("Array should be 1D, 2D, or 3D")
+    newarray = _reduce_blocks(array, binning)
 
     if debugging:
         logger.info(f"array shape after cropping but before binning: {array.shape}")
@@ -178,6 +214,71 @@ def bin_data(array, binning, debugging=False, **kwargs):
     return newarray
 
 
+def bin_mask(mask, binning):
+    """
+    Rebin a 1D, 2D or 3D mask.
+
+    A binned pixel is masked if any of the pixels that it groups is masked. If the
+    dimensions of the mask are not a multiple of binning, it will be cropped.
+
+    :param mask: the mask to resize, nonzero for masked pixels
+    :param binning: the rebin factor, as in bin_data
+    :return: the binned mask with values 0 or 1, of the same data type as mask
+    """
+    valid.valid_ndarray(arrays=mask, ndim=(1, 2, 3))
+    if isinstance(binning, int):
+        binning = [binning] * mask.ndim
+    elif mask.ndim != len(binning):
+        raise ValueError(
+            "Rebin: number of dimensions does not agree with number "
+            f"of rebin values: {binning}"
+        )
+    mask = mask[
+        tuple(
+            slice(0, length - length % factor)
+            for length, factor in zip(mask.shape, binning)
+        )
+    ]
+    return _reduce_blocks(mask != 0, binning, ufunc=np.logical_or).astype(mask.dtype)
+
+
+def _reduce_blocks(
+    array: np.ndarray, binning: Sequence[int], ufunc: np.ufunc = np.add
+) -> np.ndarray:
+    """
+    Reduce the non-overlapping blocks of an array whose shape is a multiple of binning.
+
+    Small binning factors are accumulated axis after axis from strided views, which
+    is several times faster than reducing the short axes of the reshaped array. For
+    larger factors the strided reads waste most of each cache line, and the reshape
+    is used instead. The output has the data type of ufunc.reduce(array), e.g. the
+    one of array.sum() for np.add.
+    """
+    if max(binning) > 4:
+        shape = []
+        for length, factor in zip(array.shape, binning):
+            shape.extend((length // factor, factor))
+        return ufunc.reduce(
+            array.reshape(shape), axis=tuple(range(1, 2 * array.ndim, 2))
+        )
+
+    dtype = ufunc.reduce(np.zeros(0, dtype=array.dtype)).dtype
+    newarray = array
+    for axis, factor in enumerate(binning):
+        if factor == 1:
+            continue
+        index = [slice(None)] * array.ndim
+        index[axis] = slice(0, None, factor)
+        reduced = newarray[tuple(index)].astype(dtype, copy=True)
+        for offset in range(1, factor):
+            index[axis] = slice(offset, None, factor)
+            ufunc(reduced, newarray[tuple(index)], out=reduced)
+        newarray = reduced
+    if newarray is array:  # nothing to bin, return a copy as array.sum() does
+        newarray = array.astype(dtype)
+    return newarray
+
+
 def bin_parameters(
     binning: int, nb_frames: int, params: List[Any], debugging: bool = True
 ) -> List[Any]:
@@ -262,6 +363,40 @@ def catch_error(exception):
     print(exception)
 
 
+def center_of_mass(
+    array: Optional[np.ndarray] = None,
+    projections: Optional[Sequence[np.ndarray]] = None,
+) -> Tuple[float, ...]:
+    """
+    Calculate the center of mass of an array, as scipy.ndimage.center_of_mass.
+
+    The center of mass is calculated from the projections of the array onto each axis,
+    which avoids building index grids of the size of the array.
+
+    :param array: the N-dimensional array
+    :param projections: the projections of the array onto each axis, as returned by
+     axis_projections. If provided, array is not used.
+    :return: a tuple of floats, the position of the center of mass along each axis
+    """
+    if projections is None:
+        if array is None:
+            raise ValueError("array or projections should be provided")
+        projections = axis_projections(array)
+    total = projections[0].sum()
+    return tuple(
+        float(np.dot(projection, _index_vector(projection.size)) / total)
+        for projection in projections
+    )
+
+
+@lru_cache(maxsize=16)
+def _index_vector(size: int) -> np.ndarray:
+    """Return the read-only array of indices [0, size), cached for repeated shapes."""
+    indices = np.arange(size)
+    indices.flags.writeable = False
+    return indices
+
+
 def convert_str_target(
     value: Any, target: str, conversion_table: Optional[Dict[str, Any]] = None
 ) -> Any:
@@ -325,7 +460,9 @@ def crop_pad(
      - 'cmap': str, name of the colormap
      - 'logger': an optional logger
 
-    :return: myobj cropped or padded with zeros
+    :return: myobj cropped or padded with zeros. Axes which already have the
+     expected size are left untouched, the output may be a view of array when it is
+     only cropped. A copy of array is returned if no axis changes.
     """
     logger = kwargs.get("logger", module_logger)
     valid.valid_ndarray(arrays=array, ndim=3)
@@ -359,9 +496,14 @@ def crop_pad(
             cmap=kwargs.get("cmap", "turbo"),
         )
 
-    # crop/pad along axis 0
-    if newz >= nbz:  # pad
-        temp_z = np.ones((output_shape[0], nby, nbx), dtype=array.dtype) * pad_value
+    # data type of the padded array, same as array * pad_value
+    dtype = np.result_type(array, pad_value)
+
+    # crop/pad along axis 0, nothing to do if the size is already the expected one
+    if newz == nbz:
+        temp_z = array
+    elif newz > nbz:  # pad
+        temp_z = np.full((newz, nby, nbx), pad_value, dtype=dtype)
         temp_z[pad_start[0] : pad_start[0] + nbz, :, :] = array
     else:  # crop
         if (crop_center[0] - output_shape[0] // 2 < 0) or (
@@ -373,8 +515,10 @@ def crop_pad(
         ]
 
     # crop/pad along axis 1
-    if newy >= nby:  # pad
-        temp_y = np.ones((newz, newy, nbx), dtype=array.dtype) * pad_value
+    if newy == nby:
+        temp_y = temp_z
+    elif newy > nby:  # pad
+        temp_y = np.full((newz, newy, nbx), pad_value, dtype=dtype)
         temp_y[:, pad_start[1] : pad_start[1] + nby, :] = temp_z
     else:  # crop
         if (crop_center[1] - output_shape[1] // 2 < 0) or (
@@ -386,8 +530,10 @@ def crop_pad(
         ]
 
     # crop/pad along axis 2
-    if newx >= nbx:  # pad
-        newobj = np.ones((newz, newy, newx), dtype=array.dtype) * pad_value
+    if newx == nbx:
+        newobj = temp_y
+    elif newx > nbx:  # pad
+        newobj = np.full((newz, newy, newx), pad_value, dtype=dtype)
         newobj[:, :, pad_start[2] : pad_start[2] + nbx] = temp_y
     else:  # crop
         if (crop_center[2] - output_shape[2] // 2 < 0) or (
@@ -397,6 +543,10 @@ def crop_pad(
         newobj = temp_y[
             :, :, crop_center[2] - newx // 2 : crop_center[2] + newx // 2 + newx % 2
         ]
+    if newobj is array:  # nothing to crop or pad, do not return the input itself
+        newobj = array.astype(dtype)
+    elif any(new >= old for new, old in zip(output_shape, array.shape)):
+        newobj = newobj.astype(dtype, copy=False)
 
     if debugging:
         logger.info(f"array shape after crop/pad = {newobj.shape}")
@@ -1032,26 +1182,21 @@ def higher_primes(number, maxprime=13, required_dividers=(4,)):
     :param required_dividers: a list of required dividers for the returned integer.
     :return: the integer (or list/array of integers) fulfilling the requirements
     """
+    if required_dividers is not None:
+        required_dividers = tuple(required_dividers)
     if isinstance(number, (list, tuple, np.ndarray)):
         vn = []
         for i in number:
-            limit = i
-            if i <= 1 or maxprime > i:
-                raise ValueError(f"Number is < {maxprime}")
-            while (
-                try_smaller_primes(
-                    i, maxprime=maxprime, required_dividers=required_dividers
-                )
-                is False
-            ):
-                i = i + 1
-                if i == limit:
-                    return limit
-            vn.append(i)
+            vn.append(_higher_primes(i, maxprime, required_dividers))
         if isinstance(number, np.ndarray):
             return np.array(vn)
         return vn
-    limit = number
+    return _higher_primes(number, maxprime, required_dividers)
+
+
+@lru_cache(maxsize=256)
+def _higher_primes(number, maxprime, required_dividers):
+    """Find the closest larger number for higher_primes, cached for repeated sizes."""
     if number <= 1 or maxprime > number:
         raise ValueError(f"Number is < {maxprime}")
     while (
@@ -1061,8 +1206,6 @@ def higher_primes(number, maxprime=13, required_dividers=(4,)):
         is False
     ):
         number = number + 1
-        if number == limit:
-            return limit
     return number
 
 
@@ -2116,6 +2259,7 @@ def rotate_crystal(
     is_orthogonal=False,
     reciprocal_space=False,
     debugging=False,
+    new_voxel_size=None,
     **kwargs,
 ):
     """
@@ -2125,7 +2269,8 @@ def rotate_crystal(
     reference_axis should be in the order X Y Z, where Z is downstream, Y vertical
     and X outboard (CXI convention).
 
-    :param arrays: tuple of 3D real arrays of the same shape.
+    :param arrays: tuple of 3D real or complex arrays of the same shape. For complex
+     arrays, the debugging plots show the modulus.
     :param axis_to_align: the axis to be aligned (e.g. vector q),
      expressed in an orthonormal frame x y z
     :param reference_axis: will align axis_to_align onto this vector,
@@ -2143,6 +2288,9 @@ def rotate_crystal(
      Used for plot labels.
     :param debugging: tuple of booleans of the same length as the number of
      input arrays, True to see plots before and after rotation
+    :param new_voxel_size: optional tuple, voxel size of the rotated arrays in z, y,
+     and x (CXI convention). It allows to regrid and rotate the arrays in a single
+     interpolation. If None, it is equal to voxel_size.
     :param kwargs:
 
      - 'cmap': str, name of the colormap
@@ -2178,6 +2326,17 @@ def rotate_crystal(
         name="postprocessing_utils.rotate_crystal",
         min_excluded=0,
     )
+    new_voxel_size = new_voxel_size or voxel_size
+    if isinstance(new_voxel_size, Real):
+        new_voxel_size = (new_voxel_size,) * 3
+    valid.valid_container(
+        new_voxel_size,
+        container_types=(tuple, list),
+        length=3,
+        item_types=Real,
+        name="new_voxel_size",
+        min_excluded=0,
+    )
     if isinstance(fill_value, Real):
         fill_value = (fill_value,) * nb_arrays
     valid.valid_container(
@@ -2289,7 +2448,12 @@ def rotate_crystal(
     old_y = np.arange(-nby // 2, nby // 2, 1) * voxel_size[1]
     old_x = np.arange(-nbx // 2, nbx // 2, 1) * voxel_size[2]
 
-    myz, myy, myx = np.meshgrid(old_z, old_y, old_x, indexing="ij")
+    myz, myy, myx = np.meshgrid(
+        old_z * new_voxel_size[0] / voxel_size[0],
+        old_y * new_voxel_size[1] / voxel_size[1],
+        old_x * new_voxel_size[2] / voxel_size[2],
+        indexing="ij",
+    )
 
     new_x = (
         rotation_matrix[0, 0] * myx
@@ -2315,7 +2479,8 @@ def rotate_crystal(
     output_arrays = []
     for idx, array in enumerate(arrays):
         # convert array to float, for integers the interpolation can lead to artefacts
-        array = array.astype(float)
+        if not np.issubdtype(array.dtype, np.inexact):
+            array = array.astype(float)
 
         # interpolate array onto the new positions
         rgi = RegularGridInterpolator(
@@ -2338,6 +2503,8 @@ def rotate_crystal(
         output_arrays.append(rotated_array)
 
         if debugging[idx]:
+            if np.iscomplexobj(array):
+                array, rotated_array = abs(array), abs(rotated_array)
             gu.multislices_plot(
                 array,
                 width_z=width_z,
@@ -2499,24 +2666,24 @@ def smaller_primes(number, maxprime=13, required_dividers=(4,)):
     :param required_dividers: a list of required dividers for the returned integer.
     :return: the integer (or list/array of integers) fulfilling the requirements
     """
+    if required_dividers is not None:
+        required_dividers = tuple(required_dividers)
     if isinstance(number, (list, tuple, np.ndarray)):
         vn = []
         for i in number:
-            if i <= 1 or maxprime > i:
-                raise ValueError(f"Number is < {maxprime}")
-            while (
-                try_smaller_primes(
-                    i, maxprime=maxprime, required_dividers=required_dividers
-                )
-                is False
-            ):
-                i = i - 1
-                if i == 0:
-                    return 0
+            i = _smaller_primes(i, maxprime, required_dividers)
+            if i == 0:
+                return 0
             vn.append(i)
         if isinstance(number, np.ndarray):
             return np.array(vn)
         return vn
+    return _smaller_primes(number, maxprime, required_dividers)
+
+
+@lru_cache(maxsize=256)
+def _smaller_primes(number, maxprime, required_dividers):
+    """Find the closest smaller number for smaller_primes, cached for repeated sizes."""
     if number <= 1 or maxprime > number:
         raise ValueError(f"Number is < {maxprime}")
     while (
@@ -2593,14 +2760,16 @@ def try_smaller_primes(number, maxprime=13, required_dividers=(4,)):
      If None, this check is skipped.
     :return: True if the conditions are met.
     """
-    p = primes(number)
-    if max(p) > maxprime:
-        return False
+    valid.valid_item(number, allowed_types=int, min_excluded=0, name="number")
     if required_dividers is not None:
         for k in required_dividers:
             if number % k != 0:
                 return False
-    return True
+    # divide out the acceptable primes, what remains is a product of larger primes
+    for divider in range(2, maxprime + 1):
+        while number % divider == 0:
+            number //= divider
+    return number == 1
 
 
 def unpack_array(
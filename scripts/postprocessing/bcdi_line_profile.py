@@ -162,6 +162,8 @@ for point in points:
         min_included=0,
         name=valid_name,
     )
+# process the points always in the same order (points can be given as a set)
+points = tuple(sorted(tuple(point) for point in points))
 
 if isinstance(voxel_size, Real):
     voxel_size = (voxel_size,) * ndim
@@ -187,6 +189,7 @@ valid.valid_container(
     max_included=1,
     name=valid_name,
 )
+threshold = np.asarray(threshold)
 
 if isinstance(width_lines, Real):
     width_lines = (width_lines,)
@@ -200,7 +203,6 @@ valid.valid_container(
 )
 
 if width_lines is not None:
-    tmp_thres = np.zeros((len(width_lines), len(points)))
     if not isinstance(styles, dict):
         raise TypeError("styles should be a dictionnary")
     if len(styles) != len(width_lines):
@@ -246,8 +248,11 @@ else:
 #########################
 # normalize the modulus #
 #########################
-obj = abs(obj) / abs(obj).max()  # normalize the modulus to 1
-obj[np.isnan(obj)] = 0  # remove nans
+obj = abs(obj).astype(float, copy=False)
+np.nan_to_num(obj, copy=False, nan=0.0, posinf=0.0)  # remove nans and infs, in place
+max_modulus = obj.max()
+if max_modulus > 0:
+    obj /= max_modulus  # normalize the modulus to 1, in place
 if ndim == 2:
     gu.imshow_plot(
         array=obj, plot_colorbar=True, reciprocal_space=False, is_orthogonal=True
@@ -322,23 +327,26 @@ gu.savefig(
 #################################################################################
 # calculate the evolution of the width of the object depending on the threshold #
 #################################################################################
-idx_point = 0
+fitted_thresholds = []  # one array of thresholds per point
 for key, value in result.items():  # loop over the linecuts
-    fit = interp1d(value["distance"], value["cut"])
+    # the distances along the linecut are increasing, np.interp can be used directly
     dist_interp = np.linspace(
         value["distance"].min(), value["distance"].max(), num=10000
     )
-    cut_interp = fit(dist_interp)
-    width = np.empty(len(threshold))
-
-    # calculate the function width vs threshold
-    for idx, thres in enumerate(threshold):
-        # calculate the distances where the modulus is equal to threshold
-        crossings = np.argwhere(cut_interp > thres)
-        if len(crossings) > 1:
-            width[idx] = dist_interp[crossings.max()] - dist_interp[crossings.min()]
-        else:
-            width[idx] = 0
+    cut_interp = np.interp(dist_interp, value["distance"], value["cut"])
+
+    # calculate the function width vs threshold, for all thresholds at once
+    # sort the points by decreasing modulus, the k first points are the ones above
+    # the threshold and their extent is given by the running min/max of the indices
+    order = np.argsort(cut_interp)[::-1]
+    first = np.minimum.accumulate(order)
+    last = np.maximum.accumulate(order)
+    nb_above = np.searchsorted(-cut_interp[order], -threshold, side="left")
+    width = np.where(
+        nb_above > 0,
+        dist_interp[last[nb_above - 1]] - dist_interp[first[nb_above - 1]],
+        0,
+    )
     # update the dictionary value
     value["threshold"] = threshold
     value["width"] = width
@@ -349,18 +357,18 @@ for key, value in result.items():  # loop over the linecuts
         fit = interp1d(
             width, threshold
         )  # width vs threshold is monotonic (decreasing with increasing threshold)
-        for idx_line, val in enumerate(width_lines):
-            tmp_thres[idx_line, idx_point] = fit(val)
-        idx_point += 1
+        fitted_thresholds.append(fit(width_lines))
 
 #################################################
 # calculate statistics on the fitted thresholds #
 #################################################
 if width_lines is not None:
-    mean_thres = np.mean(tmp_thres, axis=1)
-    std_thres = np.std(tmp_thres, axis=1)
+    # shape (number of width lines, number of points)
+    fitted_thresholds = np.stack(fitted_thresholds, axis=1)
+    mean_thres = fitted_thresholds.mean(axis=1)
+    std_thres = fitted_thresholds.std(axis=1)
     # update the dictionary
-    result["fitted_thresholds"] = tmp_thres
+    result["fitted_thresholds"] = fitted_thresholds
     result["expected_width"] = width_lines
     result["mean_thres"] = np.round(mean_thres, decimals=3)
     result["std_thres"] = np.round(std_thres, decimals=3)
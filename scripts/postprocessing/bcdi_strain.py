@@ -324,6 +324,8 @@ Usage:
      length of the ticks in plots
     :param tick_width: e.g. 1
      width of the ticks in plots
+    :param plot_format: e.g. "jpg"
+     file format of the saved plots, "jpg" (faster) or "png"
 
     Parameters for temperature estimation:
 
@@ -360,7 +362,10 @@ Usage:
     :param save_support: e.g. False
      True to save the non-orthogonal support for later phase retrieval
     :param save: e.g. True
-     True to save amp.npz, phase.npz, strain.npz and vtk files
+     True to save the amplitude, phase, strain and vtk files
+    :param output_format: e.g. "h5"
+     file format used for saving the amplitude, phase and strain, "h5" or "npz".
+     A list of formats can also be provided, e.g. ["h5", "npz"].
 
 """
 
@@ -16,7 +16,6 @@ import matplotlib as mpl
 import matplotlib.ticker as ticker
 import numpy as np
 from matplotlib import pyplot as plt
-from scipy.ndimage.measurements import center_of_mass
 
 import bcdi.graph.graph_utils as gu
 import bcdi.utils.utilities as util
@@ -168,11 +167,21 @@ else:
 plt.ion()
 root = tk.Tk()
 root.withdraw()
-file_path = filedialog.askopenfilename(
-    initialdir=datadir,
-    title="Select the diffraction pattern",
-    filetypes=[("NPZ", "*.npz")],
-)
+try:
+    file_path = filedialog.askopenfilename(
+        initialdir=datadir,
+        title="Select the diffraction pattern",
+        filetypes=[("NPZ", "*.npz")],
+    )
+    if load_qvalues:
+        q_file_path = filedialog.askopenfilename(
+            initialdir=datadir,
+            title="Select the q values",
+            filetypes=[("NPZ", "*.npz")],
+        )
+finally:
+    # the Tk interpreter is not needed anymore once the files are selected
+    root.destroy()
 data, _ = util.load_file(file_path)
 print("Initial data shape:", data.shape)
 print("Data type", data.dtype)
@@ -188,13 +197,12 @@ except TypeError:
     raise TypeError("half-range should be a tuple of three pixel numbers")
 
 nbz, nby, nbx = data.shape
-zcom, ycom, xcom = com = tuple(map(lambda x: int(np.rint(x)), center_of_mass(data)))
+zcom, ycom, xcom = com = tuple(int(np.rint(val)) for val in util.center_of_mass(data))
 print("Center of mass of the diffraction pattern at pixel:", zcom, ycom, xcom)
 print(
     f"\nintensity in a ROI of 7x7x7 voxels centered on the COM:"
     f" {int(data[zcom-3:zcom+4, ycom-3:ycom+4, xcom-3:xcom+4].sum())}"
 )
-plot_range = []
 if plot_symmetrical:
     max_range = (
         min(zcom, nbz - zcom),
@@ -214,9 +222,11 @@ else:
         nbx - xcom,
     )  # asymmetric half ranges
 
-for idx, val in enumerate(half_range):
-    plot_range.append(min(val or max_range[2 * idx], max_range[2 * idx]))
-    plot_range.append(min(val or max_range[2 * idx + 1], max_range[2 * idx + 1]))
+# the half-range of an axis applies to both sides, None means the maximum range
+plot_range = [
+    min(half_range[idx // 2] or max_val, max_val)
+    for idx, max_val in enumerate(max_range)
+]
 print("\nPlotting symmetrical ranges:", plot_symmetrical)
 print("Plotting range from the center of mass:", plot_range)
 
@@ -233,10 +243,7 @@ gu.multislices_plot(
 # optionally load the q values #
 ################################
 if load_qvalues:
-    file_path = filedialog.askopenfilename(
-        initialdir=datadir, title="Select the q values", filetypes=[("NPZ", "*.npz")]
-    )
-    q_values = np.load(file_path)
+    q_values = np.load(q_file_path)
     qx = q_values["qx"]
     qz = q_values["qz"]
     qy = q_values["qy"]
@@ -290,49 +297,45 @@ tick_spacing = (
 print("\nTick spacing:", [f"{val:.3f} {unit}" for val in tick_spacing])
 
 if colorbar_range is None:  # use rounded acceptable values
+    # select the valid voxels and take their logarithm only once
+    log_data = np.log10(data[np.logical_and(data != 0, ~np.isnan(data))])
     colorbar_range = (
-        np.ceil(np.median(np.log10(data[np.logical_and(data != 0, ~np.isnan(data))]))),
-        np.ceil(np.log10(data[np.logical_and(data != 0, ~np.isnan(data))].max())),
+        np.ceil(np.median(log_data)),
+        np.ceil(log_data.max()),
     )
+    del log_data
 numticks_colorbar = int(np.floor(colorbar_range[1] - colorbar_range[0] + 1))
 
-############################
-# plot views in QyQz plane #
-############################
-if save_qyqz:
+# regions of interest used in plots, centered on the center of mass
+z_range = slice(zcom - plot_range[0], zcom + plot_range[1])
+y_range = slice(ycom - plot_range[2], ycom + plot_range[3])
+x_range = slice(xcom - plot_range[4], xcom + plot_range[5])
+
+
+def save_view(image, extent, tick_spacings, axis_labels, suffix, invert_yaxis):
+    """
+    Plot a 2D view of the diffraction pattern and save it with and without labels.
+
+    :param image: the 2D array to plot, in log scale
+    :param extent: the extent of the image (left, right, bottom, top)
+    :param tick_spacings: a tuple of two numbers, the spacing of the horizontal and
+     vertical ticks
+    :param axis_labels: a tuple of two strings, the horizontal and vertical labels
+    :param suffix: the suffix of the filename
+    :param invert_yaxis: True to invert the vertical axis
+    """
     fig, ax0 = plt.subplots(1, 1, figsize=(9, 6))
-    if save_sum:
-        # extent (left, right, bottom, top)
-        plt0 = ax0.imshow(
-            np.log10(
-                data[
-                    :,
-                    ycom - plot_range[2] : ycom + plot_range[3],
-                    xcom - plot_range[4] : xcom + plot_range[5],
-                ].sum(axis=0)
-            ),
-            cmap=my_cmap,
-            vmin=colorbar_range[0],
-            vmax=colorbar_range[1],
-            extent=[q_range[4], q_range[5], q_range[3], q_range[2]],
-        )
-    else:
-        plt0 = ax0.imshow(
-            np.log10(
-                data[
-                    zcom,
-                    ycom - plot_range[2] : ycom + plot_range[3],
-                    xcom - plot_range[4] : xcom + plot_range[5],
-                ]
-            ),
-            cmap=my_cmap,
-            vmin=colorbar_range[0],
-            vmax=colorbar_range[1],
-            extent=[q_range[4], q_range[5], q_range[3], q_range[2]],
-        )
-    ax0.invert_yaxis()  # qz is pointing up
-    ax0.xaxis.set_major_locator(ticker.MultipleLocator(tick_spacing[2]))
-    ax0.yaxis.set_major_locator(ticker.MultipleLocator(tick_spacing[1]))
+    plt0 = ax0.imshow(
+        image,
+        cmap=my_cmap,
+        vmin=colorbar_range[0],
+        vmax=colorbar_range[1],
+        extent=extent,
+    )
+    if invert_yaxis:
+        ax0.invert_yaxis()
+    ax0.xaxis.set_major_locator(ticker.MultipleLocator(tick_spacings[0]))
+    ax0.yaxis.set_major_locator(ticker.MultipleLocator(tick_spacings[1]))
     gu.colorbar(plt0, numticks=numticks_colorbar, pad=cbar_pad)
     gu.savefig(
         savedir=savedir,
@@ -342,9 +345,9 @@ if save_qyqz:
         tick_length=tick_length,
         tick_direction=tick_direction,
         label_size=16,
-        xlabels=labels[2],
-        ylabels=labels[1],
-        filename=sample_name + str(scan) + comment + "_qyqz",
+        xlabels=axis_labels[0],
+        ylabels=axis_labels[1],
+        filename=sample_name + str(scan) + comment + suffix,
         labelbottom=draw_ticks,
         labelleft=draw_ticks,
         labelright=False,
@@ -355,122 +358,57 @@ if save_qyqz:
         top=draw_ticks,
     )
 
+
+############################
+# plot views in QyQz plane #
+############################
+if save_qyqz:
+    if save_sum:
+        image = np.log10(data[:, y_range, x_range].sum(axis=0), dtype=np.float32)
+    else:
+        image = np.log10(data[zcom, y_range, x_range], dtype=np.float32)
+    save_view(
+        image,
+        extent=[q_range[4], q_range[5], q_range[3], q_range[2]],
+        tick_spacings=(tick_spacing[2], tick_spacing[1]),
+        axis_labels=(labels[2], labels[1]),
+        suffix="_qyqz",
+        invert_yaxis=True,  # qz is pointing up
+    )
+
 ############################
 # plot views in QyQx plane #
 ############################
 if save_qyqx:
-    fig, ax0 = plt.subplots(1, 1, figsize=(9, 6))
     if save_sum:
-        # extent (left, right, bottom, top)
-        plt0 = ax0.imshow(
-            np.log10(
-                data[
-                    zcom - plot_range[0] : zcom + plot_range[1],
-                    :,
-                    xcom - plot_range[4] : xcom + plot_range[5],
-                ].sum(axis=1)
-            ),
-            cmap=my_cmap,
-            vmin=colorbar_range[0],
-            vmax=colorbar_range[1],
-            extent=[q_range[4], q_range[5], q_range[1], q_range[0]],
-        )
+        image = np.log10(data[z_range, :, x_range].sum(axis=1), dtype=np.float32)
     else:
-        plt0 = ax0.imshow(
-            np.log10(
-                data[
-                    zcom - plot_range[0] : zcom + plot_range[1],
-                    ycom,
-                    xcom - plot_range[4] : xcom + plot_range[5],
-                ]
-            ),
-            cmap=my_cmap,
-            vmin=colorbar_range[0],
-            vmax=colorbar_range[1],
-            extent=[q_range[4], q_range[5], q_range[1], q_range[0]],
-        )
-    ax0.invert_yaxis()  # qx is pointing up
-    ax0.xaxis.set_major_locator(ticker.MultipleLocator(tick_spacing[2]))
-    ax0.yaxis.set_major_locator(ticker.MultipleLocator(tick_spacing[0]))
-    gu.colorbar(plt0, numticks=numticks_colorbar, pad=cbar_pad)
-    gu.savefig(
-        savedir=savedir,
-        figure=fig,
-        axes=ax0,
-        tick_width=tick_width,
-        tick_length=tick_length,
-        tick_direction=tick_direction,
-        label_size=16,
-        xlabels=labels[2],
-        ylabels=labels[0],
-        filename=sample_name + str(scan) + comment + "_qyqx",
-        labelbottom=draw_ticks,
-        labelleft=draw_ticks,
-        labelright=False,
-        labeltop=False,
-        left=draw_ticks,
-        right=draw_ticks,
-        bottom=draw_ticks,
-        top=draw_ticks,
+        image = np.log10(data[z_range, ycom, x_range], dtype=np.float32)
+    save_view(
+        image,
+        extent=[q_range[4], q_range[5], q_range[1], q_range[0]],
+        tick_spacings=(tick_spacing[2], tick_spacing[0]),
+        axis_labels=(labels[2], labels[0]),
+        suffix="_qyqx",
+        invert_yaxis=True,  # qx is pointing up
     )
 
 ############################
 # plot views in QzQx plane #
 ############################
 if save_qzqx:
-    fig, ax0 = plt.subplots(1, 1, figsize=(9, 6))
     if save_sum:
-        # extent (left, right, bottom, top)
-        plt0 = ax0.imshow(
-            np.log10(
-                data[
-                    zcom - plot_range[0] : zcom + plot_range[1],
-                    ycom - plot_range[2] : ycom + plot_range[3],
-                    :,
-                ].sum(axis=2)
-            ),
-            cmap=my_cmap,
-            vmin=colorbar_range[0],
-            vmax=colorbar_range[1],
-            extent=[q_range[2], q_range[3], q_range[1], q_range[0]],
-        )
+        image = np.log10(data[z_range, y_range, :].sum(axis=2), dtype=np.float32)
     else:
-        plt0 = ax0.imshow(
-            np.log10(
-                data[
-                    zcom - plot_range[0] : zcom + plot_range[1],
-                    ycom - plot_range[2] : ycom + plot_range[3],
-                    xcom,
-                ]
-            ),
-            cmap=my_cmap,
-            vmin=colorbar_range[0],
-            vmax=colorbar_range[1],
-            extent=[q_range[2], q_range[3], q_range[1], q_range[0]],
-        )
+        image = np.log10(data[z_range, y_range, xcom], dtype=np.float32)
     # qx is pointing down (the image will be rotated manually by 90 degrees)
-    ax0.xaxis.set_major_locator(ticker.MultipleLocator(tick_spacing[1]))
-    ax0.yaxis.set_major_locator(ticker.MultipleLocator(tick_spacing[0]))
-    gu.colorbar(plt0, numticks=numticks_colorbar, pad=cbar_pad)
-    gu.savefig(
-        savedir=savedir,
-        figure=fig,
-        axes=ax0,
-        tick_width=tick_width,
-        tick_length=tick_length,
-        tick_direction=tick_direction,
-        label_size=16,
-        xlabels=labels[1],
-        ylabels=labels[0],
-        filename=sample_name + str(scan) + comment + "_qzqx",
-        labelbottom=draw_ticks,
-        labelleft=draw_ticks,
-        labelright=False,
-        labeltop=False,
-        left=draw_ticks,
-        right=draw_ticks,
-        bottom=draw_ticks,
-        top=draw_ticks,
+    save_view(
+        image,
+        extent=[q_range[2], q_range[3], q_range[1], q_range[0]],
+        tick_spacings=(tick_spacing[1], tick_spacing[0]),
+        axis_labels=(labels[1], labels[0]),
+        suffix="_qzqx",
+        invert_yaxis=False,
     )
 
 plt.ioff()
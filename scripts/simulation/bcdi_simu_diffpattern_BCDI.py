@@ -8,6 +8,7 @@
 #         Jerome Carnis, carnis_jerome@yahoo.fr
 
 import gc
+import math
 import os
 import sys
 import tkinter as tk
@@ -35,6 +36,16 @@ The provided reconstructed object is expected to be orthogonalized, in the labor
 frame.
 """
 
+
+def atan_degrees(opposite, adjacent):
+    """Calculate arctan(opposite / adjacent) in degrees, in the range [-90, 90]."""
+    if adjacent == 0:  # arctan of +/- infinity, or undefined for 0 / 0
+        if opposite == 0:
+            return math.nan
+        return math.copysign(90.0, opposite) * math.copysign(1.0, adjacent)
+    return math.degrees(math.atan(opposite / adjacent))
+
+
 scan = 2227  # spec scan number
 datadir = "C:/Users/Jerome/Documents/data/BCDI_isosurface/S" + str(scan) + "/test/"
 # "D:/data/BCDI_isosurface/S"+str(scan)+"/test/"
@@ -386,9 +397,9 @@ if rotate_crystal:
         ref_vector=np.array([q[2], q[1], q[0]]) / np.linalg.norm(q), test_vector=myaxis
     )
     print("Angle between q and", ref_axis_outplane, "=", angle, "deg")
-    print("Angle with y in zy plane", np.arctan(q[0] / q[1]) * 180 / np.pi, "deg")
-    print("Angle with y in xy plane", np.arctan(-q[2] / q[1]) * 180 / np.pi, "deg")
-    print("Angle with z in xz plane", 180 + np.arctan(q[2] / q[0]) * 180 / np.pi, "deg")
+    print("Angle with y in zy plane", atan_degrees(q[0], q[1]), "deg")
+    print("Angle with y in xy plane", atan_degrees(-q[2], q[1]), "deg")
+    print("Angle with z in xz plane", 180 + atan_degrees(q[2], q[0]), "deg")
 
     support, phase = util.rotate_crystal(
         arrays=(support, phase),
@@ -13,7 +13,7 @@ import numpy as np
 from pyfakefs import fake_filesystem_unittest
 
 from bcdi.experiment.beamline import create_beamline
-from bcdi.experiment.loader import LoaderID01, create_loader
+from bcdi.experiment.loader import LoaderID01, create_loader, select_frames
 from bcdi.experiment.setup import Setup
 from tests.config import load_config, run_tests
 
@@ -319,7 +319,34 @@ class TestRepr(unittest.TestCase):
         self.assertIsInstance(eval(repr(self.loader)), LoaderID01)
 
 
+class TestSelectFrames(unittest.TestCase):
+    """Tests related to select_frames."""
+
+    def setUp(self) -> None:
+        self.data = np.arange(60).reshape((5, 3, 4))
+
+    def test_no_pattern(self):
+        data, frames_pattern = select_frames(self.data)
+        self.assertIs(data, self.data)
+        self.assertTrue(np.array_equal(frames_pattern, np.ones(5)))
+
+    def test_all_frames_kept(self):
+        data, _ = select_frames(self.data, frames_pattern=np.ones(5, dtype=int))
+        self.assertIs(data, self.data)
+
+    def test_skip_frames(self):
+        frames_pattern = np.array([1, 0, 1, 1, 0])
+        data, out_pattern = select_frames(self.data, frames_pattern=frames_pattern)
+        self.assertTrue(np.array_equal(data, self.data[[0, 2, 3]]))
+        self.assertTrue(np.array_equal(out_pattern, frames_pattern))
+
+    def test_wrong_length(self):
+        with self.assertRaises(ValueError):
+            select_frames(self.data, frames_pattern=np.ones(4, dtype=int))
+
+
 if __name__ == "__main__":
     run_tests(TestRetrieveDistance)
     run_tests(TestInitPath)
     run_tests(TestRepr)
+    run_tests(TestSelectFrames)
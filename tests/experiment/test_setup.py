@@ -10,7 +10,7 @@ import unittest
 
 import numpy as np
 
-from bcdi.experiment.setup import Setup
+from bcdi.experiment.setup import Setup, _calc_output_shape
 from bcdi.graph.colormap import ColormapFactory
 from tests.config import load_config, run_tests
 
@@ -300,9 +300,51 @@ class TestRepr(unittest.TestCase):
         self.assertIsInstance(eval(repr(self.setup)), Setup)
 
 
+class TestCalcOutputShape(unittest.TestCase):
+    """Tests related to _calc_output_shape."""
+
+    def test_identity(self):
+        self.assertEqual(
+            _calc_output_shape(
+                input_shape=(20, 30, 40),
+                transfer_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+            ),
+            (29, 39, 49),
+        )
+
+    def test_no_margin(self):
+        self.assertEqual(
+            _calc_output_shape(
+                input_shape=(20, 30, 40),
+                transfer_matrix=((2, 0, 0), (0, 1, 0), (0, 0, 3)),
+                margin=0,
+            ),
+            (19, 29, 39),
+        )
+
+    def test_consistent_with_full_grid(self):
+        matrix = np.array([[3.2, -0.1, -0.03], [-0.2, -3.2, 1.6], [-0.02, 0.0, 5.1]])
+        input_shape = (21, 30, 35)
+        myz, myy, myx = np.meshgrid(
+            *(np.arange(-val // 2, val // 2, 1) for val in input_shape),
+            indexing="ij",
+        )
+        expected = []
+        for row in matrix[::-1]:
+            positions = row[0] * myx + row[1] * myy + row[2] * myz
+            expected.append(int(np.rint(np.ptp(positions) / np.linalg.norm(row))) + 10)
+        self.assertEqual(
+            _calc_output_shape(
+                input_shape=input_shape, transfer_matrix=tuple(map(tuple, matrix))
+            ),
+            tuple(expected),
+        )
+
+
 if __name__ == "__main__":
     run_tests(Test)
     run_tests(TestCheckSetup)
     run_tests(TestCorrectDirectBeam)
     run_tests(TestCorrectDetectorAngles)
     run_tests(TestRepr)
+    run_tests(TestCalcOutputShape)
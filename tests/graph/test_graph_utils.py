@@ -6,11 +6,12 @@
 #       authors:
 #         Jerome Carnis, carnis_jerome@yahoo.fr
 
-import os
 import pathlib
+import tempfile
 import unittest
 
 import numpy as np
+from matplotlib import pyplot as plt
 
 import bcdi.graph.graph_utils as gu
 from tests.config import run_tests
@@ -19,20 +20,18 @@ from tests.config import run_tests
 class TestSaveToVti(unittest.TestCase):
     """Tests on save_to_vti."""
 
-    def __init__(self, *args, **kwargs):
-        super(TestSaveToVti, self).__init__(*args, **kwargs)
-        self.saving_dir = os.getcwd() + "/test_output/"
-        pathlib.Path(self.saving_dir).mkdir(parents=True, exist_ok=True)
-
     def setUp(self):
         # executed before each test
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.saving_dir = self.tmpdir.name + "/"
         self.amp = np.zeros((5, 5, 5))
         self.amp[1:4, 1:4, 1:4] = 1
         self.phase = np.zeros((5, 5, 5))
         self.phase[:4, :4, :4] = 1
 
-    # def tearDown(self):
-    #     executed after each test
+    def tearDown(self):
+        # executed after each test
+        self.tmpdir.cleanup()
 
     def test_savetovti_amp(self):
         self.assertIsNone(
@@ -44,6 +43,16 @@ class TestSaveToVti(unittest.TestCase):
             )
         )
 
+    def test_savetovti_input_arrays_unchanged(self):
+        phase = np.copy(self.phase)
+        gu.save_to_vti(
+            filename=self.saving_dir + "test.vti",
+            voxel_size=(1, 1, 1),
+            tuple_array=(self.amp, self.phase),
+            tuple_fieldnames=("amp", "phase"),
+        )
+        self.assertTrue(np.array_equal(self.phase, phase))
+
     def test_savetovti_no_amp(self):
         self.assertIsNone(
             gu.save_to_vti(
@@ -107,5 +116,82 @@ class TestSaveToVti(unittest.TestCase):
         )
 
 
+class TestMultislicesPlot(unittest.TestCase):
+    """Tests related to graph_utils.multislices_plot."""
+
+    def setUp(self):
+        self.array = np.random.rand(6, 8, 10)
+        self.mask = np.zeros(self.array.shape)
+        self.mask[1:5, 2:6, 3:7] = 1
+
+    def tearDown(self):
+        plt.close("all")
+
+    def test_mask(self):
+        _, _, plots = gu.multislices_plot(self.array, mask=self.mask)
+        expected = self.array * self.mask
+        self.assertTrue(np.allclose(plots[0].get_array(), expected[3, :, :]))
+        self.assertTrue(np.allclose(plots[1].get_array(), expected[:, 4, :]))
+        self.assertTrue(np.allclose(plots[2].get_array(), expected[:, :, 5]))
+
+    def test_mask_sum_frames(self):
+        _, _, plots = gu.multislices_plot(self.array, mask=self.mask, sum_frames=True)
+        expected = (self.array * self.mask).sum(axis=0)
+        self.assertTrue(np.allclose(plots[0].get_array(), expected))
+
+    def test_complex_log_scale(self):
+        array = self.array * np.exp(1j * self.array)
+        _, _, plots = gu.multislices_plot(array, scale="log")
+        self.assertTrue(
+            np.allclose(plots[0].get_array(), np.log10(abs(array[3, :, :])))
+        )
+
+    def test_reuse_figure(self):
+        figure = plt.figure()
+        fig, axes, _ = gu.multislices_plot(self.array, figure=figure)
+        self.assertIs(fig, figure)
+        fig, _, _ = gu.multislices_plot(self.array, figure=figure)
+        self.assertIs(fig, figure)
+        self.assertEqual(len(fig.axes), len(axes))  # the figure was cleared
+
+    def test_mask_wrong_shape(self):
+        with self.assertRaises(ValueError):
+            gu.multislices_plot(self.array, mask=np.ones((6, 8, 9)))
+
+
+class TestSaveFigure(unittest.TestCase):
+    """Tests related to graph_utils.save_figure."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.saving_dir = self.tmpdir.name + "/"
+        self.fig, ax = plt.subplots(1, 1)
+        ax.plot(np.arange(10))
+
+    def tearDown(self):
+        plt.close(self.fig)
+        self.tmpdir.cleanup()
+
+    def test_save_png(self):
+        gu.save_figure(self.fig, self.saving_dir + "test_save_figure.png")
+        self.assertTrue(
+            pathlib.Path(self.saving_dir + "test_save_figure.png").is_file()
+        )
+
+    def test_save_jpg(self):
+        gu.save_figure(self.fig, self.saving_dir + "test_save_figure.jpg")
+        self.assertTrue(
+            pathlib.Path(self.saving_dir + "test_save_figure.jpg").is_file()
+        )
+
+    def test_save_pdf(self):
+        gu.save_figure(self.fig, self.saving_dir + "test_save_figure.pdf")
+        self.assertTrue(
+            pathlib.Path(self.saving_dir + "test_save_figure.pdf").is_file()
+        )
+
+
 if __name__ == "__main__":
     run_tests(TestSaveToVti)
+    run_tests(TestMultislicesPlot)
+    run_tests(TestSaveFigure)
@@ -5,6 +5,7 @@
 #   (c) 07/2019-05/2021 : DESY PHOTON SCIENCE
 #       authors:
 #         Jerome Carnis, carnis_jerome@yahoo.fr
+import logging
 import os.path
 import tempfile
 import unittest
@@ -221,6 +222,14 @@ class TestPhaseManipulator(unittest.TestCase):
 
     def test_plot_phase(self):
         plot_title = "test"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.phase_manipulator.save_directory = tmpdir
+            self.phase_manipulator.plot_phase(plot_title, save_plot=True)
+            self.assertTrue(os.path.isfile(f"{tmpdir}/{plot_title}.jpg"))
+
+    def test_plot_phase_default_format(self):
+        plot_title = "test"
+        del self.phase_manipulator.parameters["plot_format"]
         with tempfile.TemporaryDirectory() as tmpdir:
             self.phase_manipulator.save_directory = tmpdir
             self.phase_manipulator.plot_phase(plot_title, save_plot=True)
@@ -252,6 +261,14 @@ class TestPhaseManipulator(unittest.TestCase):
         self.assertAlmostEqual(self.phase_manipulator.phase.min(), -15)
         self.assertAlmostEqual(self.phase_manipulator.phase.max(), 0)
 
+    def test_save_object_with_ramp(self):
+        self.phase_manipulator._phase_ramp = [1, 1, 1]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.phase_manipulator.save_object_with_ramp(tmpdir + "/obj")
+            obj = np.load(f"{tmpdir}/obj.npz")["obj"]
+        self.assertAlmostEqual(np.angle(obj[0, 0, 2]), 2)
+        self.assertTrue(np.allclose(self.phase_manipulator.phase, 0))
+
     def test_apodize(self):
         self.phase_manipulator.apodize()
 
@@ -351,8 +368,95 @@ class TestDetectorFrameLinearization(unittest.TestCase):
         )
 
 
+class TestInterpolatedCrystalSaveResults(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger("test_save_results")
+
+    def create_crystal(self, parameters):
+        shape = (2, 2, 2)
+        return analysis.InterpolatedCrystal(
+            modulus=np.ones(shape),
+            phase=np.zeros(shape),
+            strain=np.zeros(shape),
+            planar_distance=0.2,
+            parameters=parameters,
+            voxel_sizes=[1.0, 1.0, 1.0],
+            logger=self.logger,
+        )
+
+    def save_results(self, parameters):
+        crystal = self.create_crystal(parameters)
+        with patch.object(crystal, "save_results_as_npz") as save_npz, patch.object(
+            crystal, "save_results_as_h5"
+        ) as save_h5:
+            crystal.save_results(filename="test", setup=None)
+        return save_npz, save_h5
+
+    def test_default_output_format(self):
+        with self.assertNoLogs(self.logger, level="WARNING"):
+            save_npz, save_h5 = self.save_results(parameters={})
+        save_npz.assert_not_called()
+        save_h5.assert_called_once_with(filename="test.h5", setup=None)
+
+    def test_output_format_str(self):
+        # default values are assigned by the checker without validation
+        with self.assertNoLogs(self.logger, level="WARNING"):
+            save_npz, save_h5 = self.save_results(parameters={"output_format": "h5"})
+        save_npz.assert_not_called()
+        save_h5.assert_called_once()
+
+    def test_output_format_several(self):
+        with self.assertLogs(self.logger, level="WARNING"):
+            save_npz, save_h5 = self.save_results(
+                parameters={"output_format": ("h5", "npz")}
+            )
+        save_npz.assert_called_once()
+        save_h5.assert_called_once()
+
+
+class TestInterpolatedCrystalVolume(unittest.TestCase):
+    def setUp(self) -> None:
+        modulus = np.zeros((4, 4, 4))
+        modulus[1:3, 1:3, 1:3] = 1
+        modulus[1, 1, 1] = 0.1
+        self.crystal = analysis.InterpolatedCrystal(
+            modulus=modulus,
+            phase=np.zeros(modulus.shape),
+            strain=np.zeros(modulus.shape),
+            planar_distance=0.2,
+            parameters={"isosurface_strain": 0.2},
+            voxel_sizes=[1.0, 2.0, 3.0],
+            logger=logging.getLogger("test_crystal_volume"),
+        )
+
+    def test_volume(self):
+        self.crystal.estimate_crystal_volume()
+        self.assertEqual(self.crystal.estimated_crystal_volume, 7 * 6.0)
+
+    def test_zero_threshold(self):
+        self.crystal.parameters["isosurface_strain"] = 0
+        self.crystal.estimate_crystal_volume()
+        self.assertEqual(self.crystal.estimated_crystal_volume, 8 * 6.0)
+
+
+class TestGetChunkShape(unittest.TestCase):
+    def test_large_shape(self):
+        self.assertEqual(analysis.get_chunk_shape((256, 512, 128)), (64, 64, 64))
+
+    def test_small_shape(self):
+        self.assertEqual(analysis.get_chunk_shape((10, 100, 3)), (10, 64, 3))
+
+    def test_max_size(self):
+        self.assertEqual(
+            analysis.get_chunk_shape((100, 100, 100), max_size=32), (32, 32, 32)
+        )
+
+
 if __name__ == "__main__":
     run_tests(TestAnalysis)
     run_tests(TestPhaseManipulator)
     run_tests(TestCreateAnalysis)
     run_tests(TestDetectorFrameLinearization)
+    run_tests(TestInterpolatedCrystalSaveResults)
+    run_tests(TestInterpolatedCrystalVolume)
+    run_tests(TestGetChunkShape)
@@ -115,5 +115,28 @@ class TestFindDataRange(unittest.TestCase):
             )
 
 
+class TestFlipReconstruction(unittest.TestCase):
+    """Tests on the function postprocessing_utils.flip_reconstruction."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.obj = rng.random((6, 7, 8)) * np.exp(1j * rng.random((6, 7, 8)))
+
+    def test_same_intensity(self):
+        flipped = pu.flip_reconstruction(self.obj)
+        self.assertTrue(
+            np.allclose(abs(np.fft.fftn(flipped)), abs(np.fft.fftn(self.obj)))
+        )
+
+    def test_single_worker(self):
+        self.assertTrue(
+            np.allclose(
+                pu.flip_reconstruction(self.obj, workers=1),
+                pu.flip_reconstruction(self.obj),
+            )
+        )
+
+
 if __name__ == "__main__":
     run_tests(TestFindDataRange)
+    run_tests(TestFlipReconstruction)
@@ -9,11 +9,18 @@
 import pathlib
 import tempfile
 import unittest
+from unittest.mock import MagicMock
 
 import matplotlib
 import numpy as np
 
-from bcdi.preprocessing.bcdi_utils import PeakFinder, find_bragg
+from bcdi.preprocessing.bcdi_utils import (
+    PeakFinder,
+    center_fft,
+    find_bragg,
+    load_bcdi_data,
+    zero_pad,
+)
 from bcdi.utils.utilities import gaussian_window
 from tests.config import run_tests
 
@@ -205,12 +212,31 @@ class TestPeakFinder(unittest.TestCase):
         expected = (1, 12, 10)
         self.assertTrue(self.peakfinder._roi_center == expected)
 
+    def test_roi_center_updated_after_binning_change(self):
+        self.assertEqual(self.peakfinder._roi_center, (1, 25, 23))
+        self.peakfinder.binning = [1, 2, 2]
+        self.assertEqual(self.peakfinder._roi_center, (1, 12, 11))
+
+    def test_roi_center_updated_after_peak_method_change(self):
+        self.assertEqual(self.peakfinder._roi_center, (1, 25, 23))
+        self.peakfinder._peaks["com"] = (2, 20, 21)
+        self.peakfinder.peak_method = "com"
+        self.assertEqual(self.peakfinder._roi_center, (2, 20, 21))
+
     def test_fit_rocking_curve(self):
         self.peakfinder.fit_rocking_curve(
             tilt_values=np.arange(self.peakfinder.array.shape[0]),
         )
         self.assertEqual(self.peakfinder.metadata["tilt_value_at_peak"], 1)
 
+    def test_fit_rocking_curve_decreasing_tilt_values(self):
+        tilt_values = np.linspace(5.1, 5.25, 4)
+        self.peakfinder.fit_rocking_curve(tilt_values=tilt_values)
+        expected = self.peakfinder.metadata["interp_fwhm"]
+        self.peakfinder.fit_rocking_curve(tilt_values=tilt_values[::-1])
+        self.assertAlmostEqual(self.peakfinder.metadata["interp_fwhm"], expected)
+        self.assertAlmostEqual(self.peakfinder.metadata["tilt_value_at_peak"], 5.2)
+
     def test_plot_rocking_curve_file_saved(self):
         self.peakfinder.fit_rocking_curve(
             tilt_values=0.1 * np.arange(self.peakfinder.array.shape[0]),
@@ -240,6 +266,179 @@ class TestFindBragg(unittest.TestCase):
         self.assertTrue(metadata["bragg_peak"] == expected)
 
 
+class TestCenterFFT(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = np.zeros((20, 24, 30))
+        self.data[4:15, 6:19, 7:22] = gaussian_window(window_shape=(11, 13, 15))
+        self.mask = np.zeros(self.data.shape, dtype=int)
+        self.frames_logical = np.ones(self.data.shape[0], dtype=int)
+
+    def center(self, centering: str, fft_option: str = "crop_sym_ZYX", **kwargs):
+        return center_fft(
+            data=self.data,
+            mask=self.mask,
+            detector=None,
+            frames_logical=self.frames_logical,
+            centering=centering,
+            fft_option=fft_option,
+            q_values=None,
+            **kwargs,
+        )
+
+    def test_crop_sym_centering_methods(self):
+        for centering in ["max", "com", "max_com"]:
+            with self.subTest(centering=centering):
+                data, mask, pad_width, _, frames_logical = self.center(centering)
+                self.assertEqual(data.shape, (18, 24, 28))
+                self.assertEqual(
+                    np.unravel_index(data.argmax(), data.shape), (9, 12, 14)
+                )
+                self.assertTrue(np.array_equal(pad_width, np.zeros(6)))
+                self.assertEqual(frames_logical.sum(), 18)
+
+    def test_skip(self):
+        data, mask, pad_width, q_values, frames_logical = self.center(
+            "max", fft_option="skip"
+        )
+        self.assertIs(data, self.data)
+        self.assertIs(mask, self.mask)
+        self.assertIs(frames_logical, self.frames_logical)
+        self.assertTrue(np.array_equal(pad_width, np.zeros(6)))
+        self.assertIsNone(q_values)
+
+    def test_crop_detector_plane(self):
+        for fft_option in ["pad_sym_Z_crop_sym_YX", "pad_sym_Z_crop_asym_YX"]:
+            with self.subTest(fft_option=fft_option):
+                data, mask, _, _, _ = self.center(
+                    "max", fft_option=fft_option, pad_size=[32, 24, 30]
+                )
+                self.assertEqual(data.shape, (32, 24, 28))
+                self.assertEqual(mask.shape, (32, 24, 28))
+                self.assertTrue(np.isclose(data.sum(), self.data[:, :, 1:29].sum()))
+
+    def test_pad_sym_z_mask_dtype(self):
+        data, mask, pad_width, _, frames_logical = self.center(
+            "max", fft_option="pad_sym_Z", pad_size=[32, 24, 30]
+        )
+        self.assertEqual(data.shape, (32, 24, 30))
+        self.assertEqual(mask.dtype, self.mask.dtype)
+        self.assertTrue(np.all(mask[: pad_width[0]] == 1))
+        self.assertEqual((frames_logical == -1).sum(), 12)
+        self.assertEqual(frames_logical.dtype, self.frames_logical.dtype)
+
+    def test_pad_sym_z_float32_data(self):
+        self.data = self.data.astype(np.float32)
+        data, _, _, _, _ = self.center(
+            "max", fft_option="pad_sym_Z", pad_size=[32, 24, 30]
+        )
+        self.assertEqual(data.dtype, np.float32)
+
+    def test_pad_sym_zyx_q_values(self):
+        q_values = [np.arange(20) * 0.1, np.arange(24) * 0.2, np.arange(30) * 0.3]
+        _, _, pad_width, (qx, qz, qy), _ = center_fft(
+            data=self.data,
+            mask=self.mask,
+            detector=None,
+            frames_logical=self.frames_logical,
+            centering="max",
+            fft_option="pad_sym_ZYX",
+            pad_size=[32, 36, 40],
+            q_values=q_values,
+        )
+        for q_padded, q_initial, start, size in zip(
+            (qx, qz, qy), q_values, pad_width[::2], (32, 36, 40)
+        ):
+            self.assertEqual(len(q_padded), size)
+            self.assertTrue(
+                np.allclose(q_padded[start : start + len(q_initial)], q_initial)
+            )
+
+    def test_pad_asym_zyx_odd_padding(self):
+        self.data = self.data[:, :21, :27]
+        self.mask = self.mask[:, :21, :27]
+        data, mask, pad_width, _, _ = self.center("max", fft_option="pad_asym_ZYX")
+        self.assertEqual(data.shape, (20, 24, 28))
+        self.assertEqual(list(pad_width), [0, 0, 2, 1, 1, 0])
+        self.assertTrue(np.isclose(data.sum(), self.data.sum()))
+        self.assertEqual(mask.sum(), 20 * 24 * 28 - 20 * 21 * 27)
+
+
+class TestZeroPad(unittest.TestCase):
+    def setUp(self) -> None:
+        self.padding_width = np.array([1, 2, 0, 0, 3, 0])
+
+    def test_pad_data(self):
+        output = zero_pad(np.ones((2, 3, 4)), padding_width=self.padding_width)
+        self.assertEqual(output.shape, (5, 3, 7))
+        self.assertEqual(output.dtype, float)
+        self.assertEqual(output.sum(), 24)
+
+    def test_pad_mask(self):
+        output = zero_pad(
+            np.zeros((2, 3, 4)), padding_width=self.padding_width, mask_flag=True
+        )
+        self.assertEqual(output.sum(), 5 * 3 * 7 - 24)
+
+    def test_pad_mask_keep_dtype(self):
+        mask = np.zeros((2, 3, 4), dtype=np.uint8)
+        output = zero_pad(
+            mask, padding_width=self.padding_width, mask_flag=True, dtype=mask.dtype
+        )
+        self.assertEqual(output.dtype, np.uint8)
+        self.assertTrue(np.all(output[1:3, :, 3:] == 0))
+        self.assertEqual(output.sum(), 5 * 3 * 7 - 24)
+
+    def test_no_padding(self):
+        array = np.ones((2, 3, 4))
+        output = zero_pad(array, padding_width=np.zeros(6, dtype=int))
+        self.assertIs(output, array)
+
+    def test_no_padding_default(self):
+        array = np.ones((2, 3, 4))
+        self.assertIs(zero_pad(array), array)
+
+    def test_pad_float_width(self):
+        output = zero_pad(np.ones((2, 3, 4)), padding_width=[1.0, 2, 0, 0, 3, 0])
+        self.assertEqual(output.shape, (5, 3, 7))
+        self.assertEqual(output.sum(), 24)
+
+    def test_no_padding_other_dtype(self):
+        array = np.ones((2, 3, 4), dtype=int)
+        output = zero_pad(array, padding_width=np.zeros(6, dtype=int))
+        self.assertEqual(output.dtype, float)
+        self.assertTrue(np.array_equal(output, array))
+
+
+class TestLoadBcdiData(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = np.ones((2, 4, 4))
+        self.mask = np.zeros((2, 4, 4), dtype=int)
+        self.mask[0, 0, :] = [1, 128, 255, 256]
+        self.setup = MagicMock()
+        self.setup.detector.binning = (1, 1, 1)
+        self.setup.detector.current_binning = [1, 1, 1]
+        self.setup.detector.roi = [0, 4, 0, 4]
+        self.setup.loader.load_check_dataset.return_value = (
+            self.data,
+            self.mask,
+            np.ones(2),
+            np.ones(2, dtype=int),
+        )
+
+    def test_data_float32(self):
+        rawdata, *_ = load_bcdi_data(scan_number=1, setup=self.setup)
+        self.assertEqual(rawdata.dtype, np.float32)
+        self.assertTrue(np.array_equal(rawdata, self.data))
+
+    def test_mask_binarized(self):
+        _, rawmask, *_ = load_bcdi_data(scan_number=1, setup=self.setup)
+        self.assertEqual(rawmask.dtype, np.int8)
+        self.assertTrue(np.array_equal(rawmask, self.mask != 0))
+
+
 if __name__ == "__main__":
     run_tests(TestPeakFinder)
+    run_tests(TestCenterFFT)
     run_tests(TestFindBragg)
+    run_tests(TestZeroPad)
+    run_tests(TestLoadBcdiData)
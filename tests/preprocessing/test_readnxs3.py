@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+# BCDI: tools for pre(post)-processing Bragg coherent X-ray diffraction imaging data
+#   (c) 07/2017-06/2019 : CNRS UMR 7344 IM2NP
+#   (c) 07/2019-05/2021 : DESY PHOTON SCIENCE
+#       authors:
+#         Jerome Carnis, carnis_jerome@yahoo.fr
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import tables
+
+from bcdi.preprocessing.ReadNxs3 import DataSet
+from tests.config import run_tests
+
+
+def create_nxs_file(filename, scan_type):
+    """Write a minimal SIXS nexus file with a few sensors and a 2D detector."""
+    with tables.open_file(filename, "w") as file:
+        scan = file.create_group("/", "scan")
+        scan_data = file.create_group(scan, "scan_data")
+        sixs = file.create_group(scan, "SIXS")
+        mono = file.create_group(sixs, "Monochromator")
+        file.create_array(mono, "energy", np.array([8.5]))
+        file.create_array(mono, "wavelength", np.array([1.4586]))
+        if scan_type == "FLY":
+            file.create_array(scan_data, "delta", np.linspace(0, 1, 5))
+            file.create_array(
+                scan_data, "xpad_image", np.arange(5 * 240 * 6).reshape((5, 240, 6))
+            )
+        else:  # SBS
+            for name, long_name, data in (
+                ("data_01", b"i14-c-c00/ex/heater/heater4", np.linspace(0, 1, 5)),
+                ("data_02", b"i14-c-c00/ex/custom/sensor", np.ones(5)),
+            ):
+                node = file.create_array(scan_data, name, data)
+                node.attrs.long_name = long_name
+
+
+class TestDataSetFly(unittest.TestCase):
+    """Tests related to the loading of FLY scans."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, "fly_scan.nxs")
+        create_nxs_file(self.filename, scan_type="FLY")
+        self.dataset = DataSet(self.filename)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_scantype(self):
+        self.assertEqual(self.dataset.scantype, "FLY")
+
+    def test_eager_attributes(self):
+        self.assertEqual(self.dataset.energymono, 8.5)
+        self.assertEqual(self.dataset.waveL, 1.4586)
+        self.assertEqual(self.dataset.attlist, ["delta", "xpad_image", "xpad140"])
+        self.assertEqual(self.dataset.det2d(), ["xpad_image", "xpad140"])
+
+    def test_not_loaded_before_access(self):
+        self.assertNotIn("delta", self.dataset.__dict__)
+        self.assertEqual(self.dataset._get_shape("xpad_image"), (5, 240, 6))
+        self.assertNotIn("xpad_image", self.dataset.__dict__)
+
+    def test_lazy_access(self):
+        self.assertTrue(np.allclose(self.dataset.delta, np.linspace(0, 1, 5)))
+        stack = self.dataset.get_stack("xpad_image")
+        self.assertTrue(np.array_equal(stack, np.arange(7200).reshape((5, 240, 6))))
+
+    def test_lazy_access_loaded_once(self):
+        with patch.object(
+            DataSet, "_open_file", autospec=True, side_effect=DataSet._open_file
+        ) as mocked:
+            stack = self.dataset.xpad_image
+            self.assertIs(self.dataset.xpad140, stack)
+            self.assertIs(self.dataset.xpad_image, stack)
+        self.assertEqual(mocked.call_count, 1)
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            _ = self.dataset.not_a_sensor
+
+
+class TestDataSetSbs(unittest.TestCase):
+    """Tests related to the loading of SBS scans."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        create_nxs_file(os.path.join(self.tmpdir.name, "sbs_scan.nxs"), "SBS")
+        self.dataset = DataSet("sbs_scan.nxs", directory=self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_scantype(self):
+        self.assertEqual(self.dataset.scantype, "SBS")
+
+    def test_eager_attributes(self):
+        self.assertEqual(self.dataset.energymono, 8.5)
+        self.assertEqual(
+            self.dataset.attlist, ["heater4", "i14-c-c00/ex/custom/sensor"]
+        )
+        self.assertFalse(self.dataset.det2d())
+
+    def test_lazy_access(self):
+        self.assertNotIn("heater4", self.dataset.__dict__)
+        self.assertTrue(np.allclose(self.dataset.heater4, np.linspace(0, 1, 5)))
+        self.assertIn("heater4", self.dataset.__dict__)
+        self.assertTrue(
+            np.array_equal(getattr(self.dataset, "i14-c-c00/ex/custom/sensor"), [1] * 5)
+        )
+
+
+if __name__ == "__main__":
+    run_tests(TestDataSetFly)
+    run_tests(TestDataSetSbs)
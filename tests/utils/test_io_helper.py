@@ -70,6 +70,23 @@ class TestContextFile(unittest.TestCase):
             except StopIteration:
                 pass
 
+    def test_nested_context(self):
+        ctx = ContextFile(filename=self.filename, open_func=self.open_func)
+        with ctx as file:
+            with ctx as nested_file:
+                self.assertIs(nested_file, file)
+            self.assertFalse(file.closed)
+        self.assertTrue(file.closed)
+        self.assertIsNone(ctx.file)
+
+    def test_reopen_after_exit(self):
+        ctx = ContextFile(filename=self.filename, open_func=self.open_func)
+        with ctx as file:
+            pass
+        with ctx as new_file:
+            self.assertIsNot(new_file, file)
+            self.assertFalse(new_file.closed)
+
     def test_repr(self):
         ctx = ContextFile(
             filename=self.filename, open_func=self.open_func, shortname="test"
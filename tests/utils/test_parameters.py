@@ -536,6 +536,26 @@ class TestParameters(unittest.TestCase):
         with self.assertRaises(ParameterError):
             valid_param(key="sort_method", value="skip")
 
+    def test_output_format(self):
+        with self.assertRaises(ParameterError):
+            valid_param(key="output_format", value="vti")
+
+    def test_output_format_str(self):
+        val, flag = valid_param(key="output_format", value="npz")
+        self.assertTrue(val == ("npz",) and flag is True)
+
+    def test_output_format_list(self):
+        val, flag = valid_param(key="output_format", value=["h5", "npz"])
+        self.assertTrue(val == ("h5", "npz") and flag is True)
+
+    def test_plot_format(self):
+        with self.assertRaises(ParameterError):
+            valid_param(key="plot_format", value="pdf")
+
+    def test_plot_format_jpg(self):
+        val, flag = valid_param(key="plot_format", value="jpg")
+        self.assertTrue(val == "jpg" and flag is True)
+
     def test_offset_method(self):
         with self.assertRaises(ParameterError):
             valid_param(key="offset_method", value="skip")
@@ -11,7 +11,9 @@ import unittest
 
 import numpy as np
 from pyfakefs import fake_filesystem_unittest
+from scipy.ndimage import center_of_mass
 
+import bcdi.postprocessing.postprocessing_utils as pu
 import bcdi.utils.utilities as util
 from bcdi.experiment.detector import Detector, create_detector
 from bcdi.experiment.setup import Setup
@@ -152,6 +154,203 @@ class TestCast(unittest.TestCase):
             util.cast("two", target_type=float)
 
 
+class TestArgmaxModulus(unittest.TestCase):
+    """
+    Tests on the function utilities.argmax_modulus.
+
+    def argmax_modulus(array: np.ndarray) -> int:
+    """
+
+    def test_positive(self):
+        array = np.arange(24).reshape((2, 3, 4))
+        self.assertEqual(util.argmax_modulus(array), 23)
+
+    def test_negative_minimum(self):
+        array = np.zeros((2, 3, 4))
+        array[0, 1, 2] = 2
+        array[1, 0, 3] = -5
+        self.assertEqual(util.argmax_modulus(array), np.argmax(abs(array)))
+
+    def test_ties_first_occurrence(self):
+        array = np.array([0, 3, -3, 1])
+        self.assertEqual(util.argmax_modulus(array), 1)
+        self.assertEqual(util.argmax_modulus(-array), 1)
+
+    def test_complex(self):
+        array = np.array([1 + 1j, -3j, 2])
+        self.assertEqual(util.argmax_modulus(array), 1)
+
+    def test_unsigned(self):
+        array = np.array([3, 65535, 7, 65535], dtype=np.uint16)
+        self.assertEqual(util.argmax_modulus(array), 1)
+
+    def test_random_same_as_numpy(self):
+        rng = np.random.default_rng(seed=0)
+        array = rng.normal(size=(5, 6, 7))
+        self.assertEqual(util.argmax_modulus(array), np.argmax(abs(array)))
+
+
+class TestBinData(unittest.TestCase):
+    """Tests on the function utilities.bin_data."""
+
+    def setUp(self) -> None:
+        self.array = np.arange(4 * 9 * 10, dtype=np.int32).reshape((4, 9, 10))
+
+    def reference(self, array, binning):
+        nz, ny, nx = (length // factor for length, factor in zip(array.shape, binning))
+        array = array[: nz * binning[0], : ny * binning[1], : nx * binning[2]]
+        return array.reshape((nz, binning[0], ny, binning[1], nx, binning[2])).sum(
+            axis=(1, 3, 5)
+        )
+
+    def test_small_binning(self):
+        output = util.bin_data(self.array, binning=(1, 2, 3))
+        self.assertEqual(output.shape, (4, 4, 3))
+        self.assertEqual(output.dtype, self.array.sum().dtype)
+        self.assertTrue(np.array_equal(output, self.reference(self.array, (1, 2, 3))))
+
+    def test_large_binning(self):
+        output = util.bin_data(self.array, binning=(2, 1, 5))
+        self.assertEqual(output.shape, (2, 9, 2))
+        self.assertTrue(np.array_equal(output, self.reference(self.array, (2, 1, 5))))
+
+    def test_no_binning(self):
+        output = util.bin_data(self.array, binning=1)
+        self.assertTrue(np.array_equal(output, self.array))
+        self.assertFalse(np.shares_memory(output, self.array))
+
+    def test_bool_mask(self):
+        mask = np.zeros((2, 4, 4), dtype=bool)
+        mask[0, 0, 1] = True
+        output = util.bin_data(mask, binning=(1, 2, 2))
+        self.assertEqual(output.sum(), 1)
+        self.assertEqual(output[0, 0, 0], 1)
+
+
+class TestBinMask(unittest.TestCase):
+    """Tests on the function utilities.bin_mask."""
+
+    def setUp(self) -> None:
+        self.mask = np.zeros((2, 5, 9), dtype=np.int8)
+        self.mask[0, 0, 1] = 1
+        self.mask[1, 3, 3] = -1
+
+    def test_binning(self):
+        output = util.bin_mask(self.mask, binning=(1, 2, 2))
+        self.assertEqual(output.shape, (2, 2, 4))
+        self.assertEqual(output.dtype, self.mask.dtype)
+        self.assertEqual(output[0, 0, 0], 1)
+        self.assertEqual(output[1, 1, 1], 1)
+        self.assertEqual(output.sum(), 2)
+
+    def test_opposite_values_in_bin(self):
+        self.mask[1, 2, 2] = 1
+        output = util.bin_mask(self.mask, binning=(1, 2, 2))
+        self.assertEqual(output[1, 1, 1], 1)
+
+    def test_large_binning(self):
+        output = util.bin_mask(self.mask, binning=(2, 5, 9))
+        self.assertTrue(np.array_equal(output, np.ones((1, 1, 1), dtype=np.int8)))
+
+    def test_wrong_binning_length(self):
+        with self.assertRaises(ValueError):
+            util.bin_mask(self.mask, binning=(2, 2))
+
+
+class TestCenterOfMass(unittest.TestCase):
+    """
+    Tests on the function utilities.center_of_mass.
+
+    def center_of_mass(array: np.ndarray) -> Tuple[float, ...]:
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(seed=0)
+        self.array = rng.random((7, 10, 12))
+
+    def test_3d_same_as_scipy(self):
+        out = util.center_of_mass(self.array)
+        self.assertTrue(np.allclose(out, center_of_mass(self.array)))
+
+    def test_2d_same_as_scipy(self):
+        out = util.center_of_mass(self.array[3])
+        self.assertTrue(np.allclose(out, center_of_mass(self.array[3])))
+
+    def test_output_type(self):
+        out = util.center_of_mass(self.array)
+        self.assertIsInstance(out, tuple)
+        self.assertEqual(len(out), 3)
+        self.assertTrue(all(isinstance(val, float) for val in out))
+
+    def test_unsigned_integer_data(self):
+        array = (self.array * 1000).astype(np.uint16)
+        out = util.center_of_mass(array)
+        self.assertTrue(np.allclose(out, center_of_mass(array.astype(float))))
+
+    def test_boolean_data(self):
+        array = self.array > 0.5
+        out = util.center_of_mass(array)
+        self.assertTrue(np.allclose(out, center_of_mass(array.astype(float))))
+
+    def test_from_projections(self):
+        projections = util.axis_projections(self.array)
+        self.assertEqual(
+            util.center_of_mass(projections=projections),
+            util.center_of_mass(self.array),
+        )
+
+    def test_projections_sums(self):
+        projections = util.axis_projections(self.array)
+        self.assertTrue(np.allclose(projections[0], self.array.sum(axis=(1, 2))))
+        self.assertTrue(np.allclose(projections[2], self.array.sum(axis=(0, 1))))
+
+    def test_undefined_input(self):
+        with self.assertRaises(ValueError):
+            util.center_of_mass()
+
+    def test_projections_4d(self):
+        array = np.random.default_rng(seed=0).random((2, 3, 4, 5))
+        for axis, projection in enumerate(util.axis_projections(array)):
+            other_axes = tuple(val for val in range(4) if val != axis)
+            self.assertTrue(np.allclose(projection, array.sum(axis=other_axes)))
+
+    def test_single_voxel(self):
+        array = np.zeros((5, 6, 7))
+        array[1, 2, 3] = 1
+        self.assertEqual(util.center_of_mass(array), (1.0, 2.0, 3.0))
+
+
+class TestCropPad(unittest.TestCase):
+    """Tests on the function utilities.crop_pad."""
+
+    def setUp(self) -> None:
+        self.array = np.ones((4, 5, 6), dtype=int)
+
+    def test_pad(self):
+        output = util.crop_pad(
+            self.array, output_shape=(4, 7, 6), pad_value=2, pad_start=(0, 1, 0)
+        )
+        self.assertEqual(output.dtype, self.array.dtype)
+        self.assertTrue(np.all(output[:, 1:6, :] == 1))
+        self.assertEqual(output.sum(), 4 * 5 * 6 + 2 * 4 * 2 * 6)
+
+    def test_pad_float_value(self):
+        output = util.crop_pad(self.array, output_shape=(4, 5, 8), pad_value=0.5)
+        self.assertEqual(output.dtype, float)
+        self.assertTrue(np.all(output[:, :, [0, 7]] == 0.5))
+
+    def test_crop(self):
+        output = util.crop_pad(self.array, output_shape=(2, 5, 6))
+        self.assertEqual(output.shape, (2, 5, 6))
+        self.assertTrue(np.shares_memory(output, self.array))
+
+    def test_same_shape(self):
+        output = util.crop_pad(self.array, output_shape=self.array.shape)
+        self.assertEqual(output.dtype, self.array.dtype)
+        self.assertTrue(np.array_equal(output, self.array))
+        self.assertFalse(np.shares_memory(output, self.array))
+
+
 class TestFindFile(fake_filesystem_unittest.TestCase):
     """
     Tests on the function utilities.find_file.
@@ -389,6 +588,50 @@ class TestGaussianWindow(unittest.TestCase):
         self.assertTrue(np.unravel_index(abs(data).argmax(), data.shape) == (1, 25, 23))
 
 
+class TestPrimes(unittest.TestCase):
+    """Tests on the functions utilities.smaller_primes and utilities.higher_primes."""
+
+    def test_smaller_primes_number(self):
+        self.assertEqual(
+            util.smaller_primes(55, maxprime=7, required_dividers=(2,)), 54
+        )
+
+    def test_smaller_primes_list(self):
+        out = util.smaller_primes([100, 70, 55], maxprime=7, required_dividers=[2])
+        self.assertEqual(out, [100, 70, 54])
+
+    def test_higher_primes_number(self):
+        self.assertEqual(util.higher_primes(71, maxprime=7, required_dividers=(2,)), 72)
+
+    def test_higher_primes_tuple(self):
+        out = util.higher_primes((100, 71), maxprime=7, required_dividers=(2,))
+        self.assertEqual(out, [100, 72])
+
+    def test_no_required_dividers(self):
+        self.assertEqual(
+            util.smaller_primes(23, maxprime=7, required_dividers=None), 21
+        )
+
+    def test_number_too_small(self):
+        with self.assertRaises(ValueError):
+            util.higher_primes(5, maxprime=7, required_dividers=(2,))
+
+    def test_try_smaller_primes_large_prime_factor(self):
+        self.assertFalse(util.try_smaller_primes(2 * 11, maxprime=7))
+
+    def test_try_smaller_primes_missing_divider(self):
+        self.assertFalse(
+            util.try_smaller_primes(3 * 7, maxprime=7, required_dividers=(2,))
+        )
+
+    def test_try_smaller_primes_valid(self):
+        self.assertTrue(
+            util.try_smaller_primes(
+                2**3 * 3 * 5 * 7, maxprime=7, required_dividers=(2,)
+            )
+        )
+
+
 class TestUnpackArray(unittest.TestCase):
     """
     Tests on the function utilities.unpack_array.
@@ -510,12 +753,48 @@ class TestUpsample(unittest.TestCase):
         self.assertTrue(np.allclose(output, expected))
 
 
+class TestRotateCrystal(unittest.TestCase):
+    """Tests on the function utilities.rotate_crystal."""
+
+    def setUp(self):
+        self.array = np.random.rand(8, 10, 12)
+
+    def test_identity_rotation(self):
+        output = util.rotate_crystal(self.array, rotation_matrix=np.eye(3))
+        self.assertTrue(np.allclose(output, self.array))
+
+    def test_new_voxel_size_same_as_regrid(self):
+        expected = pu.regrid(
+            self.array, old_voxelsize=(1, 2, 3), new_voxelsize=(1.5, 2, 2.5)
+        )
+        output = util.rotate_crystal(
+            self.array,
+            rotation_matrix=np.eye(3),
+            voxel_size=(1, 2, 3),
+            new_voxel_size=(1.5, 2, 2.5),
+        )
+        self.assertTrue(np.allclose(output, expected))
+
+    def test_complex_array(self):
+        array = self.array * np.exp(1j * self.array)
+        output = util.rotate_crystal(array, rotation_matrix=np.eye(3))
+        self.assertTrue(np.iscomplexobj(output))
+        self.assertTrue(np.allclose(output, array))
+
+
 if __name__ == "__main__":
+    run_tests(TestArgmaxModulus)
+    run_tests(TestBinData)
+    run_tests(TestBinMask)
+    run_tests(TestCenterOfMass)
+    run_tests(TestCropPad)
     run_tests(TestInRange)
     run_tests(TestFindFile)
     run_tests(TestGaussianWindow)
+    run_tests(TestPrimes)
     run_tests(TestUnpackArray)
     run_tests(TestUpsample)
     run_tests(TestCreateRepr)
     run_tests(TestFormatRepr)
     run_tests(TestNdarrayToList)
+    run_tests(TestRotateCrystal)